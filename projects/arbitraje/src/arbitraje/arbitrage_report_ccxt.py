@@ -6,11 +6,21 @@ from datetime import datetime
 from pathlib import Path
 
 import ccxt  # type: ignore
+import numpy as np
 import pandas as pd
 from tabulate import tabulate
 import yaml
 
 from . import paths
+from .cross_graph import (
+    CrossVenueGraph,
+    TransferCosts,
+    VenueRates,
+    parse_transfer_fees,
+)
+from .output_writer import OutputWriter, SnapshotFile
+from .pair_blacklist import EMPTY_BLACKLIST, PairBlacklist
+from .spread_kernel import best_buy_sell
 
 try:
     from dotenv import load_dotenv
@@ -248,16 +258,22 @@ def build_rates_for_exchange(
     fee_pct: float,
     require_topofbook: bool = False,
     min_quote_vol: float = 0.0,
-    blacklisted_symbols: set[str] | None = None,
+    blacklisted_symbols: PairBlacklist | set[str] | None = None,
 ) -> Tuple[List[Tuple[int, int, float]], Dict[Tuple[int, int], float]]:
     cur_index = {c: i for i, c in enumerate(currencies)}
     edges: List[Tuple[int, int, float]] = []
     rate_map: Dict[Tuple[int, int], float] = {}
+    blocked = None
+    if isinstance(blacklisted_symbols, PairBlacklist):
+        blocked = blacklisted_symbols.submask(currencies)
     for u in currencies:
         for v in currencies:
             if u == v:
                 continue
-            if _pair_is_blacklisted(blacklisted_symbols, u, v):
+            if blocked is not None:
+                if blocked[cur_index[u], cur_index[v]]:
+                    continue
+            elif _pair_is_blacklisted(blacklisted_symbols, u, v):
                 continue
             r, qv = get_rate_and_qvol(u, v, tickers, fee_pct, require_topofbook)
             if r and r > 0:
@@ -513,19 +529,23 @@ def build_rates_for_exchange_from_pairs(
     candidate_pairs: List[Tuple[str, str]],
     require_topofbook: bool = False,
     min_quote_vol: float = 0.0,
-    blacklisted_symbols: set[str] | None = None,
+    blacklisted_symbols: PairBlacklist | set[str] | None = None,
 ) -> Tuple[List[Tuple[int, int, float]], Dict[Tuple[int, int], float]]:
     """Faster edge builder using only existing market pairs.
 
     candidate_pairs is a list of directed pairs (u, v) where either u/v or v/u exists in markets.
+    A compiled PairBlacklist is applied to the whole candidate list up front.
     """
     cur_index = {c: i for i, c in enumerate(currencies)}
     edges: List[Tuple[int, int, float]] = []
     rate_map: Dict[Tuple[int, int], float] = {}
+    precompiled = isinstance(blacklisted_symbols, PairBlacklist)
+    if precompiled:
+        candidate_pairs = blacklisted_symbols.filter_pairs(candidate_pairs)
     for u, v in candidate_pairs:
         if u == v:
             continue
-        if _pair_is_blacklisted(blacklisted_symbols, u, v):
+        if not precompiled and _pair_is_blacklisted(blacklisted_symbols, u, v):
             continue
         r, qv = get_rate_and_qvol(u, v, tickers, fee_pct, require_topofbook)
         if r and r > 0:
@@ -570,9 +590,13 @@ def _expand_path_to_pairs(path: str) -> List[str]:
     return pairs
 
 
-def _pair_is_blacklisted(symbols: set[str] | None, a: str, b: str) -> bool:
+def _pair_is_blacklisted(
+    symbols: PairBlacklist | set[str] | None, a: str, b: str
+) -> bool:
     if not symbols:
         return False
+    if isinstance(symbols, PairBlacklist):
+        return symbols.blocks(a, b)
     pair = _normalize_pair(f"{a}/{b}")
     if pair and pair in symbols:
         return True
@@ -662,10 +686,46 @@ def _ensure_blacklist_json_contains(
             json.dump(payload, fh, indent=2, sort_keys=True)
 
 
-def load_swaps_blacklist() -> Dict[str, set[str]]:
+_BLACKLIST_CONFIG_NAMES = ("swapper.yaml", "swapper.live.yaml")
+# Last compiled blacklist and the source mtimes it was built from
+_swaps_blacklist_cache: Dict[str, object] = {"stamp": None, "value": {}}
+
+
+def _swaps_blacklist_stamp() -> tuple:
+    stamp = []
+    for src in [paths.LOGS_DIR / "swapper_blacklist.json"] + [
+        paths.PROJECT_ROOT / name for name in _BLACKLIST_CONFIG_NAMES
+    ]:
+        try:
+            stamp.append(src.stat().st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def load_swaps_blacklist() -> Dict[str, PairBlacklist]:
+    """Return the compiled per-exchange blacklist.
+
+    The JSON/YAML sources are only re-read (and recompiled) when one of their
+    mtimes changed since the previous call, so calling this once per iteration
+    is cheap.
+    """
+    stamp = _swaps_blacklist_stamp()
+    if stamp == _swaps_blacklist_cache["stamp"]:
+        return _swaps_blacklist_cache["value"]  # type: ignore[return-value]
+    compiled = {
+        ex: PairBlacklist(symbols) for ex, symbols in _read_swaps_blacklist().items()
+    }
+    # Re-stamp after reading: the config import may have rewritten the JSON
+    _swaps_blacklist_cache["stamp"] = _swaps_blacklist_stamp()
+    _swaps_blacklist_cache["value"] = compiled
+    return compiled
+
+
+def _read_swaps_blacklist() -> Dict[str, set[str]]:
     json_path = paths.LOGS_DIR / "swapper_blacklist.json"
     manual_entries: Dict[str, set[str]] = {}
-    for cfg_name in ("swapper.yaml", "swapper.live.yaml"):
+    for cfg_name in _BLACKLIST_CONFIG_NAMES:
         cfg_path = paths.PROJECT_ROOT / cfg_name
         if not cfg_path.exists():
             continue
@@ -731,6 +791,205 @@ def resolve_exchanges(arg: str, ex_limit: int | None = None) -> List[str]:
     return [normalize_ccxt_id(s.strip().lower()) for s in arg.split(",") if s.strip()]
 
 
+# ----------------------
+# Cross-venue graph (xgraph mode)
+# ----------------------
+BF_COLUMNS = [
+    "exchange",
+    "path",
+    "net_pct",
+    "inv",
+    "est_after",
+    "hops",
+    "iteration",
+    "ts",
+]
+
+TRI_COLUMNS = [
+    "exchange",
+    "path",
+    "r1",
+    "r2",
+    "r3",
+    "net_pct",
+    "inv",
+    "est_after",
+    "iteration",
+    "ts",
+]
+
+XGRAPH_COLUMNS = [
+    "path",
+    "venues",
+    "hops",
+    "transfers",
+    "net_pct",
+    "inv",
+    "est_after",
+    "iteration",
+    "ts",
+]
+
+
+def _xgraph_venue_rates(
+    ex: ccxt.Exchange,
+    ex_id: str,
+    anchors: set[str],
+    args,
+    blacklist: PairBlacklist,
+) -> VenueRates | None:
+    """Currencies around the anchors for one venue and their intra-venue rates.
+
+    Universe selection mirrors BF (anchor-connected tokens, ranked by quote volume,
+    capped by --xg_currencies_limit) and the edges come from
+    build_rates_for_exchange_from_pairs with the BF fee/top-of-book/qvol flags.
+    """
+    if not safe_has(ex, "fetchTickers"):
+        return None
+    markets = getattr(ex, "markets", None) or ex.load_markets()
+    adjacency = _build_adjacency_from_markets(markets)
+    tokens = set(anchors)
+    for ccy in anchors:
+        tokens |= adjacency.get(ccy, set())
+    tickers = ex.fetch_tickers()
+    qvol_by_ccy: Dict[str, float] = {}
+    for sym, t in tickers.items():
+        m = markets.get(sym) or {}
+        qv = get_quote_volume(t) or 0.0
+        for ccy in (m.get("base"), m.get("quote")):
+            if ccy:
+                c = str(ccy).upper()
+                qvol_by_ccy[c] = qvol_by_ccy.get(c, 0.0) + float(qv)
+    others = sorted(
+        (c for c in tokens if c not in anchors),
+        key=lambda c: qvol_by_ccy.get(c, 0.0),
+        reverse=True,
+    )
+    limit = max(len(anchors), int(args.xg_currencies_limit))
+    currencies = sorted(anchors) + others[: limit - len(anchors)]
+    cur_set = set(currencies)
+    candidate_pairs = [
+        (u, v) for u in currencies for v in adjacency.get(u, set()) & cur_set if u != v
+    ]
+    edges, rate_map = build_rates_for_exchange_from_pairs(
+        currencies,
+        tickers,
+        args.bf_fee,
+        candidate_pairs,
+        require_topofbook=args.bf_require_topofbook,
+        min_quote_vol=args.bf_min_quote_vol,
+        blacklisted_symbols=blacklist,
+    )
+    return VenueRates(ex_id, currencies, edges, rate_map)
+
+
+def _run_xgraph_mode(
+    args,
+    ex_ids: List[str],
+    ex_instances: Dict[str, ccxt.Exchange],
+    anchors: List[str],
+    quote: str,
+) -> None:
+    """Scan the unified (exchange, currency) graph for cross-venue cycles."""
+    paths.OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
+    xg_csv = paths.OUTPUTS_DIR / f"arbitrage_xgraph_{quote.lower()}_ccxt.csv"
+    xg_iter_csv = paths.OUTPUTS_DIR / f"arbitrage_xgraph_current_{quote.lower()}_ccxt.csv"
+    current_file = paths.LOGS_DIR / "current_xgraph.txt"
+    anchor_set = {q.upper() for q in anchors} or {quote}
+    transfer_ccys = [
+        c.strip().upper() for c in str(args.xg_transfer_ccys or "").split(",") if c.strip()
+    ]
+    transfer = TransferCosts(
+        fee_pct=float(
+            args.xfer_fee_pct if args.xg_transfer_fee_pct is None else args.xg_transfer_fee_pct
+        ),
+        latency_bps=float(args.xg_latency_bps),
+        per_currency=parse_transfer_fees(args.xg_transfer_fees),
+        currencies=frozenset(transfer_ccys),
+    )
+    results: List[dict] = []
+
+    def fetch_venue(ex_id: str, blacklist_map: Dict[str, PairBlacklist]):
+        ex = ex_instances.get(ex_id) or load_exchange(ex_id, args.timeout)
+        blacklist = blacklist_map.get(normalize_ccxt_id(ex_id), EMPTY_BLACKLIST)
+        return _xgraph_venue_rates(ex, ex_id, anchor_set, args, blacklist)
+
+    for it in range(1, int(max(1, args.repeat)) + 1):
+        ts = pd.Timestamp.utcnow().isoformat()
+        blacklist_map = load_swaps_blacklist()
+        t0 = time.time()
+        venues: List[VenueRates] = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(ex_ids))) as pool:
+            futs = {pool.submit(fetch_venue, ex_id, blacklist_map): ex_id for ex_id in ex_ids}
+            for fut in concurrent.futures.as_completed(futs):
+                try:
+                    venue = fut.result()
+                    if venue is not None:
+                        venues.append(venue)
+                except Exception as e:
+                    logger.warning("%s: xgraph fetch falló: %s", futs[fut], e)
+        # Stable node layout regardless of completion order
+        venues.sort(key=lambda v: ex_ids.index(v.exchange))
+        t1 = time.time()
+        graph = CrossVenueGraph.build(venues, transfer)
+        cycles = graph.find_cycles(
+            anchor_set,
+            max_hops=int(args.xg_max_hops),
+            min_hops=int(args.xg_min_hops),
+            min_net_pct=float(args.xg_min_net),
+            top=int(args.xg_top),
+            min_transfers=int(args.xg_min_transfers),
+        )
+        t2 = time.time()
+        inv_amt = float(args.inv)
+        iter_rows: List[dict] = []
+        lines: List[str] = []
+        for c in cycles:
+            est_after = round(inv_amt * c.rate, 4)
+            venues_used = ",".join(dict.fromkeys(ex for ex, _ in c.nodes))
+            iter_rows.append(
+                {
+                    "path": c.path,
+                    "venues": venues_used,
+                    "hops": c.hops,
+                    "transfers": c.transfers,
+                    "net_pct": round(c.net_pct, 4),
+                    "inv": inv_amt,
+                    "est_after": est_after,
+                    "iteration": it,
+                    "ts": ts,
+                }
+            )
+            lines.append(
+                f"XG {c.path} ({c.hops}hops, {c.transfers}xfer) => net {c.net_pct:.3f}% | "
+                f"{c.nodes[0][1]} {inv_amt:.2f} -> {est_after:.4f}"
+            )
+        logger.info(
+            "[XG] it=%d venues=%d nodes=%d edges=%d cycles=%d fetch=%.0fms search=%.0fms",
+            it,
+            len(venues),
+            graph.n_nodes,
+            graph.n_edges,
+            len(cycles),
+            (t1 - t0) * 1000.0,
+            (t2 - t1) * 1000.0,
+        )
+        if lines:
+            logger.info("\n" + "\n".join(lines))
+        results.extend(iter_rows)
+        try:
+            pd.DataFrame(iter_rows, columns=XGRAPH_COLUMNS).to_csv(xg_iter_csv, index=False)
+            with open(current_file, "w", encoding="utf-8") as fh:
+                fh.write(f"[XG] Iteración {it}/{args.repeat} @ {ts}\n")
+                fh.write("\n".join(lines) + "\n" if lines else "(sin oportunidades en esta iteración)\n")
+        except Exception:
+            pass
+        if it < args.repeat:
+            time.sleep(max(0.0, args.repeat_sleep))
+    pd.DataFrame(results, columns=XGRAPH_COLUMNS).to_csv(xg_csv, index=False)
+    logger.info("XG CSV: %s", xg_csv)
+
+
 # ----------------------
 # Main
 # ----------------------
@@ -1129,6 +1388,14 @@ def _load_yaml_config_defaults(parser: argparse.ArgumentParser) -> None:
         for k, v in ui.items():
             key = f"ui_{k}"
             conf[key] = v
+        xg = raw.get("xgraph", {}) or {}
+        for k, v in xg.items():
+            key = f"xg_{k}"
+            if k in ("transfer_ccys",):
+                v = list_to_csv(v)
+            elif k == "transfer_fees" and isinstance(v, dict):
+                v = ",".join(f"{c}:{fee}" for c, fee in v.items())
+            conf[key] = v
 
         if conf:
             parser.set_defaults(**conf)
@@ -1139,7 +1406,7 @@ def _load_yaml_config_defaults(parser: argparse.ArgumentParser) -> None:
 
 def main() -> None:
     parser = argparse.ArgumentParser(
-        description="Arbitraje (ccxt) - modes: tri | bf | balance | health"
+        description="Arbitraje (ccxt) - modes: tri | bf | balance | health | inter | xgraph"
     )
     parser.add_argument(
         "--config",
@@ -1148,7 +1415,9 @@ def main() -> None:
         help="Path to YAML config file (CLI overrides YAML)",
     )
     parser.add_argument(
-        "--mode", choices=["tri", "bf", "balance", "health"], default="bf"
+        "--mode",
+        choices=["tri", "bf", "balance", "health", "inter", "xgraph"],
+        default="bf",
     )
     parser.add_argument(
         "--ex",
@@ -1319,6 +1588,49 @@ def main() -> None:
         help="Tiempo máximo (segundos) para esperar resultados por iteración en BF; 0 = sin límite",
     )
 
+    # Cross-venue graph (xgraph): nodes are (exchange, currency); reuses --bf_fee,
+    # --bf_require_topofbook and --bf_min_quote_vol for intra-venue edges
+    parser.add_argument(
+        "--xg_currencies_limit",
+        type=int,
+        default=300,
+        help="Monedas por exchange en el grafo unificado (anclas incluidas)",
+    )
+    parser.add_argument("--xg_min_hops", type=int, default=3)
+    parser.add_argument("--xg_max_hops", type=int, default=6)
+    parser.add_argument("--xg_min_net", type=float, default=0.5, help="%%")
+    parser.add_argument("--xg_top", type=int, default=10)
+    parser.add_argument(
+        "--xg_min_transfers",
+        type=int,
+        default=1,
+        help="Mínimo de transferencias entre exchanges por ciclo (0 = incluir ciclos intra-exchange)",
+    )
+    parser.add_argument(
+        "--xg_transfer_fee_pct",
+        type=float,
+        default=None,
+        help="Comisión de retiro por transferencia en %% (default: --xfer_fee_pct)",
+    )
+    parser.add_argument(
+        "--xg_transfer_fees",
+        type=str,
+        default=None,
+        help="Comisión de retiro por moneda, p.ej. 'BTC:0.05,USDT:0.1' (%%)",
+    )
+    parser.add_argument(
+        "--xg_latency_bps",
+        type=float,
+        default=0.0,
+        help="Penalización de latencia (bps) por transferencia entre exchanges",
+    )
+    parser.add_argument(
+        "--xg_transfer_ccys",
+        type=str,
+        default="",
+        help="Monedas transferibles entre exchanges (CSV); vacío = todas las compartidas",
+    )
+
     # BF simulation (compounding) across iterations
     parser.add_argument(
         "--simulate_compound",
@@ -1476,12 +1788,12 @@ def main() -> None:
 
     logger.info("Mode=%s | quote=%s | ex=%s", args.mode, QUOTE, ",".join(EX_IDS))
 
-    swaps_blacklist_map: Dict[str, set[str]] = load_swaps_blacklist()
+    swaps_blacklist_map: Dict[str, PairBlacklist] = load_swaps_blacklist()
 
     # Pre-create and cache ccxt exchange instances (and markets) to speed up repeated iterations
     ex_instances: Dict[str, ccxt.Exchange] = {}
     try:
-        preload_for_modes = {"bf", "tri"}
+        preload_for_modes = {"bf", "tri", "xgraph"}
         if args.mode in preload_for_modes:
             for _ex in EX_IDS:
                 try:
@@ -1499,6 +1811,10 @@ def main() -> None:
     except Exception:
         pass
 
+    if args.mode == "xgraph":
+        _run_xgraph_mode(args, EX_IDS, ex_instances, allowed_quotes, QUOTE)
+        return
+
     # ---------------------------
     # HEALTH MODE
     # ---------------------------
@@ -2084,6 +2400,7 @@ def main() -> None:
         tri_iter_csv = (
             paths.OUTPUTS_DIR / f"arbitrage_tri_current_{QUOTE.lower()}_ccxt.csv"
         )
+        out_writer = OutputWriter()
         for it in range(1, int(max(1, args.repeat)) + 1):
             ts = pd.Timestamp.utcnow().isoformat()
             swaps_blacklist_map = load_swaps_blacklist()
@@ -2143,23 +2460,7 @@ def main() -> None:
                         print("\033[2J\033[H", end="")
                 except Exception:
                     pass
-            # Clean per-iteration artifacts
-            try:
-                if current_file.exists():
-                    current_file.unlink()  # type: ignore[arg-type]
-            except Exception:
-                pass
-            try:
-                if tri_iter_csv.exists():
-                    tri_iter_csv.unlink()  # type: ignore[arg-type]
-            except Exception:
-                pass
-            try:
-                tri_hist = paths.LOGS_DIR / "tri_history.txt"
-                if tri_hist.exists():
-                    tri_hist.unlink()  # type: ignore[arg-type]
-            except Exception:
-                pass
+            # Per-iteration artifacts are replaced atomically by the output writer
             iter_lines: List[str] = []
             iter_results: List[dict] = []
             for ex_id in EX_IDS:
@@ -2174,7 +2475,7 @@ def main() -> None:
                     markets = ex.load_markets()
                     tickers = ex.fetch_tickers()
                     ex_norm = normalize_ccxt_id(ex_id)
-                    exchange_blacklist = swaps_blacklist_map.get(ex_norm, set())
+                    exchange_blacklist = swaps_blacklist_map.get(ex_norm, EMPTY_BLACKLIST)
                     tokens = set()
                     for s, m in markets.items():
                         if not m.get("active", True):
@@ -2195,15 +2496,17 @@ def main() -> None:
                     tokens = tokens[: args.tri_currencies_limit]
                     fee = float(args.tri_fee)
                     opps: List[dict] = []
+                    # Row/col 0 is QUOTE, token k sits at k + 1
+                    blocked = exchange_blacklist.submask([QUOTE] + tokens)
                     for i in range(len(tokens)):
                         X = tokens[i]
-                        if _pair_is_blacklisted(exchange_blacklist, QUOTE, X):
+                        if blocked[0, i + 1]:
                             continue
                         for j in range(len(tokens)):
                             if j == i:
                                 continue
                             Y = tokens[j]
-                            if _pair_is_blacklisted(exchange_blacklist, X, Y):
+                            if blocked[i + 1, j + 1]:
                                 continue
                             r1, qv1 = get_rate_and_qvol(
                                 QUOTE, X, tickers, fee, args.tri_require_topofbook
@@ -2223,7 +2526,7 @@ def main() -> None:
                                 qv2 is None or qv2 < args.tri_min_quote_vol
                             ):
                                 continue
-                            if _pair_is_blacklisted(exchange_blacklist, Y, QUOTE):
+                            if blocked[j + 1, 0]:
                                 continue
                             r3, qv3 = get_rate_and_qvol(
                                 Y, QUOTE, tickers, fee, args.tri_require_topofbook
@@ -2269,61 +2572,27 @@ def main() -> None:
                     logger.warning("%s: triangular scan falló: %s", ex_id, e)
             # Write current-only file and per-iteration CSV
             try:
-                try:
-                    if iter_results:
-                        pd.DataFrame(iter_results).to_csv(tri_iter_csv, index=False)
-                    else:
-                        pd.DataFrame(
-                            columns=[
-                                "exchange",
-                                "path",
-                                "r1",
-                                "r2",
-                                "r3",
-                                "net_pct",
-                                "inv",
-                                "est_after",
-                                "iteration",
-                                "ts",
-                            ]
-                        ).to_csv(tri_iter_csv, index=False)
-                except Exception:
-                    pass
-                with open(current_file, "w", encoding="utf-8") as fh:
-                    fh.write(f"[TRI] Iteración {it}/{args.repeat} @ {ts}\n")
-                    if iter_lines:
-                        fh.write("\n".join(iter_lines) + "\n")
-                    else:
-                        fh.write("(sin oportunidades en esta iteración)\n")
-                tri_hist = paths.LOGS_DIR / "tri_history.txt"
-                with open(tri_hist, "w", encoding="utf-8") as fh:
-                    fh.write(f"[TRI] Iteración {it}/{args.repeat} @ {ts}\n")
-                    if iter_lines:
-                        fh.write("\n".join(iter_lines) + "\n\n")
-                    else:
-                        fh.write("(sin oportunidades en esta iteración)\n\n")
+                out_writer.write_csv(
+                    tri_iter_csv, iter_results, None if iter_results else TRI_COLUMNS
+                )
+                head = f"[TRI] Iteración {it}/{args.repeat} @ {ts}\n"
+                body = (
+                    "\n".join(iter_lines) + "\n"
+                    if iter_lines
+                    else "(sin oportunidades en esta iteración)\n"
+                )
+                out_writer.write_text(current_file, head + body)
+                out_writer.write_text(paths.LOGS_DIR / "tri_history.txt", head + body + "\n")
             except Exception:
                 pass
             if it < args.repeat:
                 time.sleep(max(0.0, args.repeat_sleep))
         # Save CSV and exit tri mode
+        out_writer.close()
         if results:
             pd.DataFrame(results).to_csv(tri_csv, index=False)
         else:
-            pd.DataFrame(
-                columns=[
-                    "exchange",
-                    "path",
-                    "r1",
-                    "r2",
-                    "r3",
-                    "net_pct",
-                    "inv",
-                    "est_after",
-                    "iteration",
-                    "ts",
-                ]
-            ).to_csv(tri_csv, index=False)
+            pd.DataFrame(columns=TRI_COLUMNS).to_csv(tri_csv, index=False)
         logger.info("TRI CSV: %s", tri_csv)
         return
 
@@ -2352,6 +2621,12 @@ def main() -> None:
         bf_iter_csv = (
             paths.OUTPUTS_DIR / f"arbitrage_bf_current_{QUOTE.lower()}_ccxt.csv"
         )
+        # Snapshot/CSV writes go through a background writer (atomic, coalesced);
+        # CURRENT_BF.txt is kept as a legacy alias of the snapshot
+        out_writer = OutputWriter()
+        snapshot = SnapshotFile(
+            out_writer, current_file, aliases=[paths.LOGS_DIR / "CURRENT_BF.txt"]
+        )
 
         # Ensure BF snapshot log is clean at the start of every run to avoid mixing sessions
         try:
@@ -2359,6 +2634,7 @@ def main() -> None:
 
             paths.LOGS_DIR.mkdir(parents=True, exist_ok=True)
             # Keep bf_history.txt for accumulation; only reset current snapshot (clean legacy and canonical)
+            # and the per-run top-k history CSV (appended once per iteration)
             for fname in ("current_bf.txt", "CURRENT_BF.txt"):
                 fp = paths.LOGS_DIR / fname
                 if fp.exists():
@@ -2370,6 +2646,8 @@ def main() -> None:
                     except Exception:
                         # Non-fatal if we can't delete; we will append later
                         pass
+            if bf_top_hist_csv.exists():
+                bf_top_hist_csv.unlink()  # type: ignore[arg-type]
             # Optionally reset accumulated history files at start
             if args.bf_reset_history:
                 for fname in ("bf_history.txt", "history_bf.txt", "HISTORY_BF.txt"):
@@ -2425,10 +2703,8 @@ def main() -> None:
 
         # Ensure a visible BF snapshot stub exists from the start of the run (rest of content written per iteration)
         try:
-            with open(current_file, "w", encoding="utf-8") as fh:
-                ts0 = pd.Timestamp.utcnow().isoformat()
-                fh.write(f"[BF] Inicio @ {ts0}\n\n")
-            _sync_snapshot_alias()
+            ts0 = pd.Timestamp.utcnow().isoformat()
+            snapshot.reset(f"[BF] Inicio @ {ts0}\n\n")
         except Exception:
             pass
 
@@ -2442,18 +2718,6 @@ def main() -> None:
         set([q for q in allowed_quotes]) if allowed_quotes else {QUOTE}
     )
 
-    # Helper to mirror the live snapshot to the legacy alias CURRENT_BF.txt for backward compatibility
-    def _sync_snapshot_alias():
-        try:
-            import shutil
-
-            current_alias = paths.LOGS_DIR / "CURRENT_BF.txt"
-            current_file = paths.LOGS_DIR / "current_bf.txt"
-            if current_file.exists():
-                shutil.copyfile(current_file, current_alias)
-        except Exception:
-            pass
-
     def bf_worker(ex_id: str, it: int, ts: str) -> Tuple[str, List[str], List[dict]]:
         local_lines: List[str] = []
         local_results: List[dict] = []
@@ -2489,7 +2753,7 @@ def main() -> None:
             # We'll decide the minimal set of pairs then fetch only needed tickers when possible
             # Fetching: prefer batch fetch if available; else fall back to per-symbol requests later
             ex_norm = normalize_ccxt_id(ex_id)
-            exchange_blacklist = swaps_blacklist_map.get(ex_norm, set())
+            exchange_blacklist = swaps_blacklist_map.get(ex_norm, EMPTY_BLACKLIST)
             if args.bf_debug and exchange_blacklist:
                 logger.info(
                     "[BF-DBG] %s blacklist_pairs=%d", ex_id, len(exchange_blacklist)
@@ -2938,7 +3202,9 @@ def main() -> None:
     # (removed fallback minimal BF loop that prematurely returned and bypassed the full BF rendering path)
 
     # Correct BF main loop (logs + history). This sits at the BF-block level, not inside bf_worker.
-    for it in range(1, int(max(1, args.repeat)) + 1):
+    # Skipped for INTER so that mode falls through to its own block below.
+    bf_iterations = int(max(1, args.repeat)) if args.mode == "bf" else 0
+    for it in range(1, bf_iterations + 1):
         ts = pd.Timestamp.utcnow().isoformat()
         swaps_blacklist_map = load_swaps_blacklist()
         # Prefetch wallet balances once per iteration for simulation/header if requested
@@ -2996,26 +3262,11 @@ def main() -> None:
                     print("\033[2J\033[H", end="")
             except Exception:
                 pass
-        # Clean per-iteration artifacts and any historical files to avoid mixing iterations
-        try:
-            if current_file.exists():
-                current_file.unlink()  # type: ignore[arg-type]
-        except Exception:
-            pass
-        try:
-            if bf_iter_csv.exists():
-                bf_iter_csv.unlink()  # type: ignore[arg-type]
-        except Exception:
-            pass
-        # Do not remove bf_history.txt: we now keep accumulation across iterations
-        try:
-            if bf_top_hist_csv.exists():
-                bf_top_hist_csv.unlink()  # type: ignore[arg-type]
-        except Exception:
-            pass
+        # Per-iteration artifacts (snapshot, current CSV) are replaced atomically by the
+        # output writer; bf_history.txt and the top-k CSV accumulate across iterations
         # Create snapshot header
         try:
-            with open(current_file, "w", encoding="utf-8") as fh:
+            with snapshot.rewriting() as fh:
                 fh.write(f"[BF] Iteración {it}/{args.repeat} @ {ts}\n\n")
                 # Always display Simulation (estado actual) first, right after the header (guarded by UI flag)
                 if getattr(args, "ui_show_simulation_header_always", True):
@@ -3106,7 +3357,6 @@ def main() -> None:
                     fh.write("Progreso\n")
                     fh.write(f"{bar} {completed}/{total_ex} {spinner}\n\n")
                 fh.write("Detalle (progreso)\n")
-            _sync_snapshot_alias()
         except Exception:
             pass
 
@@ -3144,7 +3394,7 @@ def main() -> None:
                     st["last_it"] = it
                 results_bf.append(row)
             try:
-                with open(current_file, "a", encoding="utf-8") as fh:
+                with snapshot.appending() as fh:
                     if getattr(args, "ui_progress_bar", True):
                         completed_count += 1
                         total_ex = max(1, len(EX_IDS))
@@ -3161,8 +3411,6 @@ def main() -> None:
                         fh.write(f"{bar} {completed_count}/{total_ex} {spinner}\n")
                     if lines:
                         fh.write("\n" + "\n".join(lines) + "\n")
-                    fh.flush()
-                _sync_snapshot_alias()
             except Exception:
                 pass
 
@@ -3174,31 +3422,19 @@ def main() -> None:
                     .sort_values("net_pct", ascending=False)
                     .head(max(1, int(args.bf_top)))
                 )
-                df_top.to_csv(bf_top_hist_csv, index=False)
+                out_writer.append_csv(bf_top_hist_csv, df_top.to_dict("records"))
         except Exception:
             pass
         # Overwrite current-iteration CSV
         try:
-            if iter_results:
-                pd.DataFrame(iter_results).to_csv(bf_iter_csv, index=False)
-            else:
-                pd.DataFrame(
-                    columns=[
-                        "exchange",
-                        "path",
-                        "net_pct",
-                        "inv",
-                        "est_after",
-                        "hops",
-                        "iteration",
-                        "ts",
-                    ]
-                ).to_csv(bf_iter_csv, index=False)
+            out_writer.write_csv(
+                bf_iter_csv, iter_results, None if iter_results else BF_COLUMNS
+            )
         except Exception:
             pass
         # Append final aggregated sections to snapshot
         try:
-            with open(current_file, "a", encoding="utf-8") as fh:
+            with snapshot.appending() as fh:
                 fh.write("\n---\nResumen final (iteración)\n\n")
                 try:
                     if iter_results:
@@ -3260,7 +3496,6 @@ def main() -> None:
                     fh.write("(sin oportunidades en esta iteración)\n")
         except Exception:
             pass
-        _sync_snapshot_alias()
         if it < args.repeat:
             # Simple sleep between iterations; the next loop iteration will recreate headers and rerun
             time.sleep(max(0.0, args.repeat_sleep))
@@ -3393,40 +3628,9 @@ def main() -> None:
                         iter_lines.append(line)
 
             try:
-                # Persist per-iteration top-k (optional)
-                if args.bf_persist_top_csv:
-                    try:
-                        # pick top by net_pct across all lines parsed in this iteration (iter_results)
-                        if iter_results:
-                            df_top = pd.DataFrame(iter_results)
-                            df_top = df_top.sort_values(
-                                "net_pct", ascending=False
-                            ).head(max(1, int(args.bf_top)))
-                            # Overwrite file every iteration (no historical accumulation)
-                            df_top.to_csv(bf_top_hist_csv, index=False)
-                    except Exception:
-                        pass
-                # Overwrite the current-iteration CSV with this iteration's results
-                try:
-                    if iter_results:
-                        pd.DataFrame(iter_results).to_csv(bf_iter_csv, index=False)
-                    else:
-                        pd.DataFrame(
-                            columns=[
-                                "exchange",
-                                "path",
-                                "net_pct",
-                                "inv",
-                                "est_after",
-                                "hops",
-                                "iteration",
-                                "ts",
-                            ]
-                        ).to_csv(bf_iter_csv, index=False)
-                except Exception:
-                    pass
+                # Top-k and current-iteration CSVs were already queued above for this iteration
                 # Snapshot file: append final aggregated sections (keep earlier progress)
-                with open(current_file, "a", encoding="utf-8") as fh:
+                with snapshot.appending() as fh:
                     fh.write("\n---\nResumen final (iteración)\n\n")
                     # 1) Top oportunidades de la iteración
                     try:
@@ -3562,22 +3766,16 @@ def main() -> None:
                         fh.write("\n".join(iter_lines) + "\n")
                     else:
                         fh.write("(sin oportunidades en esta iteración)\n")
-                # Mirror snapshot alias so both filenames stay in sync
-                _sync_snapshot_alias()
                 # History file: append all iterations to keep a running log
                 bf_hist = paths.LOGS_DIR / "bf_history.txt"
-                with open(bf_hist, "a", encoding="utf-8") as fh:
+                with out_writer.appending(bf_hist) as fh:
                     fh.write(f"[BF] Iteración {it}/{args.repeat} @ {ts}\n")
                     if iter_lines:
                         fh.write("\n".join(iter_lines) + "\n\n")
                     else:
                         fh.write("(sin oportunidades en esta iteración)\n\n")
                 try:
-                    logger.info(
-                        "BF history append: %s (exists=%s)",
-                        str(bf_hist),
-                        str(bf_hist.exists()),
-                    )
+                    logger.info("BF history append: %s", str(bf_hist))
                 except Exception:
                     pass
                 # No alias writes for history to avoid duplicates and mixed-case filenames
@@ -3585,6 +3783,8 @@ def main() -> None:
                 pass
             if it < args.repeat:
                 time.sleep(max(0.0, args.repeat_sleep))
+        # Drain queued snapshot/history writes before the end-of-run reports read them
+        out_writer.close()
         if results_bf:
             pd.DataFrame(results_bf).to_csv(bf_csv, index=False)
         else:
@@ -3860,65 +4060,56 @@ def main() -> None:
                     continue
                 return
 
-            # 3) Best ask/bid per symbol with filters
-            out_rows = []
-            for sym, g in df.groupby("symbol"):
-                if len(g) < args.min_sources:
-                    continue
-                buy_idx = g["ask"].idxmin()
-                sell_idx = g["bid"].idxmax()
-                if pd.isna(buy_idx) or pd.isna(sell_idx):
-                    continue
-                buy_row = g.loc[buy_idx]
-                sell_row = g.loc[sell_idx]
-                if sell_row["bid"] <= 0 or buy_row["ask"] <= 0:
-                    continue
-                base_token = str(buy_row["base"]).upper()
-                if not args.include_stables and base_token in STABLE_BASES:
-                    continue
-                if args.min_price > 0.0 and (
-                    buy_row["ask"] < args.min_price or sell_row["bid"] < args.min_price
-                ):
-                    continue
-
-            def vol_ok(row) -> bool:
-                if args.min_quote_vol <= 0:
-                    return True
-                qv = row.get("qvol", None)
-                if qv is None:
-                    return False if args.vol_strict else True
-                return qv >= args.min_quote_vol
-
-            if not (vol_ok(buy_row) and vol_ok(sell_row)):
-                continue
-
-            gross = pct(sell_row["bid"], buy_row["ask"])  # %
-            if math.isnan(gross):
-                continue
-            if args.max_spread_cap and gross > args.max_spread_cap:
-                continue
-            est_net = gross - (args.buy_fee + args.sell_fee) - args.xfer_fee_pct
+            # 3) Best ask/bid per symbol with filters (vectorized, see spread_kernel)
+            best = best_buy_sell(df, "symbol", "ask", "bid", sort=True)
+            asks = df["ask"].to_numpy(dtype=float)
+            bids = df["bid"].to_numpy(dtype=float)
+            qvols = pd.to_numeric(df["qvol"], errors="coerce").to_numpy(dtype=float)
+            bases = df["base"].to_numpy()
+            ex_col = df["exchange"].to_numpy()
+            b_pos, s_pos = best.buy_pos, best.sell_pos
+            buy_ask = asks[b_pos]
+            sell_bid = bids[s_pos]
+            keep = best.valid & (best.sources >= args.min_sources)
+            keep &= (sell_bid > 0) & (buy_ask > 0)
+            if not args.include_stables:
+                base_up = np.char.upper(bases[b_pos].astype(str))
+                keep &= ~np.isin(base_up, list(STABLE_BASES))
+            if args.min_price > 0.0:
+                keep &= (buy_ask >= args.min_price) & (sell_bid >= args.min_price)
+            if args.min_quote_vol > 0:
+
+                def vol_ok(qv: np.ndarray) -> np.ndarray:
+                    missing = np.isnan(qv)
+                    return np.where(missing, not args.vol_strict, qv >= args.min_quote_vol)
+
+                keep &= vol_ok(qvols[b_pos]) & vol_ok(qvols[s_pos])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                gross = (sell_bid - buy_ask) / buy_ask * 100.0
+            keep &= ~np.isnan(gross)
+            if args.max_spread_cap:
+                keep &= ~(gross > args.max_spread_cap)
+            keep &= gross >= args.min_spread
+            sel = np.flatnonzero(keep)
+            gross_sel = gross[sel]
+            est_net = gross_sel - (args.buy_fee + args.sell_fee) - args.xfer_fee_pct
             inv_amt = float(args.inv)
-            gross_profit_amt = round(inv_amt * (gross / 100.0), 2)
-            net_profit_amt = round(inv_amt * (est_net / 100.0), 2)
-            if gross >= args.min_spread:
-                out_rows.append(
-                    {
-                        "symbol": sym,
-                        "base": buy_row["base"],
-                        "buy_exchange": buy_row["exchange"],
-                        "buy_price": round(float(buy_row["ask"]), 8),
-                        "sell_exchange": sell_row["exchange"],
-                        "sell_price": round(float(sell_row["bid"]), 8),
-                        "gross_spread_pct": round(gross, 4),
-                        "est_net_pct": round(est_net, 4),
-                        "sources": f"{len(g)}ex",
-                        "gross_profit_amt": gross_profit_amt,
-                        "net_profit_amt": net_profit_amt,
-                    }
-                )
+            out_rows = {
+                "symbol": best.labels[sel],
+                "base": bases[b_pos[sel]],
+                "buy_exchange": ex_col[b_pos[sel]],
+                "buy_price": np.round(buy_ask[sel], 8),
+                "sell_exchange": ex_col[s_pos[sel]],
+                "sell_price": np.round(sell_bid[sel], 8),
+                "gross_spread_pct": np.round(gross_sel, 4),
+                "est_net_pct": np.round(est_net, 4),
+                "sources": [f"{n}ex" for n in best.sources[sel]],
+                "gross_profit_amt": np.round(inv_amt * (gross_sel / 100.0), 2),
+                "net_profit_amt": np.round(inv_amt * (est_net / 100.0), 2),
+            }
+            lines: List[str] = []
 
-            report = pd.DataFrame(out_rows)
+            report = pd.DataFrame(out_rows) if sel.size else pd.DataFrame()
             had_symbols = set(df["symbol"].unique())
             opp_symbols = set(report["symbol"].unique()) if not report.empty else set()
             no_opp_symbols = sorted(had_symbols - opp_symbols)
@@ -3964,7 +4155,6 @@ def main() -> None:
                     len(no_opp_symbols),
                     len(had_symbols),
                 )
-                lines: List[str] = []
                 disclaimer = (
                     " [nota: datos multi-exchange; puede incluir venues no confiables o ilíquidos]"
                     if args.ex.strip().lower() == "all"
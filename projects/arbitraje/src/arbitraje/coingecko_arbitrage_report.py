@@ -7,12 +7,14 @@ import logging
 from datetime import datetime
 from typing import List, Dict
 
+import numpy as np
 import requests
 import pandas as pd
 from dotenv import load_dotenv
 
 from . import paths
 from .providers import coinpaprika
+from .spread_kernel import best_buy_sell
 
 # Basic logger
 logger = logging.getLogger("arbitraje")
@@ -148,26 +150,28 @@ def get_tickers(coin_id: str) -> List[Dict]:
 
 
 def find_spreads(df: pd.DataFrame) -> pd.DataFrame:
+    best = best_buy_sell(df, "coin", "price", "price")
+    prices = df["price"].to_numpy(dtype=float)
+    exchanges = df["exchange"].to_numpy()
+    buy_px = prices[best.buy_pos]
+    sell_px = prices[best.sell_pos]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread = (sell_px - buy_px) / buy_px * 100
+    hits = np.flatnonzero(best.valid & (spread >= SPREAD_THRESHOLD))
     results = []
-    for coin in df["coin"].unique():
-        subset = df[df["coin"] == coin]
-        if subset.empty:
-            continue
-        min_row = subset.loc[subset["price"].idxmin()]
-        max_row = subset.loc[subset["price"].idxmax()]
-        spread = (max_row["price"] - min_row["price"]) / min_row["price"] * 100
-        if spread >= SPREAD_THRESHOLD:
-            cinfo = get_coin_contract_info(coin)
-            results.append({
-                "coin": coin,
-                "buy_exchange": min_row["exchange"],
-                "buy_price": float(min_row["price"]),
-                "sell_exchange": max_row["exchange"],
-                "sell_price": float(max_row["price"]),
-                "spread_%": round(float(spread), 3),
-                "contract_chain": cinfo.get("primary_chain") or "N/A",
-                "contract_address": cinfo.get("primary_address") or "N/A",
-            })
+    for i in hits:
+        coin = best.labels[i]
+        cinfo = get_coin_contract_info(coin)
+        results.append({
+            "coin": coin,
+            "buy_exchange": exchanges[best.buy_pos[i]],
+            "buy_price": float(buy_px[i]),
+            "sell_exchange": exchanges[best.sell_pos[i]],
+            "sell_price": float(sell_px[i]),
+            "spread_%": round(float(spread[i]), 3),
+            "contract_chain": cinfo.get("primary_chain") or "N/A",
+            "contract_address": cinfo.get("primary_address") or "N/A",
+        })
     return pd.DataFrame(results)
 
 
@@ -0,0 +1,237 @@
+"""Background writer for scan outputs (CSVs and ``current_*.txt`` snapshots).
+
+The BF/tri loops used to rewrite their per-iteration CSVs and snapshot files on the
+scanning thread after every exchange. ``OutputWriter`` moves that I/O to a single
+daemon thread:
+
+- whole-file rewrites are atomic (temp file + ``os.replace``) and coalesced: if a
+  path is rewritten again before the thread got to it, only the newest content is
+  written;
+- appends (history files/CSVs) are queued per path and written in order, so
+  history grows incrementally instead of being re-serialized;
+- the queue holds one entry per pending *path*, so it stays bounded by the number
+  of distinct output files and the scan loop never waits on disk.
+
+CSV payloads are rendered on the writer thread as well.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Union
+
+import pandas as pd
+
+logger = logging.getLogger("arbitraje_ccxt")
+
+# Content for a rewrite: text, or a callable rendering it on the writer thread
+Payload = Union[str, Callable[[], str]]
+# Chunk for an append: text, or a callable taking "file is empty" and rendering text
+Chunk = Union[str, Callable[[bool], str]]
+
+
+def _render_csv(rows: Sequence[dict], columns: Sequence[str] | None, header: bool) -> str:
+    df = pd.DataFrame(list(rows), columns=list(columns) if columns else None)
+    return df.to_csv(index=False, header=header)
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+class OutputWriter:
+    """Single-thread, per-path coalescing writer."""
+
+    def __init__(self, max_pending: int = 256) -> None:
+        self._queue: "queue.Queue[Path | None]" = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # path -> ("replace", payload) | ("append", [chunks])
+        self._pending: Dict[Path, tuple] = {}
+        self._in_flight = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="arbitraje-output", daemon=True)
+        self._thread.start()
+
+    # ---- producer side -------------------------------------------------
+    def _submit(self, path: Path | str, kind: str, item) -> None:
+        path = Path(path)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("OutputWriter is closed")
+            current = self._pending.get(path)
+            if current is not None:
+                if kind == "replace":
+                    self._pending[path] = ("replace", item)
+                elif isinstance(current[1], _ReplaceThenAppend):
+                    current[1].append(item)
+                elif current[0] == "replace":
+                    self._pending[path] = ("replace", _ReplaceThenAppend(current[1], [item]))
+                else:
+                    current[1].append(item)
+                return
+            self._pending[path] = (kind, item if kind == "replace" else [item])
+            self._in_flight += 1
+        self._queue.put(path)
+
+    def write_text(self, path: Path | str, content: Payload) -> None:
+        """Replace the whole file (atomic); superseded rewrites are dropped."""
+        self._submit(path, "replace", content)
+
+    def append_text(self, path: Path | str, text: Chunk) -> None:
+        self._submit(path, "append", text)
+
+    def write_csv(
+        self, path: Path | str, rows: Iterable[dict], columns: Sequence[str] | None = None
+    ) -> None:
+        """Replace a CSV with ``rows``; rendering happens on the writer thread."""
+        rows = list(rows)
+        self.write_text(path, lambda: _render_csv(rows, columns, header=True))
+
+    def append_csv(
+        self, path: Path | str, rows: Iterable[dict], columns: Sequence[str] | None = None
+    ) -> None:
+        """Append ``rows`` to a CSV, writing the header only when the file is empty."""
+        rows = list(rows)
+        if not rows:
+            return
+        self.append_text(path, lambda empty: _render_csv(rows, columns, header=empty))
+
+    @contextmanager
+    def appending(self, path: Path | str) -> Iterator[io.StringIO]:
+        """``with writer.appending(p) as fh: fh.write(...)`` queues the text as one append."""
+        buf = io.StringIO()
+        try:
+            yield buf
+        finally:
+            if buf.tell():
+                self.append_text(path, buf.getvalue())
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until everything submitted so far is on disk."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout=timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- writer thread -------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            path = self._queue.get()
+            if path is None:
+                return
+            with self._lock:
+                kind, item = self._pending.pop(path)
+            try:
+                if kind == "replace":
+                    _ReplaceThenAppend.write(path, item)
+                else:
+                    _append_chunks(path, item)
+            except Exception as e:
+                logger.warning("No se pudo escribir %s: %s", path, e)
+            finally:
+                with self._idle:
+                    self._in_flight -= 1
+                    if self._in_flight == 0:
+                        self._idle.notify_all()
+
+
+class _ReplaceThenAppend:
+    """A pending rewrite followed by appends that arrived before it was written."""
+
+    def __init__(self, base: Payload, chunks: List[Chunk]) -> None:
+        self.base = base
+        self.chunks = chunks
+
+    def append(self, chunk: Chunk) -> None:
+        self.chunks.append(chunk)
+
+    @staticmethod
+    def write(path: Path, item) -> None:
+        if isinstance(item, _ReplaceThenAppend):
+            text = item.base() if callable(item.base) else item.base
+            for chunk in item.chunks:
+                text += chunk(not text) if callable(chunk) else chunk
+        else:
+            text = item() if callable(item) else item
+        _atomic_write_text(path, text)
+
+
+def _append_chunks(path: Path, chunks: List[Chunk]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8", newline="") as fh:
+        for chunk in chunks:
+            fh.write(chunk(fh.tell() == 0) if callable(chunk) else chunk)
+
+
+class SnapshotFile:
+    """In-memory ``current_*.txt`` content mirrored to disk through an ``OutputWriter``.
+
+    Every ``append``/``reset`` republishes the full text to ``path`` and each alias;
+    the writer coalesces those rewrites, so readers always see a complete file.
+    """
+
+    def __init__(self, writer: OutputWriter, path: Path, aliases: Sequence[Path] = ()) -> None:
+        self._writer = writer
+        self._targets = [Path(path), *[Path(a) for a in aliases]]
+        self._parts: List[str] = []
+
+    def reset(self, text: str = "") -> None:
+        self._parts = [text] if text else []
+        self._publish()
+
+    def append(self, text: str) -> None:
+        self._parts.append(text)
+        self._publish()
+
+    @contextmanager
+    def appending(self) -> Iterator[io.StringIO]:
+        """File-like drop-in for ``open(path, "a")``; published once on exit."""
+        buf = io.StringIO()
+        try:
+            yield buf
+        finally:
+            if buf.tell():
+                self.append(buf.getvalue())
+
+    @contextmanager
+    def rewriting(self) -> Iterator[io.StringIO]:
+        """File-like drop-in for ``open(path, "w")``."""
+        buf = io.StringIO()
+        try:
+            yield buf
+        finally:
+            self.reset(buf.getvalue())
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def _publish(self) -> None:
+        content = self.text
+        for target in self._targets:
+            self._writer.write_text(target, content)
+
+
+__all__ = ["OutputWriter", "SnapshotFile"]
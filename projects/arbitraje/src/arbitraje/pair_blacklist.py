@@ -0,0 +1,112 @@
+"""Compiled per-exchange pair blacklist.
+
+``load_swaps_blacklist`` yields normalized ``BASE/QUOTE`` symbols per exchange. Checking
+them with string formatting inside every edge/triangle loop is wasteful, so each
+exchange's set is compiled once into a symmetric boolean adjacency mask over the
+currency ids that appear in it. Lookups are a dict hit plus an array read, and the
+rate builders can filter whole candidate lists with a single fancy-index.
+
+The object still behaves like the original ``set[str]`` (``in``, ``len``, iteration,
+truthiness) so callers that test ``"A/B" in blacklist`` keep working.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+
+class PairBlacklist:
+    """Blacklisted pairs for one exchange; a pair blocks both trade directions."""
+
+    __slots__ = ("symbols", "ids", "mask")
+
+    def __init__(self, symbols: Iterable[str] = ()) -> None:
+        self.symbols: frozenset[str] = frozenset(symbols)
+        ids: Dict[str, int] = {}
+        links: List[Tuple[int, int]] = []
+        for sym in self.symbols:
+            base, sep, quote = sym.partition("/")
+            if not sep or not base or not quote:
+                continue
+            a = ids.setdefault(base, len(ids))
+            b = ids.setdefault(quote, len(ids))
+            links.append((a, b))
+        self.ids = ids
+        mask = np.zeros((len(ids), len(ids)), dtype=bool)
+        if links:
+            arr = np.asarray(links, dtype=np.intp)
+            mask[arr[:, 0], arr[:, 1]] = True
+            mask[arr[:, 1], arr[:, 0]] = True
+        self.mask = mask
+
+    # set-like surface kept for existing callers
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self.symbols
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.symbols)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __bool__(self) -> bool:
+        return bool(self.symbols)
+
+    def __repr__(self) -> str:
+        return f"PairBlacklist({sorted(self.symbols)!r})"
+
+    def _lookup(self, currencies: Sequence[str]) -> np.ndarray:
+        get = self.ids.get
+        return np.fromiter(
+            (get(str(c).upper(), -1) for c in currencies), dtype=np.intp, count=len(currencies)
+        )
+
+    def blocks(self, a: str, b: str) -> bool:
+        """True when a->b (or b->a) is blacklisted."""
+        if not self.ids:
+            return False
+        i = self.ids.get(str(a).upper())
+        if i is None:
+            return False
+        j = self.ids.get(str(b).upper())
+        if j is None:
+            return False
+        return bool(self.mask[i, j])
+
+    def submask(self, currencies: Sequence[str]) -> np.ndarray:
+        """Boolean (n, n) matrix: ``out[i, j]`` is True when currencies[i]->currencies[j] is blocked."""
+        n = len(currencies)
+        out = np.zeros((n, n), dtype=bool)
+        if not self.ids or n == 0:
+            return out
+        idx = self._lookup(currencies)
+        known = np.flatnonzero(idx >= 0)
+        if known.size:
+            out[np.ix_(known, known)] = self.mask[np.ix_(idx[known], idx[known])]
+        return out
+
+    def pairs_mask(self, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+        """Boolean vector, True for each (u, v) in ``pairs`` that is blocked."""
+        n = len(pairs)
+        if not self.ids or n == 0:
+            return np.zeros(n, dtype=bool)
+        u = self._lookup([p[0] for p in pairs])
+        v = self._lookup([p[1] for p in pairs])
+        known = (u >= 0) & (v >= 0)
+        out = np.zeros(n, dtype=bool)
+        out[known] = self.mask[u[known], v[known]]
+        return out
+
+    def filter_pairs(self, pairs: Sequence[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Return ``pairs`` without the blacklisted ones (order preserved)."""
+        if not self.ids:
+            return list(pairs)
+        blocked = self.pairs_mask(pairs)
+        return [p for p, bad in zip(pairs, blocked) if not bad]
+
+
+EMPTY_BLACKLIST = PairBlacklist()
+
+
+__all__ = ["PairBlacklist", "EMPTY_BLACKLIST"]
@@ -0,0 +1,90 @@
+"""Vectorized group-wise best buy / best sell selection.
+
+Replaces the ``for key, g in df.groupby(...)`` + ``idxmin``/``idxmax`` loops used by
+``coingecko_arbitrage_report.find_spreads`` and the INTER mode of
+``arbitrage_report_ccxt``. Rows are sorted once per price column by (group, price)
+with ``np.lexsort``; the head of each sorted segment is the group's best row.
+Ties resolve to the first row in input order, matching pandas ``idxmin``/``idxmax``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class GroupBest:
+    """Per-group selection result (one entry per distinct key).
+
+    ``buy_pos``/``sell_pos`` are positional indices into the input frame (use with
+    ``.to_numpy()[pos]`` or ``.iloc``). ``valid`` is False when a group has no finite
+    price on either side (all-NaN group), in which case the positions are meaningless.
+    """
+
+    labels: np.ndarray
+    sources: np.ndarray
+    buy_pos: np.ndarray
+    sell_pos: np.ndarray
+    valid: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.labels.shape[0])
+
+
+def _segment_heads(codes: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (order, starts) for rows sorted by (code, value), NaN values last."""
+    order = np.lexsort((values, codes))
+    sorted_codes = codes[order]
+    if sorted_codes.size == 0:
+        return order, np.empty(0, dtype=np.intp)
+    boundary = np.empty(sorted_codes.size, dtype=bool)
+    boundary[0] = True
+    np.not_equal(sorted_codes[1:], sorted_codes[:-1], out=boundary[1:])
+    return order, np.flatnonzero(boundary)
+
+
+def best_buy_sell(
+    df: pd.DataFrame,
+    key: str,
+    buy_col: str,
+    sell_col: str,
+    sort: bool = False,
+) -> GroupBest:
+    """Pick, per ``key`` group, the row with minimum ``buy_col`` and maximum ``sell_col``.
+
+    - ``sort=False`` keeps groups in order of first appearance (like ``Series.unique``);
+      ``sort=True`` orders them by key (like ``DataFrame.groupby``).
+    - Rows with a missing key are ignored.
+    """
+    codes, labels = pd.factorize(df[key], sort=sort)
+    codes = np.asarray(codes, dtype=np.int64)
+    keep = codes >= 0
+    pos = np.flatnonzero(keep)
+    codes = codes[keep]
+    buy = pd.to_numeric(df[buy_col], errors="coerce").to_numpy(dtype=float)[keep]
+    n_groups = len(labels)
+    sources = np.bincount(codes, minlength=n_groups)
+
+    order_b, starts = _segment_heads(codes, buy)
+    buy_local = order_b[starts]
+    if sell_col == buy_col:
+        sell = buy
+    else:
+        sell = pd.to_numeric(df[sell_col], errors="coerce").to_numpy(dtype=float)[keep]
+    # Sort on the negated column so the segment head is the maximum (NaN stays last)
+    order_s, _ = _segment_heads(codes, -sell)
+    sell_local = order_s[starts]
+
+    valid = ~(np.isnan(buy[buy_local]) | np.isnan(sell[sell_local]))
+    return GroupBest(
+        labels=np.asarray(labels),
+        sources=sources,
+        buy_pos=pos[buy_local],
+        sell_pos=pos[sell_local],
+        valid=valid,
+    )
+
+
+__all__ = ["GroupBest", "best_buy_sell"]
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from arbitraje import arbitrage_report_ccxt as arb
+from arbitraje.cross_graph import CrossVenueGraph, TransferCosts, parse_transfer_fees
+from arbitraje.pair_blacklist import EMPTY_BLACKLIST
+
+
+class FakeExchange:
+    has = {"fetchTickers": True}
+
+    def __init__(self, tickers):
+        self._tickers = tickers
+        self.markets = {}
+        for sym in tickers:
+            base, quote = sym.split("/")
+            self.markets[sym] = {"base": base, "quote": quote, "active": True}
+
+    def fetch_tickers(self):
+        return self._tickers
+
+
+ARGS = SimpleNamespace(
+    xg_currencies_limit=10, bf_fee=0.0, bf_require_topofbook=True, bf_min_quote_vol=0.0
+)
+
+
+def _venue(ex_id, btc_bid, btc_ask):
+    ex = FakeExchange({"BTC/USDT": {"bid": btc_bid, "ask": btc_ask, "quoteVolume": 1e6}})
+    return arb._xgraph_venue_rates(ex, ex_id, {"USDT"}, ARGS, EMPTY_BLACKLIST)
+
+
+def test_cross_venue_cycle_found_and_transfer_cost_applied():
+    cheap = _venue("alpha", 99.0, 100.0)
+    rich = _venue("beta", 103.0, 104.0)
+    graph = CrossVenueGraph.build([cheap, rich], TransferCosts(fee_pct=0.5, latency_bps=10))
+    assert graph.n_nodes == 4
+    cycles = graph.find_cycles({"USDT"}, max_hops=4, min_hops=3, min_transfers=1)
+    assert cycles, "buy BTC on alpha, move it, sell on beta, move USDT back"
+    best = cycles[0]
+    assert best.transfers == 2 and best.hops == 4
+    xfer = (1 - 0.005) * (1 - 0.001)
+    assert abs(best.rate - (1 / 100.0) * xfer * 103.0 * xfer) < 1e-12
+    # Same loop is reported once even though it starts at both USDT nodes
+    assert len(cycles) == 1
+
+
+def test_transfer_costs_can_kill_the_cycle_and_restrict_currencies():
+    cheap = _venue("alpha", 99.0, 100.0)
+    rich = _venue("beta", 103.0, 104.0)
+    graph = CrossVenueGraph.build([cheap, rich], TransferCosts(fee_pct=2.0))
+    assert graph.find_cycles({"USDT"}, max_hops=4) == []
+    only_usdt = CrossVenueGraph.build([cheap, rich], TransferCosts(currencies=frozenset({"USDT"})))
+    assert only_usdt.find_cycles({"USDT"}, max_hops=6) == []
+
+
+def test_parse_transfer_fees():
+    assert parse_transfer_fees("btc:0.05, USDT:0.1,bad") == {"BTC": 0.05, "USDT": 0.1}
+    assert parse_transfer_fees({"eth": 0.2}) == {"ETH": 0.2}
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from arbitraje.output_writer import OutputWriter, SnapshotFile
+
+
+def test_rewrites_coalesce_and_appends_keep_order(tmp_path):
+    current = tmp_path / "current.csv"
+    hist = tmp_path / "history.csv"
+    with OutputWriter() as w:
+        for i in range(50):
+            w.write_csv(current, [{"it": i, "net_pct": 0.1 * i}])
+            w.append_csv(hist, [{"it": i, "net_pct": 0.1 * i}])
+        w.write_csv(current, [], columns=["it", "net_pct"])
+        assert w.flush(timeout=5)
+    assert current.read_text() == "it,net_pct\n"
+    df = pd.read_csv(hist)
+    assert df["it"].tolist() == list(range(50))
+    # header written once even though rows were appended in 50 chunks
+    assert hist.read_text().count("it,net_pct") == 1
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_snapshot_mirrors_aliases(tmp_path):
+    main = tmp_path / "current_bf.txt"
+    alias = tmp_path / "CURRENT_BF.txt"
+    with OutputWriter() as w:
+        snap = SnapshotFile(w, main, aliases=[alias])
+        with snap.rewriting() as fh:
+            fh.write("[BF] Iteración 1/1\n")
+        snap.append("[####] 1/2\n")
+        with snap.appending() as fh:
+            fh.write("[####] 2/2\n")
+        with w.appending(tmp_path / "bf_history.txt") as fh:
+            fh.write("line\n")
+    expected = "[BF] Iteración 1/1\n[####] 1/2\n[####] 2/2\n"
+    assert main.read_text(encoding="utf-8") == expected
+    assert alias.read_text(encoding="utf-8") == expected
+    assert (tmp_path / "bf_history.txt").read_text() == "line\n"
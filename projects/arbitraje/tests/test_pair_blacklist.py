@@ -0,0 +1,33 @@
+import json
+import os
+
+from arbitraje import arbitrage_report_ccxt as arb
+from arbitraje.pair_blacklist import PairBlacklist
+
+
+def test_pair_blacklist_blocks_both_directions_and_stays_set_like():
+    bl = PairBlacklist({"BTC/USDT", "ETH/BTC"})
+    assert bl.blocks("BTC", "USDT") and bl.blocks("usdt", "btc")
+    assert not bl.blocks("ETH", "USDT")
+    assert "ETH/BTC" in bl and len(bl) == 2
+    sub = bl.submask(["USDT", "BTC", "ETH", "XRP"])
+    assert sub[0, 1] and sub[1, 0] and sub[1, 2] and not sub[0, 2] and not sub[3].any()
+    pairs = [("USDT", "BTC"), ("USDT", "ETH"), ("BTC", "ETH"), ("XRP", "USDT")]
+    assert bl.filter_pairs(pairs) == [("USDT", "ETH"), ("XRP", "USDT")]
+
+
+def test_load_swaps_blacklist_recompiles_only_on_mtime_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(arb.paths, "LOGS_DIR", tmp_path)
+    monkeypatch.setattr(arb.paths, "PROJECT_ROOT", tmp_path)
+    json_path = tmp_path / "swapper_blacklist.json"
+    json_path.write_text(json.dumps({"pairs": {"binance:btc/usdt": {}}}), encoding="utf-8")
+    first = arb.load_swaps_blacklist()
+    assert first["binance"].blocks("USDT", "BTC")
+    assert arb.load_swaps_blacklist() is first
+
+    json_path.write_text(json.dumps({"pairs": {"binance:eth/usdt": {}}}), encoding="utf-8")
+    st = json_path.stat()
+    os.utime(json_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    second = arb.load_swaps_blacklist()
+    assert second is not first
+    assert second["binance"].blocks("ETH", "USDT") and not second["binance"].blocks("BTC", "USDT")
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from arbitraje.spread_kernel import best_buy_sell
+
+
+def _random_frame(n: int, n_groups: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # Coarse prices so ties across exchanges are common
+    ask = np.round(rng.uniform(1.0, 2.0, n), 2)
+    return pd.DataFrame(
+        {
+            "symbol": rng.integers(0, n_groups, n).astype(str),
+            "exchange": rng.choice(["binance", "bitget", "bybit", "okx"], n),
+            "ask": ask,
+            "bid": np.round(ask - rng.uniform(0.0, 0.05, n), 2),
+        }
+    )
+
+
+def test_best_buy_sell_matches_groupby_idxmin_idxmax():
+    df = _random_frame(5000, 300)
+    best = best_buy_sell(df, "symbol", "ask", "bid", sort=True)
+    expected = list(df.groupby("symbol"))
+    assert list(best.labels) == [sym for sym, _ in expected]
+    for i, (_sym, g) in enumerate(expected):
+        assert best.sources[i] == len(g)
+        assert df.index[best.buy_pos[i]] == g["ask"].idxmin()
+        assert df.index[best.sell_pos[i]] == g["bid"].idxmax()
+
+
+def test_best_buy_sell_single_column_keeps_appearance_order_and_skips_nan():
+    df = pd.DataFrame(
+        {
+            "coin": ["eth", "btc", "eth", "btc", "sol", None],
+            "price": [10.0, 100.0, np.nan, 90.0, np.nan, 1.0],
+        }
+    )
+    best = best_buy_sell(df, "coin", "price", "price")
+    assert list(best.labels) == ["eth", "btc", "sol"]
+    assert list(best.sources) == [2, 2, 1]
+    assert list(best.valid) == [True, True, False]
+    assert list(best.buy_pos[:2]) == [0, 3]
+    assert list(best.sell_pos[:2]) == [0, 1]
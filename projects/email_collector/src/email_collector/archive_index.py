@@ -0,0 +1,274 @@
+"""Sidecar metadata index of the saved .eml archive (SQLite).
+
+``save_eml`` records each file's date, subject prefix, account, category and
+size here, so the retention purge is a range query on ``date_utc`` (plus an
+indexed prefix match for thread chains) followed by unlinks, instead of reading
+and parsing every file under the output folder.
+
+Archives written before the index existed are picked up by ``rebuild``, which
+reads only the header block of each file. ``ensure_built`` runs it once
+automatically the first time an index is opened over a non-empty archive.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+from datetime import datetime, timezone
+from email.header import decode_header, make_header
+from email.parser import BytesHeaderParser
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+log = logging.getLogger("email_collector")
+
+SUBJECT_PREFIX_CHARS = 64
+_HEADER_READ = 16 * 1024
+_FOLD = re.compile(r"\r?\n(?=[ \t])")
+_COMMIT_EVERY = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    date_utc TEXT NOT NULL,
+    subject_prefix TEXT NOT NULL DEFAULT '',
+    account TEXT,
+    category TEXT,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_files_date ON files(date_utc);
+CREATE INDEX IF NOT EXISTS ix_files_subject ON files(subject_prefix);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def subject_prefix(subject: Optional[str]) -> str:
+    """Normalized subject head used for the thread-prefix match."""
+    return (subject or "").strip().lower()[:SUBJECT_PREFIX_CHARS]
+
+
+def thread_prefix_keys(thread_prefixes: Iterable[str]) -> List[str]:
+    """Normalized thread prefixes that the stored ``subject_prefix`` can match exactly.
+
+    Only the first ``SUBJECT_PREFIX_CHARS`` characters of a subject are
+    indexed, so a longer prefix would match on its head alone and purge
+    subjects it does not start. Such prefixes are skipped with a warning.
+    """
+    keys = []
+    for p in thread_prefixes:
+        if not p or not p.strip():
+            continue
+        key = p.strip().lower()
+        if len(key) > SUBJECT_PREFIX_CHARS:
+            log.warning("Prefijo de hilo ignorado en la purga (más de %d caracteres): %r", SUBJECT_PREFIX_CHARS, p)
+            continue
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def _header_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return _as_utc(parsedate_to_datetime(value))
+    except Exception:
+        return None
+
+
+def header_fields(head: bytes) -> Tuple[Optional[datetime], str]:
+    """``(Date as UTC, Subject)`` from raw message bytes (only the header block is parsed).
+
+    Uses the compat32 parser; the Subject is decoded (RFC 2047) only when it
+    carries encoded words.
+    """
+    msg = BytesHeaderParser().parsebytes(head)
+    subject = msg.get("Subject") or ""
+    if not isinstance(subject, str):
+        subject = str(subject)
+    if "=?" in subject:
+        try:
+            subject = str(make_header(decode_header(subject)))
+        except Exception:
+            pass
+    date = msg.get("Date")
+    return _header_date(str(date) if date is not None else None), _FOLD.sub("", subject)
+
+
+def _read_headers(path: Path) -> Tuple[Optional[datetime], str]:
+    """``header_fields`` of an .eml file, reading up to the first blank line only."""
+    with open(path, "rb") as fh:
+        head = fh.read(_HEADER_READ)
+        while b"\n\n" not in head and b"\r\n\r\n" not in head:
+            more = fh.read(_HEADER_READ)
+            if not more:
+                break
+            head += more
+    return header_fields(head)
+
+
+class ArchiveIndex:
+    """Metadata rows for every .eml under ``root``, keyed by relative path."""
+
+    def __init__(self, path: Path | str, root: Path | str) -> None:
+        self.path = Path(path)
+        self.root = Path(root)
+        self._root_resolved = self.root.resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return int(self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0])
+
+    def _rel(self, path: Path | str) -> str:
+        p = Path(path)
+        try:
+            return p.relative_to(self.root).as_posix()
+        except ValueError:
+            pass
+        try:
+            return p.resolve().relative_to(self._root_resolved).as_posix()
+        except ValueError:
+            return p.as_posix()
+
+    def _location(self, rel: str) -> Tuple[Optional[str], Optional[str]]:
+        # <account>/<category>[/<domain>]/<file>.eml
+        parts = rel.split("/")
+        if len(parts) >= 3:
+            return parts[0], parts[1]
+        return None, None
+
+    # ---- writes ----------------------------------------------------------
+    def add(
+        self,
+        path: Path | str,
+        *,
+        date: Optional[datetime],
+        subject: Optional[str],
+        size: int,
+        account: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> None:
+        rel = self._rel(path)
+        loc_account, loc_category = self._location(rel)
+        date_utc = _as_utc(date) if date else datetime.now(timezone.utc)
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, date_utc, subject_prefix, account, category, size)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (rel, date_utc.isoformat(), subject_prefix(subject), account or loc_account, category or loc_category, int(size)),
+        )
+        self._pending += 1
+        if self._pending >= _COMMIT_EVERY:
+            self.commit()
+
+    def move(self, old: Path | str, new: Path | str, category: Optional[str] = None) -> None:
+        new_rel = self._rel(new)
+        _acc, loc_category = self._location(new_rel)
+        self._db.execute(
+            "UPDATE OR REPLACE files SET path=?, category=? WHERE path=?",
+            (new_rel, category or loc_category, self._rel(old)),
+        )
+        self._pending += 1
+
+    def forget(self, paths: Iterable[Path | str]) -> None:
+        self._db.executemany("DELETE FROM files WHERE path=?", ((self._rel(p),) for p in paths))
+        self._pending += 1
+
+    def commit(self) -> None:
+        self._db.commit()
+        self._pending = 0
+
+    # ---- queries ---------------------------------------------------------
+    def expired(self, cutoff: datetime, thread_prefixes: Sequence[str] = ()) -> Iterator[Tuple[Path, str]]:
+        """``(absolute path, "age" | "thread")`` of files due for the purge."""
+        cutoff_iso = _as_utc(cutoff).isoformat()
+        for (rel,) in self._db.execute("SELECT path FROM files WHERE date_utc < ?", (cutoff_iso,)).fetchall():
+            yield self.root / rel, "age"
+        seen: set = set()
+        for pref in thread_prefix_keys(thread_prefixes):
+            # prefix match as an index range: pref <= s < pref with last char bumped
+            upper = pref[:-1] + chr(ord(pref[-1]) + 1)
+            for (rel,) in self._db.execute(
+                "SELECT path FROM files WHERE subject_prefix >= ? AND subject_prefix < ? AND date_utc >= ?",
+                (pref, upper, cutoff_iso),
+            ).fetchall():
+                if rel not in seen:
+                    seen.add(rel)
+                    yield self.root / rel, "thread"
+
+    # ---- rebuild ---------------------------------------------------------
+    def is_complete(self) -> bool:
+        row = self._db.execute("SELECT value FROM meta WHERE key='complete'").fetchone()
+        return bool(row and row[0] == "1")
+
+    def rebuild(self) -> int:
+        """Re-index every .eml under ``root`` from its headers; returns the file count."""
+        # an interrupted rebuild must not leave a partial index marked complete
+        self._db.execute("DELETE FROM meta WHERE key='complete'")
+        self._db.execute("DELETE FROM files")
+        count = 0
+        for eml in self.root.rglob("*.eml"):
+            try:
+                st = eml.stat()
+                try:
+                    date, subject = _read_headers(eml)
+                except Exception:
+                    date, subject = None, ""
+                if date is None:
+                    date = datetime.fromtimestamp(st.st_mtime, tz=timezone.utc)
+                self.add(eml, date=date, subject=subject, size=st.st_size)
+                count += 1
+            except OSError:
+                continue
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('complete', '1')")
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('rebuilt_at', ?)", (datetime.now(timezone.utc).isoformat(),)
+        )
+        self.commit()
+        return count
+
+    def ensure_built(self) -> Optional[int]:
+        """Rebuild once when the index was never completed; returns the count if it ran."""
+        if self.is_complete():
+            return None
+        return self.rebuild()
+
+    def close(self) -> None:
+        self.commit()
+        self._db.close()
+
+    def __enter__(self) -> "ArchiveIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def record_date(value: Optional[str]) -> Optional[datetime]:
+    """``EmailRecord.date`` (``str(imap_tools msg.date)``) as UTC, None when unknown."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return _header_date(value)
+    # imap_tools falls back to 1900-01-01 when the Date header does not parse
+    if dt.year <= 1900:
+        return None
+    return _as_utc(dt)
+
+
+__all__ = ["ArchiveIndex", "header_fields", "record_date", "subject_prefix", "thread_prefix_keys"]
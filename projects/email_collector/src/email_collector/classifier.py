@@ -0,0 +1,469 @@
+"""Compiled form of the ``classify_email`` rules.
+
+``classify_email`` used to re-read ``config.yaml`` structures for every message:
+lowercasing keyword and domain lists, rebuilding domain lists inside each
+condition, running uncompiled regexes and re-parsing the ``"a AND b >= n"`` hard
+rule expressions. ``CompiledClassifier`` does all of that once per config:
+
+- keyword families (spam/scam/gambling/shorteners/markers/urgency/political)
+  are lowercased and deduplicated into one table and compiled into a single
+  regex, so a text is scanned once for all of them;
+- domain lists become frozensets, evasion/phone patterns are precompiled, the
+  phone patterns folded into a single alternation, and patterns that can only
+  match a digit are skipped on digit-free text;
+- hard rules are parsed into ``[(metric, minimum), ...]`` conjunctions.
+
+Per message, ``features`` computes everything that does not depend on the
+thresholds (counts, score, sender domain, hard-rule verdict) and caches it on the
+record; ``decide`` applies the thresholds, which are still read from
+``cfg["classifier"]["thresholds"]`` on every call because
+``--auto-tune-thresholds`` rewrites them between passes. Re-classifying the same
+record (auto-tune cycles, the dedup loop) therefore only re-runs ``decide``.
+The result is identical to the per-list scans it replaces.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+try:  # Python 3.11+
+    from re import _parser as _sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+_DEFAULT_PHONE = re.compile(r"\b(?:\+?\d[\d .()\-]{7,}\d)\b")
+_DIGIT = re.compile(r"\d")
+
+# keyword families counted on subject+body (metric name -> rules key)
+_TEXT_FAMILIES = (
+    ("spam", "spam_keywords"),
+    ("scam", "scam_keywords"),
+    ("gambling", "gambling_terms"),
+    ("shortener", "url_shorteners"),
+    ("marker", "suspicious_markers"),
+    ("urgency", "urgency_patterns"),
+    ("political", "political_keywords"),
+)
+
+
+def _trie_regex(node: dict) -> str:
+    """Alternation for the keywords below a trie ``node``, factored by prefix.
+
+    Branches are tried longest-first, so at a given offset the regex matches
+    the longest keyword that starts there.
+    """
+    alts = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if "" in node:
+        # a keyword ends here: the longer continuations are optional
+        body = "(?:" + body + ")?"
+    return body
+
+
+class KeywordCounter:
+    """Counts, per family, how many list entries occur as substrings of a text.
+
+    Keywords are lowercased and deduplicated across families once and compiled
+    into a single regex, so a text is scanned in one ``findall`` pass whatever
+    the number of keywords. The pattern is a lookahead, so matches may overlap;
+    at each offset it yields the longest keyword starting there, and every
+    keyword that is a prefix of it is credited as well. That finds exactly the
+    keywords ``k in text`` would. Each one is credited to every family/entry
+    that listed it; duplicate entries in a list count once per occurrence, as
+    with the old ``for p in patterns`` loop.
+    """
+
+    def __init__(self, families: Dict[str, Iterable[str]]) -> None:
+        self.families = list(families)
+        weight: Dict[str, Dict[str, int]] = {}
+        for fam, patterns in families.items():
+            for p in patterns or []:
+                if p:
+                    w = weight.setdefault(p.lower(), {})
+                    w[fam] = w.get(fam, 0) + 1
+        self._weight = weight
+        # keyword -> itself plus every shorter keyword it starts with
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            k: tuple(p for p in weight if k.startswith(p)) for k in weight
+        }
+        trie: dict = {}
+        for k in weight:
+            node = trie
+            for ch in k:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        self._rx: Optional[Pattern[str]] = re.compile("(?=(" + _trie_regex(trie) + "))") if weight else None
+
+    def count(self, text: str) -> Dict[str, int]:
+        out = dict.fromkeys(self.families, 0)
+        if not text or self._rx is None:
+            return out
+        found = {p for k in set(self._rx.findall(text)) for p in self._prefixes[k]}
+        for k in found:
+            for fam, w in self._weight[k].items():
+                out[fam] += w
+        return out
+
+
+def _compile_patterns(patterns: Iterable[str], flags: int = 0) -> List[Tuple[Optional[Pattern[str]], str]]:
+    out = []
+    for pat in patterns or []:
+        try:
+            out.append((re.compile(pat, flags), pat))
+        except re.error:
+            out.append((None, pat))
+    return out
+
+
+def _needs_digit(pattern: str, flags: int = 0) -> bool:
+    """True when every match of ``pattern`` must contain a ``\\d`` character.
+
+    Lets the phone/evasion regexes be skipped outright on text without digits.
+    Conservative: anything it does not understand counts as "not required".
+    """
+    def seq(items) -> bool:
+        return any(item(op, av) for op, av in items)
+
+    def item(op, av) -> bool:
+        name = str(op)
+        if name == "LITERAL":
+            return bool(_DIGIT.match(chr(av)))
+        if name == "IN":
+            kinds = {str(o) for o, _ in av}
+            if kinds == {"CATEGORY"}:
+                return all(str(a) == "CATEGORY_DIGIT" for _, a in av)
+            if kinds <= {"LITERAL", "RANGE"}:
+                return all(
+                    (str(o) == "LITERAL" and chr(a).isdigit() and chr(a).isascii())
+                    or (str(o) == "RANGE" and ord("0") <= a[0] <= a[1] <= ord("9"))
+                    for o, a in av
+                )
+            return False
+        if name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"):
+            lo, _hi, sub = av
+            return lo >= 1 and seq(sub)
+        if name == "SUBPATTERN":
+            return seq(av[-1])
+        if name == "ATOMIC_GROUP":
+            return seq(av)
+        if name == "BRANCH":
+            return all(seq(b) for b in av[1])
+        return False
+
+    try:
+        return seq(_sre_parse.parse(pattern, flags))
+    except Exception:
+        return False
+
+
+def _any_pattern(compiled: List[Tuple[Optional[Pattern[str]], str]], flags: int = 0) -> Tuple[Optional[Pattern[str]], List[Tuple[Optional[Pattern[str]], str]]]:
+    """Fold patterns into one alternation for "does any match" checks.
+
+    Returns ``(combined, rest)``; patterns with backreferences (whose numbering
+    would shift) and invalid ones (matched as literals) stay in ``rest``.
+    """
+    foldable = [pat for rx, pat in compiled if rx is not None and not re.search(r"\\[1-9]|\(\?P=", pat)]
+    rest = [(rx, pat) for rx, pat in compiled if rx is None or pat not in foldable]
+    if not foldable:
+        return None, rest
+    try:
+        return re.compile("|".join(f"(?:{pat})" for pat in foldable), flags), rest
+    except re.error:
+        return None, compiled
+
+
+def _parse_rules(rule_block: Iterable[dict]) -> List[List[Tuple[str, int]]]:
+    """``[{"any": ["a>=2 AND b", ...]}]`` -> list of conjunctions ``[(metric, minimum)]``.
+
+    A bare metric means ``> 0`` (minimum 1, metrics are integers); a non-numeric
+    right-hand side becomes 9999 as before.
+    """
+    parsed: List[List[Tuple[str, int]]] = []
+    for cond in rule_block or []:
+        for expr in cond.get("any", []):
+            terms: List[Tuple[str, int]] = []
+            for p in (x.strip() for x in expr.split("AND")):
+                if ">=" in p:
+                    left, right = [x.strip() for x in p.split(">=", 1)]
+                    try:
+                        needed = int(right)
+                    except ValueError:
+                        needed = 9999
+                    terms.append((left, needed))
+                else:
+                    terms.append((p, 1))
+            parsed.append(terms)
+    return parsed
+
+
+def _lower_set(items: Optional[Iterable[str]]) -> frozenset:
+    return frozenset(d.lower() for d in (items or []))
+
+
+class Features:
+    """Threshold-independent part of a classification (cached per record)."""
+
+    __slots__ = ("owner", "sender_domain", "score", "metrics", "hard")
+
+    def __init__(self, owner: "CompiledClassifier", sender_domain: str, score: int, metrics: Dict[str, int], hard: Optional[str]) -> None:
+        self.owner = owner
+        self.sender_domain = sender_domain
+        self.score = score
+        self.metrics = metrics
+        self.hard = hard
+
+
+class CompiledClassifier:
+    def __init__(self, cfg: dict) -> None:
+        self.cfg = cfg
+        rules = cfg.get("rules", {})
+        classifier_cfg = cfg.get("classifier", {})
+        scoring = classifier_cfg.get("scoring", {})
+        hard = classifier_cfg.get("hard_rules", {})
+
+        self.text_keywords = KeywordCounter({fam: rules.get(key, []) for fam, key in _TEXT_FAMILIES})
+        self.header_keywords = KeywordCounter({"header": rules.get("suspicious_headers", [])})
+        self.evasion = _compile_patterns(rules.get("evasion_patterns", []))
+        self.evasion_digit = [rx is not None and _needs_digit(pat) for rx, pat in self.evasion]
+        phone = rules.get("phone_patterns", []) or []
+        self.phone = _compile_patterns(phone, re.IGNORECASE) if phone else None
+        # phone only needs "does any pattern match": one combined search
+        self.phone_any, self.phone_rest = _any_pattern(self.phone, re.IGNORECASE) if phone else (None, [])
+        self.phone_any_digit = self.phone_any is not None and _needs_digit(self.phone_any.pattern, re.IGNORECASE)
+        # matched against the raw From, not lowercased (as before)
+        self.suspicious_domains = tuple(rules.get("suspicious_domains", []))
+        self.frequent_spam_domains = tuple(rules.get("frequent_spam_domains", []))
+
+        clean_marketing = cfg.get("clean_marketing_rules", {})
+        self.reputable_domains = _lower_set(clean_marketing.get("reputable_domains", []))
+        self.subject_markers = tuple(s.lower() for s in clean_marketing.get("subject_markers", []))
+
+        trans = cfg.get("transactional_short_allowlist", {})
+        self.trans_trusted = _lower_set(trans.get("trusted_domains", []))
+        self.trans_needles = tuple(s.lower() for s in trans.get("subject_must_match_one", []))
+        self.trans_max_body = int(trans.get("max_body_chars", 220) or 220)
+        self.trans_min_subject = int(trans.get("min_subject_chars", 3) or 3)
+
+        self.w = {
+            k: int(scoring.get(k, 0))
+            for k in (
+                "spam_keyword", "scam_keyword", "gambling_term", "url_shortener", "suspicious_header",
+                "suspicious_marker", "evasion_pattern", "urgency_pattern", "phone_pattern",
+                "reputable_domain_clean_bonus", "transactional_allow_bonus",
+            )
+        }
+        self.scam_if = _parse_rules(hard.get("scam_if", []))
+        self.spam_if = _parse_rules(hard.get("spam_if", []))
+        self.clean_if = _parse_rules(hard.get("clean_if", []))
+
+        overrides = rules.get("domain_overrides", {})
+        overrides = overrides if isinstance(overrides, dict) else {}
+        self.treat_fedex = bool(overrides.get("treat_fedex_shortener_as_clean", False))
+        self.force_clean = _lower_set(overrides.get("force_clean_domains", []))
+        self.force_spam = _lower_set(overrides.get("force_spam_domains", []))
+
+        dc = cfg.get("domain_classification", {}) or {}
+        self.dc_clean = _lower_set(dc.get("clean", []))
+        self.dc_clean_or_spam = _lower_set(dc.get("clean_or_spam", []))
+        self.dc_clean_or_scam = _lower_set(dc.get("clean_or_scam_sensitive", []))
+        self.dc_sus_or_unknown = _lower_set(dc.get("sus_or_unknown", []))
+        self.dc_sus_or_spam = _lower_set(dc.get("sus_or_spam", []))
+        self.credible_marketing = _lower_set(rules.get("credible_marketing_domains", []))
+
+    @staticmethod
+    def _rule_any(parsed: List[List[Tuple[str, int]]], metrics: Dict[str, int]) -> bool:
+        for terms in parsed:
+            if all(metrics.get(name, 0) >= needed for name, needed in terms):
+                return True
+        return False
+
+    def features(self, rec) -> Features:
+        """Everything the decision needs that does not depend on thresholds."""
+        subject = (rec.subject or "").lower()
+        body = (rec.body or "").lower()
+        headers = (rec.headers or "").lower()
+        full_text = f"{subject} {body}".strip()
+        from_raw = rec.from_addr or ""
+        from_l = from_raw.lower()
+
+        kw = self.text_keywords.count(full_text)
+        header_hits = self.header_keywords.count(headers)["header"]
+        # patterns that cannot match without a digit are skipped on digit-free text
+        has_digit = _DIGIT.search(full_text) is not None
+        evasion = 0
+        for (rx, pat), digit_only in zip(self.evasion, self.evasion_digit):
+            if digit_only and not has_digit:
+                continue
+            if (rx.search(full_text) if rx is not None else pat in full_text):
+                evasion += 1
+        if self.phone is not None:
+            phone = 0
+            if self.phone_any is not None and (has_digit or not self.phone_any_digit):
+                phone = 1 if self.phone_any.search(full_text) else 0
+            if not phone:
+                for rx, pat in self.phone_rest:
+                    if (rx.search(full_text) if rx is not None else pat.lower() in full_text):
+                        phone = 1
+                        break
+        else:
+            phone = 1 if _DEFAULT_PHONE.search(full_text) else 0
+
+        sender_domain = from_raw.split("@")[-1].lower() if from_raw and "@" in from_raw else ""
+        reputable = sender_domain in self.reputable_domains
+        shorteners = kw["shortener"]
+        is_newsletter = reputable and any(m in subject for m in self.subject_markers)
+        body_len = len(body.strip()) if body else 0
+        is_transactional_short = (
+            sender_domain in self.trans_trusted
+            and body_len <= self.trans_max_body
+            and len(subject) >= self.trans_min_subject
+            and any(n in subject for n in self.trans_needles)
+        )
+        w = self.w
+        score = (
+            kw["spam"] * w["spam_keyword"]
+            + kw["scam"] * w["scam_keyword"]
+            + kw["gambling"] * w["gambling_term"]
+            + shorteners * w["url_shortener"]
+            + header_hits * w["suspicious_header"]
+            + kw["marker"] * w["suspicious_marker"]
+            + evasion * w["evasion_pattern"]
+            + kw["urgency"] * w["urgency_pattern"]
+            + phone * w["phone_pattern"]
+        )
+        if is_newsletter:
+            score += w["reputable_domain_clean_bonus"]
+        if is_transactional_short:
+            score += w["transactional_allow_bonus"]
+
+        metrics = {
+            "scam_keywords": kw["scam"],
+            "spam_keywords": kw["spam"],
+            "gambling_terms": kw["gambling"],
+            "url_shorteners": shorteners,
+            "suspicious_headers": header_hits,
+            "suspicious_markers": kw["marker"],
+            "evasion_patterns": evasion,
+            "urgency_patterns": kw["urgency"],
+            "phone_patterns": phone,
+            "suspicious_domains": 1 if any(d in from_l for d in self.suspicious_domains) else 0,
+            "frequent_spam_domains": 1 if any(d in from_l for d in self.frequent_spam_domains) else 0,
+            "newsletter": 1 if is_newsletter else 0,
+            "transactional_short_allowlist matched": 1 if is_transactional_short else 0,
+            "reputable_marketing_safe": 1 if (reputable and shorteners == 0 and kw["scam"] == 0 and kw["spam"] == 0) else 0,
+            "political_keywords": 1 if kw["political"] > 0 else 0,
+            "fedex_shortener_combo": 1 if (self.treat_fedex and shorteners > 0 and "fedex" in full_text) else 0,
+        }
+        if self._rule_any(self.scam_if, metrics):
+            hard = "Scam"
+        elif self._rule_any(self.spam_if, metrics):
+            hard = "Spam"
+        elif self._rule_any(self.clean_if, metrics):
+            hard = "Clean"
+        else:
+            hard = None
+        return Features(self, sender_domain, score, metrics, hard)
+
+    def decide(self, f: Features) -> str:
+        """Category for precomputed features under the current thresholds."""
+        if f.hard:
+            return f.hard
+        m = f.metrics
+        sender_domain = f.sender_domain
+        scam_kw = m["scam_keywords"]
+        spam_kw = m["spam_keywords"]
+        shorteners = m["url_shorteners"]
+        urgency = m["urgency_patterns"]
+        markers = m["suspicious_markers"]
+        if sender_domain:
+            if sender_domain in self.dc_clean:
+                if scam_kw < 2 and shorteners == 0:
+                    return "Clean"
+            elif sender_domain in self.dc_clean_or_spam:
+                if spam_kw == 0 and scam_kw == 0:
+                    return "Clean"
+            elif sender_domain in self.dc_clean_or_scam:
+                strong = 0
+                strong += 1 if scam_kw >= 2 else 0
+                strong += 1 if shorteners and (urgency or markers) else 0
+                if strong == 0:
+                    return "Clean"
+                if strong == 1:
+                    return "Sus"
+            elif sender_domain in self.dc_sus_or_unknown:
+                if scam_kw == 0 and spam_kw == 0 and shorteners == 0:
+                    return "Unknown"
+                return "Sus"
+            elif sender_domain in self.dc_sus_or_spam:
+                if spam_kw > 0:
+                    return "Spam"
+                return "Sus"
+
+        # strong signals: several scam keywords, shortener + urgency/marker, phone + scam keyword
+        strong_flags = (
+            (1 if scam_kw >= 2 else 0)
+            + (1 if shorteners >= 1 and (urgency or markers) else 0)
+            + (1 if m["phone_patterns"] and scam_kw else 0)
+        )
+        if sender_domain in self.force_clean and strong_flags <= 1:
+            return "Clean"
+        if sender_domain in self.force_spam:
+            return "Spam"
+
+        score = f.score
+        thresholds = self.cfg.get("classifier", {}).get("thresholds", {})
+        to_scam = int(thresholds.get("to_scam", 9999))
+        marketing_like_domain = sender_domain in self.reputable_domains or sender_domain in self.dc_clean_or_spam
+        if score >= to_scam and marketing_like_domain and strong_flags <= 1:
+            return "Spam"
+        if score >= to_scam:
+            return "Scam"
+        if score >= int(thresholds.get("to_sus", 9999)):
+            return "Sus"
+        if score >= int(thresholds.get("to_spam", 9999)):
+            return "Spam"
+        if m["newsletter"] or m["transactional_short_allowlist matched"] or m["reputable_marketing_safe"]:
+            return "Clean"
+        if sender_domain in self.credible_marketing:
+            return "Clean"
+        if m["gambling_terms"] > 0:
+            return "Sus"
+        if m["frequent_spam_domains"] > 0:
+            return "Spam"
+        if scam_kw == 1 or markers == 1 or shorteners == 1:
+            return "Sus"
+        if spam_kw == 1 or m["evasion_patterns"] == 1:
+            return "Spam"
+        return "Unknown"
+
+    def classify(self, rec) -> str:
+        """``classify_email`` for one record; features are cached on ``rec.features``."""
+        f = getattr(rec, "features", None)
+        if not isinstance(f, Features) or f.owner is not self:
+            f = self.features(rec)
+            try:
+                rec.features = f
+            except Exception:
+                pass
+        try:
+            rec.score = f.score
+        except Exception:
+            pass
+        return self.decide(f)
+
+
+_compiled: Dict[int, Tuple[dict, CompiledClassifier]] = {}
+
+
+def compiled_classifier(cfg: dict) -> CompiledClassifier:
+    """Classifier for ``cfg``, compiled on first use (config is treated as read-only)."""
+    hit = _compiled.get(id(cfg))
+    if hit is None or hit[0] is not cfg:
+        hit = (cfg, CompiledClassifier(cfg))
+        _compiled[id(cfg)] = hit
+    return hit[1]
+
+
+__all__ = ["CompiledClassifier", "Features", "KeywordCounter", "compiled_classifier"]
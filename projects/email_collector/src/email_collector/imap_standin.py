@@ -0,0 +1,297 @@
+"""Small in-process IMAP server for exercising the fetch stage offline.
+
+Implements just enough IMAP4rev1 (plaintext) for imaplib/imap_tools:
+CAPABILITY, LOGIN, LIST, SELECT/EXAMINE (with UIDVALIDITY), SEARCH and
+UID SEARCH (ALL, UID sets, date keys are accepted and ignored), FETCH and
+UID FETCH (UID, FLAGS, RFC822.SIZE, BODY[]/BODY[HEADER] and their .PEEK forms),
+NOOP and LOGOUT. Every byte sent is counted so runs can be compared by traffic.
+
+Throughput report (cold run, then an incremental run over new mail)::
+
+    python -m email_collector.imap_standin --messages 5000 --new 500
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+_ATOM = re.compile(rb'"((?:[^"\\]|\\.)*)"|(\S+)')
+
+
+class Mailbox:
+    def __init__(self, uidvalidity: int = 1) -> None:
+        self.uidvalidity = uidvalidity
+        self.next_uid = 1
+        self.messages: List[Tuple[int, List[str], bytes]] = []  # (uid, flags, raw)
+
+    def append(self, raw: bytes) -> int:
+        uid = self.next_uid
+        self.next_uid += 1
+        self.messages.append((uid, [], raw))
+        return uid
+
+
+def _parse_set(spec: str, top: int) -> List[Tuple[int, int]]:
+    out = []
+    for part in spec.split(","):
+        lo, _, hi = part.partition(":")
+        a = top if lo == "*" else int(lo)
+        b = a if not hi else (top if hi == "*" else int(hi))
+        out.append((min(a, b), max(a, b)))
+    return out
+
+
+def _in_set(n: int, ranges: List[Tuple[int, int]]) -> bool:
+    return any(lo <= n <= hi for lo, hi in ranges)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "StandInIMAPServer"
+
+    def send(self, data: bytes) -> None:
+        self.wfile.write(data)
+        self.server.bytes_sent += len(data)
+
+    def handle(self) -> None:
+        self.box: Optional[Mailbox] = None
+        # responses go out in several small writes; don't let Nagle stall them
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.send(b"* OK [CAPABILITY IMAP4rev1] stand-in ready\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            parts = [m.group(1) or m.group(2) for m in _ATOM.finditer(line.rstrip(b"\r\n"))]
+            if len(parts) < 2:
+                continue
+            tag, cmd, args = parts[0], parts[1].upper(), [p.decode() for p in parts[2:]]
+            self.server.commands += 1
+            if cmd == b"UID" and args:
+                cmd, args, by_uid = args[0].upper().encode(), args[1:], True
+            else:
+                by_uid = False
+            handler = getattr(self, f"do_{cmd.decode().lower()}", None)
+            if handler is None:
+                self.send(tag + b" BAD unknown command\r\n")
+                continue
+            if handler(tag, args, by_uid) is False:
+                return
+
+    # ---- commands --------------------------------------------------------
+    def do_capability(self, tag, args, by_uid):
+        self.send(b"* CAPABILITY IMAP4rev1\r\n" + tag + b" OK CAPABILITY completed\r\n")
+
+    def do_noop(self, tag, args, by_uid):
+        self.send(tag + b" OK NOOP completed\r\n")
+
+    def do_login(self, tag, args, by_uid):
+        self.send(tag + b" OK LOGIN completed\r\n")
+
+    def do_logout(self, tag, args, by_uid):
+        self.send(b"* BYE logging out\r\n" + tag + b" OK LOGOUT completed\r\n")
+        return False
+
+    def do_list(self, tag, args, by_uid):
+        for name in self.server.folders:
+            self.send(f'* LIST (\\HasNoChildren) "/" "{name}"\r\n'.encode())
+        self.send(tag + b" OK LIST completed\r\n")
+
+    def do_select(self, tag, args, by_uid):
+        name = args[0] if args else "INBOX"
+        box = self.server.folders.get(name)
+        if box is None:
+            self.send(tag + b" NO no such mailbox\r\n")
+            return
+        self.box = box
+        self.send(
+            f"* {len(box.messages)} EXISTS\r\n* 0 RECENT\r\n"
+            f"* OK [UIDVALIDITY {box.uidvalidity}] UIDs valid\r\n"
+            f"* OK [UIDNEXT {box.next_uid}] next UID\r\n"
+            "* FLAGS (\\Seen)\r\n".encode()
+            + tag + b" OK [READ-WRITE] SELECT completed\r\n"
+        )
+
+    do_examine = do_select
+
+    def do_search(self, tag, args, by_uid):
+        box = self.box
+        if box is None:
+            self.send(tag + b" NO no mailbox selected\r\n")
+            return
+        if args and args[0].upper() == "CHARSET":
+            args = args[2:]
+        # criteria like "(SINCE 1-Jan-2024)" arrive as separate tokens; keep UID sets only
+        tokens = [a.strip("()") for a in args]
+        uid_ranges = None
+        for i, tok in enumerate(tokens):
+            if tok.upper() == "UID" and i + 1 < len(tokens):
+                top = box.messages[-1][0] if box.messages else 0
+                uid_ranges = _parse_set(tokens[i + 1], top)
+        hits = []
+        for seq, (uid, _flags, _raw) in enumerate(box.messages, 1):
+            if uid_ranges is None or _in_set(uid, uid_ranges):
+                hits.append(uid if by_uid else seq)
+        if uid_ranges and not hits and box.messages:
+            # RFC 3501: "n:*" always includes the highest UID
+            if any(hi >= box.messages[-1][0] for _lo, hi in uid_ranges):
+                hits.append(box.messages[-1][0] if by_uid else len(box.messages))
+        self.send(("* SEARCH " + " ".join(map(str, hits))).rstrip().encode() + b"\r\n")
+        self.send(tag + b" OK SEARCH completed\r\n")
+
+    def do_fetch(self, tag, args, by_uid):
+        box = self.box
+        if box is None or len(args) < 2:
+            self.send(tag + b" BAD fetch\r\n")
+            return
+        items = " ".join(args[1:]).strip("()").upper().split()
+        top = box.messages[-1][0] if by_uid and box.messages else len(box.messages)
+        ranges = _parse_set(args[0], top)
+        for seq, (uid, flags, raw) in enumerate(box.messages, 1):
+            if not _in_set(uid if by_uid else seq, ranges):
+                continue
+            fields: List[str] = []
+            literal: Optional[Tuple[str, bytes]] = None
+            if by_uid or "UID" in items:
+                fields.append(f"UID {uid}")
+            for item in items:
+                if item == "FLAGS":
+                    fields.append(f"FLAGS ({' '.join(flags)})")
+                elif item == "RFC822.SIZE":
+                    fields.append(f"RFC822.SIZE {len(raw)}")
+                elif item.startswith("BODY"):
+                    section = item[item.index("[") + 1:item.index("]")] if "[" in item else ""
+                    if section == "HEADER":
+                        end = raw.find(b"\r\n\r\n")
+                        data = raw[: end + 4] if end >= 0 else raw
+                    else:
+                        data = raw
+                    if ".PEEK" not in item and "\\Seen" not in flags:
+                        flags.append("\\Seen")
+                    literal = (f"BODY[{section}]", data)
+            head = f"* {seq} FETCH ({' '.join(fields)}"
+            if literal:
+                self.send(f"{head} {literal[0]} {{{len(literal[1])}}}\r\n".encode() + literal[1] + b")\r\n")
+            else:
+                self.send(head.encode() + b")\r\n")
+        self.send(tag + b" OK FETCH completed\r\n")
+
+
+class StandInIMAPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        super().__init__((host, port), _Handler)
+        self.folders: Dict[str, Mailbox] = {"INBOX": Mailbox()}
+        self.bytes_sent = 0
+        self.commands = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> "StandInIMAPServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="imap-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def reset_counters(self) -> None:
+        self.bytes_sent = 0
+        self.commands = 0
+
+
+# ---------------------------------------------------------------- benchmark
+def synthetic_message(i: int, *, subject: Optional[str] = None, sender: str = "ventas@tienda.example",
+                      message_id: Optional[str] = None, body_kb: int = 20) -> bytes:
+    date = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i)
+    body = (f"Hola, este es el mensaje numero {i} de la prueba de sincronizacion. " * 40)[: body_kb * 1024]
+    return (
+        f"From: {sender}\r\nTo: yo@example.com\r\nSubject: {subject or f'Oferta especial {i}'}\r\n"
+        f"Date: {format_datetime(date)}\r\nMessage-ID: {message_id or f'<m{i}@standin>'}\r\n"
+        f"Content-Type: text/plain; charset=utf-8\r\n\r\n{body}\r\n"
+    ).encode("utf-8")
+
+
+def _bench(argv: Optional[List[str]] = None) -> None:
+    from . import main as collector
+    from .store import SyncStore
+
+    ap = argparse.ArgumentParser(description="Throughput of fetch_emails_for_account against a local IMAP stand-in")
+    ap.add_argument("--messages", type=int, default=5000)
+    ap.add_argument("--new", type=int, default=500, help="Mensajes nuevos para la corrida incremental")
+    ap.add_argument("--reject-pct", type=float, default=40.0, help="%% de mensajes rechazables por cabecera")
+    ap.add_argument("--chunk-size", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    cfg = {
+        "exclude_thread_prefixes": ["re:", "fw:"],
+        "exclusions": {"blacklist": [{"pattern": "noreply@spam.example", "reason": "blacklisted"}]},
+    }
+    server = StandInIMAPServer().start()
+    inbox = server.folders["INBOX"]
+
+    def fill(start: int, count: int) -> None:
+        for i in range(start, start + count):
+            # every k-th message is a thread reply, a blacklisted sender or a resent Message-ID
+            roll = (i * 37) % 100
+            if roll < args.reject_pct / 3:
+                inbox.append(synthetic_message(i, subject=f"RE: hilo {i}"))
+            elif roll < 2 * args.reject_pct / 3:
+                inbox.append(synthetic_message(i, sender="noreply@spam.example"))
+            elif roll < args.reject_pct and i > 0:
+                inbox.append(synthetic_message(i, message_id=f"<m{i - 1}@standin>"))
+            else:
+                inbox.append(synthetic_message(i))
+
+    def run(label: str, store: Optional[SyncStore], header_first: bool) -> None:
+        server.reset_counters()
+        t0 = time.perf_counter()
+        recs = collector.fetch_emails_for_account(
+            account_name="standin", provider="standin", host="127.0.0.1", port=server.port,
+            user="yo@example.com", password="x", folders=["INBOX"], max_age_days=0, max_emails=0,
+            chunk_size=args.chunk_size, store=store, header_first=header_first,
+            header_filter=lambda r: (None if collector.validate_headers(cfg, r)[0] else "invalid"),
+            use_ssl=False,
+        )
+        dt = time.perf_counter() - t0
+        bodies = sum(1 for r in recs if r.valid is not False)
+        print(
+            f"{label:<28} {len(recs):>7} {bodies:>7} {server.bytes_sent / 1e6:>9.2f} "
+            f"{server.commands:>6} {dt:>7.2f} {len(recs) / dt if dt else 0:>8.0f}"
+        )
+        if store:
+            store.commit()
+
+    fill(0, args.messages)
+    print(f"{'run':<28} {'msgs':>7} {'bodies':>7} {'MB sent':>9} {'cmds':>6} {'secs':>7} {'msg/s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        run("cold, full bodies", None, header_first=False)
+        run("cold, header-first", None, header_first=True)
+        store = SyncStore(Path(tmp) / "dedup.sqlite3")
+        run("cold, header-first + store", store, header_first=True)
+        fill(args.messages, args.new)
+        run("incremental (checkpoint)", store, header_first=True)
+        run("incremental, nothing new", store, header_first=True)
+        store.close()
+    server.stop()
+
+
+if __name__ == "__main__":
+    _bench()
+
+
+__all__ = ["Mailbox", "StandInIMAPServer", "synthetic_message"]
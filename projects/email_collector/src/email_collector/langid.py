@@ -0,0 +1,257 @@
+"""Language identification for ``validate_email`` (cached, short-circuiting).
+
+``langdetect`` is one of the slowest per-message steps and, unseeded, gives a
+different answer on every run. ``LanguageIdentifier.probability`` returns the
+probability of the expected language in stages, cheapest first:
+
+1. a content-digest cache (in memory, plus an optional SQLite file shared across
+   runs and worker processes);
+2. a script check: text written mostly in a non-Latin script cannot be a
+   Latin-script language;
+3. function-word counts: words that only occur in one language's stopword list
+   decide the clear cases (almost all hits in the expected language, or almost
+   none while another language has plenty);
+4. ``langdetect`` with a fixed seed on a truncated window, for the rest.
+
+Only detector results are cached; the heuristics are cheaper than a lookup.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from langdetect.detector_factory import init_factory
+import langdetect.detector_factory as _df
+
+_STOPWORDS: Dict[str, str] = {
+    "es": "el los las del que y en un una por con para es se su sus al lo le les como más pero ya este esta estos"
+          " sí porque entre cuando muy sin sobre también me hasta hay donde quien desde nos durante todos uno ni"
+          " otros ese eso ellos esto antes algunos qué unos yo otro otras otra él tanto esa mucho nada muchos usted"
+          " ustedes tu tus mis nuestro nuestra nuestros tiene tienen puede ha han cómo estás estoy día días hola"
+          " estimado gracias saludos",
+    "en": "the and of to in is that it for on with as was at by be this have from or an are not but you your we our"
+          " will can has been they their which would there what about if so do please thank dear",
+    "pt": "não uma um com para os ao aos à às das dos pelo pela pelos pelas você vocês são está muito mais isso"
+          " também como mas foi ele ela seu sua seus suas nosso nossa nós já só quando então há este esta essa até"
+          " obrigado obrigada olá prezado se",
+    "fr": "le les des du est une pour pas qui dans sur au aux avec ce cette ces il elle nous vous votre vos notre"
+          " nos mon ma mes son ses leur leurs sont ou mais être été fait très aussi plus je tu ils elles à un",
+    "it": "il lo gli della delle dello degli nel nella nei alla alle al ai dal dalla che di è per non una sono anche"
+          " più ma questo questa quello si essere ha hanno suo sua suoi stato stata molto tutti ci ti mi vi ogni"
+          " dopo tra grazie gentile un se sul sulla sulle suo",
+    "de": "der die und das ist nicht ein eine zu den mit sich des auf für im dem von sie es auch als wir ihr werden"
+          " ich du ihnen ihre ihren unser unsere oder aber bei nach vom zum zur sind wird wurde hat haben bitte"
+          " vielen dank",
+    "ca": "el els les amb és aquest aquesta això però també molt seu seva seus seves meu teu nostre vostre hi"
+          " nosaltres vosaltres perquè dels als pel pels per la una un són han hem heu gràcies",
+    "gl": "non unha coa co dos das polo pola tamén moi ao",
+}
+
+
+def _exclusive_stopwords() -> Dict[str, str]:
+    """word -> language, keeping only words that appear in exactly one list."""
+    owners: Dict[str, set] = {}
+    for lang, words in _STOPWORDS.items():
+        for w in words.split():
+            owners.setdefault(w, set()).add(lang)
+    return {w: next(iter(langs)) for w, langs in owners.items() if len(langs) == 1}
+
+
+_EXCLUSIVE = _exclusive_stopwords()
+_WORD = re.compile(r"[^\W\d_]+")
+_URL = re.compile(r"https?://\S+|\S+@\S+")
+
+MIN_HITS = 6
+ACCEPT_SHARE = 0.85
+# share of all scanned words; a mixed text whose other half has few listed words stays ambiguous
+ACCEPT_DENSITY = 0.15
+REJECT_DENSITY = 0.20
+LINE_SHARE = 0.6
+REJECT_SHARE = 0.10
+HEURISTIC_TOKENS = 400
+
+
+class LangCache:
+    """``digest -> "lang:prob ..."`` rows persisted across runs."""
+
+    def __init__(self, path: Path | str, readonly: bool = False) -> None:
+        self.path = Path(path)
+        if readonly:
+            if not self.path.exists():
+                self._db = None
+                return
+            self._db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path))
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS langs (digest TEXT PRIMARY KEY, probs TEXT NOT NULL)")
+            self._db.commit()
+
+    def get(self, digest: str) -> Optional[str]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute("SELECT probs FROM langs WHERE digest=?", (digest,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def put_many(self, rows: List[Tuple[str, str]]) -> None:
+        if self._db is not None and rows:
+            self._db.executemany("INSERT OR IGNORE INTO langs (digest, probs) VALUES (?, ?)", rows)
+
+    def commit(self) -> None:
+        if self._db is not None:
+            self._db.commit()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+
+def _parse_probs(probs: str) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for item in probs.split():
+        lang, _, p = item.partition(":")
+        try:
+            out[lang] = float(p)
+        except ValueError:
+            continue
+    return out
+
+
+class LanguageIdentifier:
+    """Probability of ``expected`` for a text, deterministic across runs."""
+
+    def __init__(self, expected: str = "es", window_chars: int = 2000, seed: int = 0,
+                 cache: Optional[LangCache] = None, heuristics: bool = True) -> None:
+        self.expected = expected
+        self.window_chars = int(window_chars or 0)
+        self.seed = int(seed)
+        self.cache = cache
+        self.heuristics = heuristics and expected in _STOPWORDS
+        self._memo: Dict[str, str] = {}
+        self._fresh: List[Tuple[str, str]] = []
+        self.stats = {"cache": 0, "script": 0, "stopwords": 0, "detector": 0}
+
+    def _digest(self, text: str) -> str:
+        window = text[: self.window_chars] if self.window_chars > 0 else text
+        return hashlib.blake2b(f"{self.seed}\x00{window}".encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+    def _heuristic(self, text: str) -> Optional[float]:
+        # the detector sees the text without URLs/addresses, cut to the window
+        sample = _URL.sub(" ", text)
+        if self.window_chars > 0:
+            sample = sample[: self.window_chars]
+        # langdetect's own rule: with twice as many non-Latin as ASCII letters it
+        # drops the Latin text, so a Latin-script language cannot win
+        latin = other = 0
+        for ch in sample:
+            if "A" <= ch <= "z":
+                latin += 1
+            elif ch >= "\u0300" and not ("\u1e00" <= ch <= "\u1eff"):
+                other += 1
+        if other >= 20 and latin * 2 < other:
+            self.stats["script"] += 1
+            return 0.0
+        if other * 10 > latin:
+            return None  # mixed scripts: leave it to the detector
+        # per-line labels: a line dominated by another language makes the text
+        # mixed, and mixed texts always go to the detector
+        hits: Dict[str, int] = {}
+        labels: set = set()
+        words = 0
+        for line in sample.lower().splitlines():
+            line_hits: Dict[str, int] = {}
+            for m in _WORD.finditer(line):
+                words += 1
+                if words > HEURISTIC_TOKENS:
+                    break
+                lang = _EXCLUSIVE.get(m.group(0))
+                if lang:
+                    line_hits[lang] = line_hits.get(lang, 0) + 1
+            if line_hits:
+                top = max(line_hits, key=line_hits.get)
+                n = sum(line_hits.values())
+                if line_hits[top] >= 2 and line_hits[top] >= LINE_SHARE * n:
+                    labels.add(top)
+                for lang, c in line_hits.items():
+                    hits[lang] = hits.get(lang, 0) + c
+            if words > HEURISTIC_TOKENS:
+                break
+        total = sum(hits.values())
+        if total < MIN_HITS:
+            return None
+        words = min(words, HEURISTIC_TOKENS)
+        own = hits.get(self.expected, 0)
+        if labels == {self.expected} and own >= ACCEPT_SHARE * total and own >= ACCEPT_DENSITY * words:
+            self.stats["stopwords"] += 1
+            return 1.0
+        if labels and self.expected not in labels and own <= REJECT_SHARE * total:
+            top = max(hits.values())
+            if top >= MIN_HITS and top >= REJECT_DENSITY * words:
+                self.stats["stopwords"] += 1
+                return 0.0
+        return None
+
+    def _detect(self, text: str) -> str:
+        init_factory()
+        detector = _df._factory.create()
+        detector.seed = self.seed
+        if self.window_chars > 0:
+            detector.set_max_text_length(self.window_chars)
+        detector.append(text)
+        # LangDetectException (no features) propagates, same as detect_langs
+        return " ".join(f"{lp.lang}:{lp.prob:.4f}" for lp in detector.get_probabilities())
+
+    def probability(self, text: str) -> float:
+        digest = self._digest(text)
+        probs = self._memo.get(digest)
+        if probs is None and self.cache is not None:
+            probs = self.cache.get(digest)
+        if probs is not None:
+            self.stats["cache"] += 1
+        else:
+            guess = self._heuristic(text) if self.heuristics else None
+            if guess is not None:
+                return guess
+            probs = self._detect(text)
+            self.stats["detector"] += 1
+            self._fresh.append((digest, probs))
+        if len(self._memo) > 100_000:
+            self._memo.clear()
+        self._memo[digest] = probs
+        return _parse_probs(probs).get(self.expected, 0.0)
+
+    def drain_fresh(self) -> List[Tuple[str, str]]:
+        """Detector results computed since the last call, for ``LangCache.put_many``."""
+        fresh, self._fresh = self._fresh, []
+        return fresh
+
+
+_identifiers: Dict[int, Tuple[dict, LanguageIdentifier]] = {}
+
+
+def language_identifier(cfg: dict) -> LanguageIdentifier:
+    """Identifier for ``cfg`` (built once per config object)."""
+    hit = _identifiers.get(id(cfg))
+    if hit is not None and hit[0] is cfg:
+        return hit[1]
+    lang_cfg = cfg.get("language_validation", {}) or {}
+    ident = LanguageIdentifier(
+        expected=cfg.get("language", {}).get("code", "es"),
+        window_chars=int(lang_cfg.get("window_chars", 2000) or 0),
+        seed=int(lang_cfg.get("seed", 0) or 0),
+        heuristics=bool(lang_cfg.get("heuristics", True)),
+    )
+    _identifiers[id(cfg)] = (cfg, ident)
+    return ident
+
+
+__all__ = ["LangCache", "LanguageIdentifier", "language_identifier"]
@@ -11,9 +11,9 @@ import argparse
 import logging
 import os
 import re
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta, timezone
-from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -28,24 +28,22 @@ try:
     import msal  # for OAuth device code flow
 except ImportError:
     msal = None
-from imap_tools import MailBox, A
-from langdetect import detect, detect_langs
+from imap_tools import MailBox, MailBoxUnencrypted, MailMessage, A
 import hashlib
 
-
-def _canonical_text(subject: str, body: str) -> str:
-    txt = f"{subject or ''}\n{body or ''}".lower()
-    txt = re.sub(r"https?://\S+", " ", txt)
-    txt = re.sub(r"\s+", " ", txt).strip()
-    txt = re.sub(r"\d{3,}", " ", txt)
-    return txt
-
-
-def _text_signature(text: str, shingle_size: int = 4) -> set:
-    tokens = [t for t in re.split(r"[^a-z0-9]+", text) if t]
-    if len(tokens) < shingle_size:
-        return set(tokens)
-    return {" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)}
+from .near_dup import (
+    MinHasher,
+    NearDuplicateIndex,
+    canonical_text as _canonical_text,
+    shingle_hashes,
+    text_shingles as _text_signature,
+)
+from .store import SyncStore, content_digest
+from .archive_index import ArchiveIndex, record_date
+from .classifier import compiled_classifier
+from .langid import LangCache, language_identifier
+from .pack_archive import PackArchive
+from .pipeline import RecordQueue, ordered_map
 
 
 def is_similar(a: 'EmailRecord', b_sig: set, threshold: float = 0.85) -> bool:
@@ -87,240 +85,17 @@ class EmailRecord:
     message_id: Optional[str] = None
     account_email: Optional[str] = None
     score: Optional[int] = None
+    uid: Optional[int] = None
+    # classifier.Features cached by the first classify_email call
+    features: Optional[object] = field(default=None, repr=False, compare=False)
 
 
 def classify_email(cfg: dict, rec: EmailRecord) -> str:
-    subject = (rec.subject or "").lower()
-    body = (rec.body or "").lower()
-    headers = (rec.headers or "").lower()
-    full_text = f"{subject} {body}".strip()
-
-    rules = cfg.get("rules", {})
-    classifier_cfg = cfg.get("classifier", {})
-    scoring_cfg = classifier_cfg.get("scoring", {})
-    thresholds = classifier_cfg.get("thresholds", {})
-    hard = classifier_cfg.get("hard_rules", {})
-
-    def count_matches(text_: str, patterns: List[str]) -> int:
-        if not text_ or not patterns:
-            return 0
-        c = 0
-        for p in patterns:
-            if p and p.lower() in text_:
-                c += 1
-        return c
-
-    spam_keyword_count = count_matches(full_text, rules.get("spam_keywords", []))
-    scam_keyword_count = count_matches(full_text, rules.get("scam_keywords", []))
-    gambling_term_count = count_matches(full_text, rules.get("gambling_terms", []))
-    url_shortener_count = count_matches(full_text, rules.get("url_shorteners", []))
-    suspicious_header_count = count_matches(headers, rules.get("suspicious_headers", []))
-    suspicious_marker_count = count_matches(full_text, rules.get("suspicious_markers", []))
-    evasion_raw_patterns = rules.get("evasion_patterns", [])
-    evasion_pattern_count = 0
-    for pat in evasion_raw_patterns:
-        try:
-            if re.search(pat, full_text):
-                evasion_pattern_count += 1
-        except re.error:
-            if pat in full_text:
-                evasion_pattern_count += 1
-    urgency_patterns = rules.get("urgency_patterns", [])
-    urgency_pattern_count = sum(1 for p in urgency_patterns if p and p.lower() in full_text)
-    phone_cfg_patterns = rules.get("phone_patterns", []) or []
-    phone_pattern_count = 0
-    if phone_cfg_patterns:
-        for pat in phone_cfg_patterns:
-            try:
-                if re.search(pat, full_text, re.IGNORECASE):
-                    phone_pattern_count = 1
-                    break
-            except re.error:
-                if pat.lower() in full_text:
-                    phone_pattern_count = 1
-                    break
-    else:
-        phone_pattern_regex = re.compile(r"\b(?:\+?\d[\d .()\-]{7,}\d)\b")
-        phone_pattern_count = 1 if phone_pattern_regex.search(full_text) else 0
-    suspicious_domain_count = 1 if any(d in (rec.from_addr or "").lower() for d in rules.get("suspicious_domains", [])) else 0
-    frequent_spam_domain_count = 1 if any(d in (rec.from_addr or "").lower() for d in rules.get("frequent_spam_domains", [])) else 0
-
-    clean_marketing_cfg = cfg.get("clean_marketing_rules", {})
-    reputable_domains = [d.lower() for d in clean_marketing_cfg.get("reputable_domains", [])]
-    subject_markers = [s.lower() for s in clean_marketing_cfg.get("subject_markers", [])]
-    sender_domain = (rec.from_addr.split("@")[-1].lower() if rec.from_addr and "@" in rec.from_addr else "")
-    is_newsletter = (sender_domain in reputable_domains) and any(m in subject for m in subject_markers)
-    reputable_marketing_safe = 1 if (sender_domain in reputable_domains and url_shortener_count == 0 and scam_keyword_count == 0 and spam_keyword_count == 0) else 0
-
-    trans_cfg = cfg.get("transactional_short_allowlist", {})
-    trans_trusted = [d.lower() for d in trans_cfg.get("trusted_domains", [])]
-    trans_subject_needles = [s.lower() for s in trans_cfg.get("subject_must_match_one", [])]
-    body_len = len(body.strip()) if body else 0
-    is_transactional_short = (
-        sender_domain in trans_trusted
-        and body_len <= int(trans_cfg.get("max_body_chars", 220) or 220)
-        and len(subject) >= int(trans_cfg.get("min_subject_chars", 3) or 3)
-        and any(n in subject for n in trans_subject_needles)
-    )
-
-    score = 0
-    score += spam_keyword_count * int(scoring_cfg.get("spam_keyword", 0))
-    score += scam_keyword_count * int(scoring_cfg.get("scam_keyword", 0))
-    score += gambling_term_count * int(scoring_cfg.get("gambling_term", 0))
-    score += url_shortener_count * int(scoring_cfg.get("url_shortener", 0))
-    score += suspicious_header_count * int(scoring_cfg.get("suspicious_header", 0))
-    score += suspicious_marker_count * int(scoring_cfg.get("suspicious_marker", 0))
-    score += evasion_pattern_count * int(scoring_cfg.get("evasion_pattern", 0))
-    score += urgency_pattern_count * int(scoring_cfg.get("urgency_pattern", 0))
-    score += phone_pattern_count * int(scoring_cfg.get("phone_pattern", 0))
-    if is_newsletter:
-        score += int(scoring_cfg.get("reputable_domain_clean_bonus", 0))
-    if is_transactional_short:
-        score += int(scoring_cfg.get("transactional_allow_bonus", 0))
-
-    political_kw = rules.get("political_keywords", [])
-    political_keywords_count = sum(1 for p in political_kw if p and p.lower() in full_text)
-
-    fedex_shortener_combo = 0
-    if 'fedex' in full_text and url_shortener_count > 0:
-        treat_fedex = rules.get('domain_overrides', {}).get('treat_fedex_shortener_as_clean', False) if isinstance(rules.get('domain_overrides'), dict) else False
-        if treat_fedex:
-            fedex_shortener_combo = 1
-
-    metrics = {
-        "scam_keywords": scam_keyword_count,
-        "spam_keywords": spam_keyword_count,
-        "gambling_terms": gambling_term_count,
-        "url_shorteners": url_shortener_count,
-        "suspicious_headers": suspicious_header_count,
-        "suspicious_markers": suspicious_marker_count,
-        "evasion_patterns": evasion_pattern_count,
-        "urgency_patterns": urgency_pattern_count,
-        "phone_patterns": phone_pattern_count,
-        "suspicious_domains": suspicious_domain_count,
-        "frequent_spam_domains": frequent_spam_domain_count,
-        "newsletter": 1 if is_newsletter else 0,
-        "transactional_short_allowlist matched": 1 if is_transactional_short else 0,
-        "reputable_marketing_safe": reputable_marketing_safe,
-        "political_keywords": 1 if political_keywords_count > 0 else 0,
-        "fedex_shortener_combo": fedex_shortener_combo,
-    }
-
-    def rule_any(rule_block: List[dict]) -> bool:
-        for cond in rule_block:
-            exprs = cond.get("any", [])
-            for expr in exprs:
-                parts = [p.strip() for p in expr.split("AND")]
-                ok = True
-                for p in parts:
-                    if ">=" in p:
-                        left, right = [x.strip() for x in p.split(">=", 1)]
-                        val = metrics.get(left, 0)
-                        try:
-                            needed = int(right)
-                        except ValueError:
-                            needed = 9999
-                        if val < needed:
-                            ok = False
-                            break
-                    else:
-                        val = metrics.get(p, 0)
-                        if val <= 0:
-                            ok = False
-                            break
-                if ok:
-                    return True
-        return False
-
-    try:
-        rec.score = score
-    except Exception:
-        pass
-    if rule_any(hard.get("scam_if", [])):
-        return "Scam"
-    if rule_any(hard.get("spam_if", [])):
-        return "Spam"
-    if rule_any(hard.get("clean_if", [])):
-        return "Clean"
-
-    dc = cfg.get("domain_classification", {}) or {}
-    sender_domain = (rec.from_addr.split('@')[-1].lower() if rec.from_addr and '@' in rec.from_addr else '')
-    if sender_domain:
-        if sender_domain in [d.lower() for d in dc.get('clean', [])]:
-            if scam_keyword_count < 2 and url_shortener_count == 0:
-                return "Clean"
-        elif sender_domain in [d.lower() for d in dc.get('clean_or_spam', [])]:
-            if spam_keyword_count == 0 and scam_keyword_count == 0:
-                return "Clean"
-        elif sender_domain in [d.lower() for d in dc.get('clean_or_scam_sensitive', [])]:
-            strong = 0
-            strong += 1 if scam_keyword_count >= 2 else 0
-            strong += 1 if url_shortener_count and (urgency_pattern_count or suspicious_marker_count) else 0
-            if strong == 0:
-                return "Clean"
-            if strong == 1:
-                return "Sus"
-        elif sender_domain in [d.lower() for d in dc.get('sus_or_unknown', [])]:
-            if scam_keyword_count == 0 and spam_keyword_count == 0 and url_shortener_count == 0:
-                return "Unknown"
-            return "Sus"
-        elif sender_domain in [d.lower() for d in dc.get('sus_or_spam', [])]:
-            if spam_keyword_count > 0:
-                return "Spam"
-            return "Sus"
-
-    domain_overrides = rules.get('domain_overrides', {}) if isinstance(rules.get('domain_overrides'), dict) else {}
-    fcd = [d.lower() for d in domain_overrides.get('force_clean_domains', [])]
-    fsd = [d.lower() for d in domain_overrides.get('force_spam_domains', [])]
-    sender_domain = (rec.from_addr.split('@')[-1].lower() if rec.from_addr and '@' in rec.from_addr else '')
-    if sender_domain in fcd:
-        strong_flags = 0
-        strong_flags += 1 if scam_keyword_count >= 2 else 0
-        strong_flags += 1 if url_shortener_count >= 1 and (urgency_pattern_count + suspicious_marker_count) >= 1 else 0
-        strong_flags += 1 if phone_pattern_count and scam_keyword_count else 0
-        if strong_flags <= 1:
-            return 'Clean'
-    if sender_domain in fsd:
-        return 'Spam'
-
-    def weak_scam_signals() -> bool:
-        strong = 0
-        strong += 1 if scam_keyword_count >= 2 else 0
-        strong += 1 if (url_shortener_count >= 1 and (urgency_pattern_count or suspicious_marker_count)) else 0
-        strong += 1 if (phone_pattern_count and scam_keyword_count) else 0
-        return strong <= 1
-
-    marketing_like_domain = (
-        sender_domain in reputable_domains or
-        sender_domain in [d.lower() for d in dc.get('clean_or_spam', [])]
-    )
+    return compiled_classifier(cfg).classify(rec)
 
-    if score >= int(thresholds.get("to_scam", 9999)) and marketing_like_domain and weak_scam_signals():
-        return "Spam"
-
-    if score >= int(thresholds.get("to_scam", 9999)):
-        return "Scam"
-    if score >= int(thresholds.get("to_sus", 9999)):
-        return "Sus"
-    if score >= int(thresholds.get("to_spam", 9999)):
-        return "Spam"
-    if is_newsletter or is_transactional_short or reputable_marketing_safe:
-        return "Clean"
-    credible_marketing = [d.lower() for d in rules.get("credible_marketing_domains", [])]
-    if sender_domain in credible_marketing:
-        return "Clean"
-    if gambling_term_count > 0:
-        return "Sus"
-    if frequent_spam_domain_count > 0:
-        return "Spam"
-    if scam_keyword_count == 1 or suspicious_marker_count == 1 or url_shortener_count == 1:
-        return "Sus"
-    if spam_keyword_count == 1 or frequent_spam_domain_count == 1 or evasion_pattern_count == 1:
-        return "Spam"
-    return "Unknown"
 
-
-def validate_email(cfg: dict, rec: EmailRecord) -> Tuple[bool, Optional[str]]:
+def validate_headers(cfg: dict, rec: EmailRecord) -> Tuple[bool, Optional[str]]:
+    """Checks that only need From/Subject (usable before the body is downloaded)."""
     excl = cfg.get("exclusions", {}).get("blacklist", [])
     if excl:
         subj_l = (rec.subject or "").lower()
@@ -337,6 +112,17 @@ def validate_email(cfg: dict, rec: EmailRecord) -> Tuple[bool, Optional[str]]:
         for pref in thread_prefixes:
             if subj_l.startswith(pref):
                 return False, "thread_chain"
+    return True, None
+
+
+def validate_email(cfg: dict, rec: EmailRecord) -> Tuple[bool, Optional[str]]:
+    ok, reason = validate_headers(cfg, rec)
+    if not ok:
+        return ok, reason
+    # subject length before language: same order as the header phase (header_reject)
+    min_subject = int(cfg.get("min_subject_chars", cfg.get("rules", {}).get("min_subject_chars", 0)) or 0)
+    if min_subject and len((rec.subject or "").strip()) < min_subject:
+        return False, f"subject<len({min_subject})"
     lang_cfg = cfg.get("language_validation", {})
     if lang_cfg.get("enabled", False):
         body = (rec.body or "").strip()
@@ -344,15 +130,7 @@ def validate_email(cfg: dict, rec: EmailRecord) -> Tuple[bool, Optional[str]]:
             text = (rec.subject or "") + "\n" + body
             try:
                 expected = cfg.get("language", {}).get("code", "es")
-                detected_list = detect_langs(text)
-                prob_es = 0.0
-                for langprob in detected_list:
-                    parts = str(langprob).split(':')
-                    if parts[0] == expected:
-                        try:
-                            prob_es = float(parts[1])
-                        except ValueError:
-                            prob_es = 0.0
+                prob_es = language_identifier(cfg).probability(text)
                 thresh = float(lang_cfg.get("threshold_percent_es", 0.7) or 0.7)
                 if prob_es < thresh:
                     return False, f"lang_prob<{thresh:.2f} ({prob_es:.2f})"
@@ -363,9 +141,6 @@ def validate_email(cfg: dict, rec: EmailRecord) -> Tuple[bool, Optional[str]]:
                 else:
                     return False, "lang_detect_error"
     min_body = int(cfg.get("min_body_chars_for_real_mail", cfg.get("rules", {}).get("min_body_chars_for_real_mail", 0)) or 0)
-    min_subject = int(cfg.get("min_subject_chars", cfg.get("rules", {}).get("min_subject_chars", 0)) or 0)
-    if min_subject and len((rec.subject or "").strip()) < min_subject:
-        return False, f"subject<len({min_subject})"
     if min_body and len((rec.body or "").strip()) < min_body:
         return False, f"body<len({min_body})"
     return True, None
@@ -390,18 +165,35 @@ def _base_domain(addr: str) -> str:
     return dom
 
 
-def save_eml(rec: EmailRecord, folder: Path, index: int, pattern: str, zero_pad_width: int, region: str, cfg: Optional[dict] = None) -> Path:
+def save_eml(
+    rec: EmailRecord,
+    folder: Path,
+    index: int,
+    pattern: str,
+    zero_pad_width: int,
+    region: str,
+    cfg: Optional[dict] = None,
+    archive: Optional[ArchiveIndex] = None,
+    packs: Optional[PackArchive] = None,
+) -> Path:
     if cfg and cfg.get('output_structure', {}).get('domain_subfolders'):
         bd = _base_domain(rec.from_addr or rec.account_email or '')
         folder = folder / bd
-    folder.mkdir(parents=True, exist_ok=True)
     idx_str = str(index).zfill(zero_pad_width) if zero_pad_width and zero_pad_width > 0 else str(index)
     email_for_name = (rec.account_email or rec.from_addr or "unknown").replace("/", "_")
     category = rec.category or "Unknown"
     filename = pattern.format(email=email_for_name, category=category.replace("Suspicious", "Sus"), index=idx_str, region=region)
     fn = folder / filename
+    if packs is not None:
+        # pack backend: the would-be path is the message id
+        packs.put(packs.key(fn), rec.raw_bytes, date=record_date(rec.date), subject=rec.subject)
+        return fn
+    folder.mkdir(parents=True, exist_ok=True)
     with open(fn, "wb") as fh:
         fh.write(rec.raw_bytes)
+    if archive is not None:
+        # account/category come from the path, same as ArchiveIndex.rebuild
+        archive.add(fn, date=record_date(rec.date), subject=rec.subject, size=len(rec.raw_bytes))
     return fn
 
 
@@ -463,6 +255,50 @@ def _get_oauth_token_hotmail(user: str) -> Optional[str]:
     return result['access_token']
 
 
+def _record_from_message(
+    msg, folder: str, provider: str, account_name: str, user: str, headers_only: bool = False, parse_body: bool = True
+) -> EmailRecord:
+    raw = msg.obj.as_bytes()
+    try:
+        headers_text = str(getattr(msg, "headers", ""))
+    except Exception:
+        headers_text = ""
+    to_list: List[str] = []
+    try:
+        to_val = getattr(msg, "to", None)
+        if isinstance(to_val, (list, tuple)):
+            to_list = list(to_val)
+        elif isinstance(to_val, str):
+            to_list = [x.strip() for x in to_val.split(",") if x.strip()]
+    except Exception:
+        to_list = []
+    # parse_body=False leaves text extraction to the analysis workers (see _analyze_record)
+    body_text = "" if (headers_only or not parse_body) else ((msg.text or "") if getattr(msg, "text", None) else "")
+    msg_id = getattr(msg, "message_id", None)
+    if not msg_id:
+        try:
+            msg_id = (msg.headers.get("message-id") or ("",))[0].strip() or None
+        except Exception:
+            msg_id = None
+    return EmailRecord(
+        subject=msg.subject or "",
+        from_addr=msg.from_ or "",
+        to=to_list,
+        date=str(msg.date),
+        raw_bytes=raw,
+        # header-only records carry the server-reported size of the full message
+        size=(msg.size_rfc822 or len(raw)) if headers_only else len(raw),
+        body=body_text,
+        headers=headers_text,
+        folder=folder,
+        provider=provider,
+        account_name=account_name,
+        message_id=msg_id,
+        account_email=user,
+        uid=int(msg.uid) if msg.uid else None,
+    )
+
+
 def fetch_emails_for_account(
     *,
     account_name: str,
@@ -475,7 +311,28 @@ def fetch_emails_for_account(
     max_age_days: int,
     max_emails: int,
     chunk_size: int = 200,
+    store: Optional[SyncStore] = None,
+    resync: bool = False,
+    header_first: bool = True,
+    header_filter: Optional[Callable[[EmailRecord], Optional[str]]] = None,
+    use_ssl: bool = True,
+    sink: Optional[Callable[[EmailRecord], None]] = None,
+    defer_body: bool = False,
 ) -> List[EmailRecord]:
+    """Download new mail from ``folders``.
+
+    With ``header_first`` each UID chunk is fetched in two phases: headers and
+    sizes first, then full bodies only for messages that ``header_filter`` (and
+    the per-account Message-ID check) did not reject. Rejected messages are still
+    returned, header-only, with ``valid=False`` and ``reason`` set so they show up
+    in the report. ``store`` limits the search to UIDs above the folder checkpoint
+    and records where each folder ended; with ``resync`` every folder is read
+    from the start and only the new checkpoints are recorded.
+
+    With ``sink`` every record is handed to it as soon as it is read instead of
+    being collected, and the returned list is empty. ``defer_body`` skips text
+    extraction so the analysis workers can do it off the fetch thread.
+    """
     # Allow OAuth mode without password if configured
     hotmail_auth = os.getenv('HOTMAIL_AUTH', '').strip().lower() if provider.lower() == 'hotmail' else ''
     has_oauth_setup = (hotmail_auth in ('oauth', 'auto') or bool(os.getenv('MSAL_CLIENT_ID')))
@@ -483,6 +340,9 @@ def fetch_emails_for_account(
         raise RuntimeError("Faltan credenciales IMAP/OAuth para la cuenta. Configure HOTMAIL_AUTH=oauth y MSAL_CLIENT_ID en .env si usa OAuth.")
 
     emails: List[EmailRecord] = []
+    emit = sink or emails.append
+    n_emitted = 0
+    mailbox_cls = MailBox if use_ssl else MailBoxUnencrypted
     date_gte = None
     if max_age_days and max_age_days > 0:
         date_gte = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).date()
@@ -527,7 +387,7 @@ def fetch_emails_for_account(
             for h in base_hosts:
                 try:
                     log.debug("IMAP login attempt (basic) host=%s user=%s", h, user)
-                    mb = MailBox(h, port=port)
+                    mb = mailbox_cls(h, port=port)
                     # imap-tools returns a context manager from login()
                     return mb.login(user, password)
                 except Exception as e:
@@ -545,7 +405,7 @@ def fetch_emails_for_account(
             for h in base_hosts:
                 try:
                     log.debug("IMAP login attempt (oauth) host=%s user=%s", h, user)
-                    mb = MailBox(h, port=port)
+                    mb = mailbox_cls(h, port=port)
                     access_token = _get_oauth_token_hotmail(user)
                     def _auth_cb(_):
                         sasl = f"user={user}\x01auth=Bearer {access_token}\x01\x01"
@@ -624,75 +484,154 @@ def fetch_emails_for_account(
                 pass
             return False
 
+        def _uidvalidity(mb: MailBox) -> Optional[int]:
+            # SELECT leaves "OK [UIDVALIDITY n]" among imaplib's untagged responses
+            try:
+                _typ, data = mb.box.response('UIDVALIDITY')
+                if data and data[-1] is not None:
+                    return int(data[-1])
+            except Exception:
+                pass
+            return None
+
+        def chunk_iter(lst: List[str], n: int):
+            n = max(1, int(n or 200))
+            for i in range(0, len(lst), n):
+                yield lst[i:i + n]
+
+        seen_msg_ids: set = set()
         for folder in folders:
             if not _select_folder(mailbox, folder):
                 log.warning("No se pudo abrir carpeta %s: fallback tras LIST también falló", folder)
                 continue
+            uidvalidity = _uidvalidity(mailbox)
+            since_uid = store.checkpoint(account_name, folder, uidvalidity) if store and not resync else 0
             criteria = 'ALL'
             if date_gte:
                 criteria = A(date_gte=date_gte)
+            if since_uid:
+                # let the server skip everything at or below the checkpoint
+                criteria = f"UID {since_uid + 1}:* {criteria}"
             try:
                 uids = mailbox.uids(criteria)
             except Exception as e:
                 log.warning("No se pudieron obtener UIDs en %s/%s: %s", account_name, folder, e)
                 continue
 
+            if since_uid:
+                # "n:*" always matches the highest UID, even when it is below n
+                uids = [u for u in uids if int(u) > since_uid]
+                log.info("%s/%s: %d UIDs nuevos desde checkpoint %d", account_name, folder, len(uids), since_uid)
             if max_emails and max_emails > 0:
                 uids = uids[:max_emails]
-
-            def chunk_iter(lst: List[str], n: int):
-                n = max(1, int(n or 200))
-                for i in range(0, len(lst), n):
-                    yield lst[i:i + n]
+            # checkpoint = highest UID with everything up to it fetched
+            done_uid = since_uid
+            chunk_failed = False
+            t_folder = time.perf_counter()
+            n_headers = n_bodies = body_bytes = 0
 
             for uid_chunk in chunk_iter(uids, chunk_size):
                 try:
-                    uid_seq = ",".join(uid_chunk)
-                    uid_criteria = f"UID {uid_seq}"
-                    for msg in mailbox.fetch(uid_criteria, bulk=False):
-                        raw = msg.obj.as_bytes()
-                        size = len(raw)
-                        try:
-                            headers_text = str(getattr(msg, "headers", ""))
-                        except Exception:
-                            headers_text = ""
-                        to_list: List[str] = []
-                        try:
-                            to_val = getattr(msg, "to", None)
-                            if isinstance(to_val, list):
-                                to_list = to_val
-                            elif isinstance(to_val, str):
-                                to_list = [x.strip() for x in to_val.split(",") if x.strip()]
-                        except Exception:
-                            to_list = []
-                        body_text = (msg.text or "") if getattr(msg, "text", None) else ""
-                        msg_id = getattr(msg, "message_id", None)
-                        rec = EmailRecord(
-                            subject=msg.subject or "",
-                            from_addr=msg.from_ or "",
-                            to=to_list,
-                            date=str(msg.date),
-                            raw_bytes=raw,
-                            size=size,
-                            body=body_text,
-                            headers=headers_text,
-                            folder=folder,
-                            provider=provider,
-                            account_name=account_name,
-                            message_id=msg_id,
-                            account_email=user,
-                        )
-                        emails.append(rec)
-                        if max_emails and max_emails > 0 and len(emails) >= max_emails:
+                    uid_criteria = f"UID {','.join(uid_chunk)}"
+                    if header_first:
+                        # phase 1: headers + RFC822.SIZE for the whole chunk in one FETCH
+                        wanted: List[str] = []
+                        for msg in mailbox.fetch(uid_criteria, headers_only=True, mark_seen=False, bulk=True):
+                            n_headers += 1
+                            head = _record_from_message(msg, folder, provider, account_name, user, headers_only=True)
+                            reason = None
+                            if head.message_id and head.message_id in seen_msg_ids:
+                                reason = "duplicate"
+                            elif header_filter is not None:
+                                reason = header_filter(head)
+                            if head.message_id:
+                                seen_msg_ids.add(head.message_id)
+                            if reason:
+                                head.valid = False
+                                head.reason = reason
+                                emit(head)
+                                n_emitted += 1
+                            else:
+                                wanted.append(msg.uid)
+                        # phase 2: full bodies only for the survivors
+                        fetch_iter = mailbox.fetch(f"UID {','.join(wanted)}", bulk=True) if wanted else ()
+                    else:
+                        fetch_iter = mailbox.fetch(uid_criteria, bulk=False)
+                    for msg in fetch_iter:
+                        rec = _record_from_message(msg, folder, provider, account_name, user, parse_body=not defer_body)
+                        n_bodies += 1
+                        body_bytes += rec.size
+                        emit(rec)
+                        n_emitted += 1
+                        if max_emails and max_emails > 0 and n_emitted >= max_emails:
+                            if store and not chunk_failed and rec.uid:
+                                store.stage_checkpoint(account_name, folder, uidvalidity, rec.uid)
                             return emails
+                    if not chunk_failed:
+                        done_uid = max(done_uid, max(int(u) for u in uid_chunk))
                 except Exception as e:
                     log.warning("Fallo al leer chunk (%s) en %s/%s: %s", len(uid_chunk), account_name, folder, e)
+                    # later chunks are still read, but the checkpoint stays before the gap
+                    chunk_failed = True
                     continue
+            if store:
+                store.stage_checkpoint(account_name, folder, uidvalidity, done_uid)
+            elapsed = time.perf_counter() - t_folder
+            if uids:
+                log.info(
+                    "%s/%s: %d UIDs | cabeceras=%d cuerpos=%d (%.1f KB) | %.2fs (%.0f msg/s)",
+                    account_name, folder, len(uids), n_headers, n_bodies, body_bytes / 1024.0,
+                    elapsed, len(uids) / elapsed if elapsed > 0 else 0.0,
+                )
 
-    log.info("Descargados %d correos de %s", len(emails), account_name)
+    log.info("Descargados %d correos de %s", n_emitted, account_name)
     return emails
 
 
+# ---- analysis workers (process pool) -----------------------------------------
+_worker_cfg: Optional[dict] = None
+_worker_hasher: Optional[MinHasher] = None
+
+
+def _init_analysis_worker(cfg: dict, num_perm: int, lang_cache_path: Optional[str] = None) -> None:
+    global _worker_cfg, _worker_hasher
+    _worker_cfg = cfg
+    _worker_hasher = MinHasher(num_perm)
+    if lang_cache_path:
+        # workers only read; new detector results travel back to the writer
+        language_identifier(cfg).cache = LangCache(lang_cache_path, readonly=True)
+
+
+def _analyze_record(rec: EmailRecord, parse_body: bool, check: bool, classify: bool = True) -> tuple:
+    """CPU-bound per-message work, run on the analysis pool.
+
+    Returns ``(category, score, valid, reason, shingle_hashes, minhash,
+    lang_results)``. Validation and shingles are skipped when ``check`` is False
+    (exact duplicates only need a category for the report); ``lang_results`` are
+    new language-detector rows for ``LangCache``. Header-level rejections pass
+    ``classify=False``: without a body their category would not match the one
+    the full message gets, so they are reported as ``Unknown``.
+    """
+    if not classify:
+        return "Unknown", rec.score, None, None, None, None, []
+    cfg = _worker_cfg
+    if parse_body:
+        try:
+            rec.body = MailMessage.from_bytes(rec.raw_bytes).text or ""
+        except Exception:
+            rec.body = ""
+    category = classify_email(cfg, rec)
+    if not check:
+        return category, rec.score, None, None, None, None, []
+    valid, reason = validate_email(cfg, rec)
+    lang_results = language_identifier(cfg).drain_fresh()
+    if not valid:
+        return category, rec.score, valid, reason, None, None, lang_results
+    hashes = shingle_hashes(_text_signature(_canonical_text(rec.subject, rec.body)))
+    minhash = _worker_hasher.signature_from_hashes(hashes) if len(hashes) > 1 else None
+    return category, rec.score, valid, reason, hashes, minhash, lang_results
+
+
 def _find_repo_root(start: Path) -> Optional[Path]:
     for p in [start, *start.parents]:
         if (p / "config.yaml").exists():
@@ -708,6 +647,11 @@ def main(argv: Optional[List[str]] = None):
     parser.add_argument("--reprocess-existing", action="store_true", help="Reclasificar .eml ya guardados")
     parser.add_argument("--auto-tune-thresholds", action="store_true", help="Ajustar thresholds para reducir Unknown")
     parser.add_argument("--target-unknown", type=float, default=0.30, help="Target proporción Unknown tras auto-tune")
+    parser.add_argument("--full-resync", action="store_true", help="Ignorar checkpoints UID y dedup persistente (se sigue registrando)")
+    parser.add_argument("--rebuild-index", action="store_true", help="Reconstruir el índice de .eml guardados (p.ej. archivos previos al índice) y salir")
+    parser.add_argument("--pack-existing", action="store_true", help="Mover los .eml guardados a los packs (archive.backend: pack) y salir")
+    parser.add_argument("--export-eml", metavar="DIR", help="Exportar los correos de los packs como .eml a DIR y salir")
+    parser.add_argument("--export-prefix", default="", help="Con --export-eml: solo ids que empiezan así (p.ej. cuenta/Scam/)")
     parser.add_argument(
         "--account",
         choices=["gmail1", "hotmail", "gmail2"],
@@ -770,6 +714,8 @@ def main(argv: Optional[List[str]] = None):
     max_per_acc = int(cfg.get("max_emails_per_account", 0) or 0)
     fetch_cfg = cfg.get("fetch", {})
     chunk_size = int(fetch_cfg.get("chunk_size", 200) or 200)
+    header_first = bool(fetch_cfg.get("header_first", True))
+    max_message_bytes = int(fetch_cfg.get("max_message_bytes", 0) or 0)
     out_root = Path(cfg.get("output_path")) if cfg.get("output_path") else _paths.OUTPUTS_DIR
     naming_cfg = cfg.get("naming", {})
     name_pattern = naming_cfg.get("pattern", "{email}_{category}_{index}_{region}.eml")
@@ -797,6 +743,7 @@ def main(argv: Optional[List[str]] = None):
             "user": user,
             "password": pwd,
             "folders": include_folders,
+            "ssl": bool(acc.get("ssl", True)),
         })
 
     if args.precheck:
@@ -817,6 +764,7 @@ def main(argv: Optional[List[str]] = None):
                     max_age_days=max_age_days,
                     max_emails=limit_pf,
                     chunk_size=chunk_size,
+                    use_ssl=acc["ssl"],
                 )
                 item = {"account": acc["name"], "fetched": len(emails), "folders": acc["folders"]}
                 if sample_headers and emails:
@@ -829,157 +777,281 @@ def main(argv: Optional[List[str]] = None):
         pprint(summary)
         return
 
+    archive_path = Path(cfg["archive_index_path"]) if cfg.get("archive_index_path") else out_root / "state" / "archive_index.sqlite3"
+    archive = ArchiveIndex(archive_path, out_root)
+    archive_cfg = cfg.get("archive", {}) or {}
+    packs: Optional[PackArchive] = None
+    if archive_cfg.get("backend", "eml") == "pack":
+        packs = PackArchive(
+            Path(archive_cfg["pack_dir"]) if archive_cfg.get("pack_dir") else out_root / "packs",
+            base=out_root,
+            pack_max_mb=int(archive_cfg.get("pack_max_mb", 256) or 256),
+            block_kb=int(archive_cfg.get("block_kb", 512) or 512),
+            level=int(archive_cfg.get("level", 6) or 6),
+        )
+    elif args.pack_existing or args.export_eml:
+        log.error("--pack-existing / --export-eml requieren archive.backend: pack")
+        archive.close()
+        return
+    if args.rebuild_index:
+        t0 = time.perf_counter()
+        n_indexed = archive.rebuild()
+        log.info("Índice de archivo reconstruido: %d .eml en %.1fs (%s)", n_indexed, time.perf_counter() - t0, archive.path)
+        if packs is not None:
+            t0 = time.perf_counter()
+            n_packed = packs.rebuild()
+            log.info("Índice de packs reconstruido: %d correos en %.1fs (%s)", n_packed, time.perf_counter() - t0, packs.index_path)
+            packs.close()
+        archive.close()
+        return
+    if packs is not None and args.pack_existing:
+        t0 = time.perf_counter()
+        moved = packs.import_tree(remove=True)
+        archive.forget(moved)
+        archive.commit()
+        log.info("Empaquetados %d .eml en %.1fs (%s)", len(moved), time.perf_counter() - t0, packs.root)
+        packs.close()
+        archive.close()
+        return
+    if packs is not None and args.export_eml:
+        n_exported = packs.export(args.export_eml, args.export_prefix)
+        log.info("Exportados %d correos a %s", n_exported, args.export_eml)
+        packs.close()
+        archive.close()
+        return
+
     if purge_days and purge_days > 0:
         cutoff_dt = datetime.now(timezone.utc) - timedelta(days=purge_days)
-    root = Path(cfg.get("output_path")) if cfg.get("output_path") else _paths.OUTPUTS_DIR
-        if root.exists():
-            removed = 0
-            scanned = 0
-            thread_removed = 0
-            purge_threads = bool(cfg.get('purge_thread_chains', False))
-            thread_prefixes = [p.strip().lower() for p in (cfg.get('exclude_thread_prefixes') or []) if p]
-            for eml in root.rglob('*.eml'):
-                scanned += 1
-                try:
-                    raw = eml.read_bytes()
-                    try:
-                        msg = message_from_bytes(raw, policy=policy.default)
-                        date_hdr = msg.get('Date') or msg.get('date')
-                        if date_hdr:
-                            try:
-                                msg_dt = parsedate_to_datetime(date_hdr)
-                                if msg_dt.tzinfo is None:
-                                    msg_dt = msg_dt.replace(tzinfo=timezone.utc)
-                            except Exception:
-                                msg_dt = None
-                        else:
-                            msg_dt = None
-                    except Exception:
-                        msg_dt = None
-                    if not msg_dt:
-                        mtime = datetime.fromtimestamp(eml.stat().st_mtime, tz=timezone.utc)
-                        msg_dt = mtime
-                    delete_flag = False
-                    if msg_dt < cutoff_dt:
-                        delete_flag = True
-                    if not delete_flag and purge_threads and thread_prefixes:
-                        try:
-                            from email import message_from_bytes as _mfb
-                            msg2 = _mfb(raw, policy=policy.default)
-                            subj2 = (msg2.get('Subject') or '').strip().lower()
-                            if any(subj2.startswith(tp) for tp in thread_prefixes):
-                                delete_flag = True
-                                thread_removed += 1
-                        except Exception:
-                            pass
-                    if delete_flag:
-                        try:
-                            eml.unlink()
-                            removed += 1
-                        except Exception:
-                            pass
-                except Exception:
-                    continue
-            log.info("Purga temporal: %d eliminados (edad / hilos) de %d examinados (>%d días, threads=%s, threads_elim=%d)", removed, scanned, purge_days, purge_threads, thread_removed)
+        built = archive.ensure_built()
+        if built is not None:
+            log.info("Índice de archivo creado a partir de %d .eml existentes", built)
+        removed = 0
+        thread_removed = 0
+        scanned = len(archive)
+        purge_threads = bool(cfg.get('purge_thread_chains', False))
+        thread_prefixes = [p.strip().lower() for p in (cfg.get('exclude_thread_prefixes') or []) if p]
+        gone: List[Path] = []
+        for eml, why in list(archive.expired(cutoff_dt, thread_prefixes if purge_threads else ())):
+            try:
+                eml.unlink()
+                removed += 1
+                if why == "thread":
+                    thread_removed += 1
+            except FileNotFoundError:
+                pass  # deleted by hand; just drop the row
+            except Exception:
+                continue
+            gone.append(eml)
+        archive.forget(gone)
+        archive.commit()
+        if packs is not None:
+            expired_ids = list(packs.expired(cutoff_dt, thread_prefixes if purge_threads else ()))
+            scanned += len(packs)
+            removed += packs.delete(mid for mid, _why in expired_ids)
+            thread_removed += sum(1 for _mid, why in expired_ids if why == "thread")
+            packs.commit()
+            compacted = packs.compact(float(archive_cfg.get("compact_dead_ratio", 0.5) or 0.5))
+            if compacted:
+                log.info("Compactados %d packs", compacted)
+        log.info("Purga temporal: %d eliminados (edad / hilos) de %d examinados (>%d días, threads=%s, threads_elim=%d)", removed, scanned, purge_days, purge_threads, thread_removed)
 
     saved: List[str] = []
     report: List[dict] = []
     summary_counts: Dict[str, int] = {"total": 0, "saved": 0, "duplicates": 0, "invalid_skipped": 0, "similar_skipped": 0}
     per_category: Dict[str, int] = {}
     per_reason: Dict[str, int] = {}
-    idx = 1
     seen_ids: set[str] = set()
-    seen_hashes: set[int] = set()
-    saved_signatures: List[set] = []
+    seen_hashes: set[str] = set()
+    dedup_cfg = cfg.get("deduplication", {}) or {}
+    sim_ratio_cfg = float(dedup_cfg.get("subject_fuzzy_ratio", 0.85) or 0.85)
+    near_dups = NearDuplicateIndex(threshold=sim_ratio_cfg)
+    sync_store: Optional[SyncStore] = None
+    if dedup_cfg.get("persistent", True):
+        store_path = Path(dedup_cfg["store_path"]) if dedup_cfg.get("store_path") else out_root / "state" / "dedup.sqlite3"
+        sync_store = SyncStore(store_path)
+    # lookups against earlier runs; --full-resync still records into the store
+    prior = sync_store if (sync_store and not args.full_resync) else None
+    if prior:
+        window_days = int(dedup_cfg.get("window_days", 0) or 0)
+        for saved_path, sig in prior.signatures(window_days):
+            near_dups.add(saved_path, sig=sig)
+        log.info("Dedup persistente: %s (%d firmas previas)", sync_store.path, len(near_dups))
+    min_subject_hdr = int(cfg.get("min_subject_chars", cfg.get("rules", {}).get("min_subject_chars", 0)) or 0)
+
+    def header_reject(rec: EmailRecord) -> Optional[str]:
+        # runs on the fetch threads before the body is downloaded; checks follow
+        # dispatch + validate_email order: duplicate, headers, subject length, size
+        if rec.message_id and prior and prior.seen_message_id(rec.message_id):
+            return "duplicate"
+        ok, reason = validate_headers(cfg, rec)
+        if not ok:
+            return reason or "invalid"
+        if min_subject_hdr and len((rec.subject or "").strip()) < min_subject_hdr:
+            return f"subject<len({min_subject_hdr})"
+        if max_message_bytes and rec.size > max_message_bytes:
+            return f"size>{max_message_bytes}"
+        return None
+
+    # continue file numbering after earlier runs so incremental runs never overwrite
+    idx = (sync_store.saved_count() + 1) if sync_store else 1
     fetch_workers = int(cfg.get("fetch", {}).get("parallel_accounts", 10) or 10)
-    all_emails: List[EmailRecord] = []
-    with ThreadPoolExecutor(max_workers=fetch_workers) as ex:
-        future_map = {
-            ex.submit(
-                fetch_emails_for_account,
-                account_name=acc["name"],
-                provider=acc["provider"],
-                host=acc["host"],
-                port=acc["port"],
-                user=acc["user"],
-                password=acc["password"],
-                folders=acc["folders"],
-                max_age_days=max_age_days,
-                max_emails=max_per_acc,
-                chunk_size=chunk_size,
-            ): acc for acc in to_process
-        }
-        for fut in as_completed(future_map):
-            acc_info = future_map[fut]
+    pipe_cfg = cfg.get("pipeline", {}) or {}
+    analysis_workers = int(pipe_cfg.get("workers", 1) or 0) or (os.cpu_count() or 1)
+    queue_size = int(pipe_cfg.get("queue_size", 256) or 256)
+    in_flight = int(pipe_cfg.get("in_flight", 0) or 0)
+    batch_size = int(pipe_cfg.get("batch_size", 8) or 1)
+    lang_cfg = cfg.get("language_validation", {}) or {}
+    lang_cache: Optional[LangCache] = None
+    if lang_cfg.get("enabled", False) and lang_cfg.get("cache", True):
+        lang_cache_path = Path(lang_cfg["cache_path"]) if lang_cfg.get("cache_path") else out_root / "state" / "lang_cache.sqlite3"
+        lang_cache = LangCache(lang_cache_path)
+    # auto-tune needs every record classified before the first save, so it keeps the batch path
+    streaming = not args.auto_tune_thresholds
+    # in-process analysis would only parse the message a second time
+    defer_body = streaming and analysis_workers > 1
+    records = RecordQueue(queue_size)
+
+    def fetch_account(acc: dict) -> List[EmailRecord]:
+        return fetch_emails_for_account(
+            account_name=acc["name"],
+            provider=acc["provider"],
+            host=acc["host"],
+            port=acc["port"],
+            user=acc["user"],
+            password=acc["password"],
+            folders=acc["folders"],
+            max_age_days=max_age_days,
+            max_emails=max_per_acc,
+            chunk_size=chunk_size,
+            store=sync_store,
+            resync=args.full_resync,
+            header_first=header_first,
+            header_filter=header_reject,
+            use_ssl=acc["ssl"],
+            sink=records.put if streaming else None,
+            defer_body=defer_body,
+        )
+
+    fetch_pool: Optional[ThreadPoolExecutor] = None
+    if streaming:
+        fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers)
+
+        def _fetch_done(fut, acc_info: dict) -> None:
             try:
-                fetched_list = fut.result()
-                all_emails.extend(fetched_list)
-                log.info("Cuenta %s completada (%d correos)", acc_info["name"], len(fetched_list))
+                fut.result()
+                log.info("Cuenta %s completada", acc_info["name"])
             except Exception as e:
                 log.error("Error fetch cuenta %s: %s", acc_info["name"], e)
+            records.producer_done()
 
-    for e in all_emails:
-        e.category = classify_email(cfg, e)
-    if args.auto_tune_thresholds and all_emails:
-        classifier_cfg = cfg.get("classifier", {})
-        thresholds = classifier_cfg.get("thresholds", {})
-        cur_scam = int(thresholds.get("to_scam", 7))
-        cur_sus = int(thresholds.get("to_sus", 4))
-        cur_spam = int(thresholds.get("to_spam", 3))
-
-        def unknown_ratio() -> float:
-            total = len(all_emails)
-            if total == 0:
-                return 0.0
-            unk = sum(1 for x in all_emails if x.category == "Unknown")
-            return unk / total
-
-        guard_cycles = 0
-        while unknown_ratio() > args.target_unknown and guard_cycles < 20:
-            changed = False
-            if cur_spam > 1:
-                cur_spam -= 1
-                changed = True
-            if cur_sus > cur_spam + 0:
-                cur_sus -= 1
-                changed = True
-            if cur_scam > cur_sus + 0:
-                cur_scam -= 1
-                changed = True
-            if not changed:
-                break
-            temp_thr = {"to_scam": cur_scam, "to_sus": cur_sus, "to_spam": cur_spam}
-            classifier_cfg['thresholds'] = temp_thr
-            for x in all_emails:
-                if x.category == "Unknown":
-                    x.category = classify_email(cfg, x)
-            guard_cycles += 1
-        log.info("Auto-tune thresholds aplicado: scam=%d sus=%d spam=%d unk_ratio=%.2f", cur_scam, cur_sus, cur_spam, unknown_ratio())
-
-    for e in all_emails:
-        acc_name = e.account_name or "unknown"
-        acc_provider = e.provider or ""
-        dedup_key = e.message_id or None
-        if dedup_key and dedup_key in seen_ids:
-            e.category = e.category or "Unknown"
-            e.valid = False
-            e.reason = "duplicate"
-            summary_counts["duplicates"] += 1
-            per_reason[e.reason] = per_reason.get(e.reason, 0) + 1
-            report.append({
-                "account": acc_name,
-                "provider": acc_provider,
-                "subject": e.subject,
-                "from": e.from_addr,
-                "folder": e.folder,
-                "category": e.category,
-                "valid": e.valid,
-                "reason": e.reason,
-            })
-            continue
-        if not dedup_key:
-            rb_hash = hash(e.raw_bytes)
-            if rb_hash in seen_hashes:
+        for acc in to_process:
+            fetch_pool.submit(fetch_account, acc).add_done_callback(lambda f, a=acc: _fetch_done(f, a))
+        incoming = records.drain(len(to_process))
+        log.info("Pipeline: %d procesos de análisis, cola=%d", analysis_workers, queue_size)
+    else:
+        all_emails: List[EmailRecord] = []
+        with ThreadPoolExecutor(max_workers=fetch_workers) as ex:
+            future_map = {ex.submit(fetch_account, acc): acc for acc in to_process}
+            for fut in as_completed(future_map):
+                acc_info = future_map[fut]
+                try:
+                    fetched_list = fut.result()
+                    all_emails.extend(fetched_list)
+                    log.info("Cuenta %s completada (%d correos)", acc_info["name"], len(fetched_list))
+                except Exception as e:
+                    log.error("Error fetch cuenta %s: %s", acc_info["name"], e)
+
+        # header-level rejections are reported as Unknown and stay out of the tuning
+        tunable = [e for e in all_emails if not (e.valid is False and e.reason)]
+        for e in tunable:
+            e.category = classify_email(cfg, e)
+        if tunable:
+            classifier_cfg = cfg.get("classifier", {})
+            thresholds = classifier_cfg.get("thresholds", {})
+            cur_scam = int(thresholds.get("to_scam", 7))
+            cur_sus = int(thresholds.get("to_sus", 4))
+            cur_spam = int(thresholds.get("to_spam", 3))
+
+            def unknown_ratio() -> float:
+                total = len(tunable)
+                if total == 0:
+                    return 0.0
+                unk = sum(1 for x in tunable if x.category == "Unknown")
+                return unk / total
+
+            guard_cycles = 0
+            while unknown_ratio() > args.target_unknown and guard_cycles < 20:
+                changed = False
+                if cur_spam > 1:
+                    cur_spam -= 1
+                    changed = True
+                if cur_sus > cur_spam + 0:
+                    cur_sus -= 1
+                    changed = True
+                if cur_scam > cur_sus + 0:
+                    cur_scam -= 1
+                    changed = True
+                if not changed:
+                    break
+                temp_thr = {"to_scam": cur_scam, "to_sus": cur_sus, "to_spam": cur_spam}
+                classifier_cfg['thresholds'] = temp_thr
+                for x in tunable:
+                    if x.category == "Unknown":
+                        x.category = classify_email(cfg, x)
+                guard_cycles += 1
+            log.info("Auto-tune thresholds aplicado: scam=%d sus=%d spam=%d unk_ratio=%.2f", cur_scam, cur_sus, cur_spam, unknown_ratio())
+        incoming = iter(all_emails)
+
+    def dispatch():
+        # exact dedup runs here, in arrival order, on the same thread as the writer
+        for e in incoming:
+            dedup_key = e.message_id or None
+            digest = content_digest(e.raw_bytes)
+            rejected_early = e.valid is False and bool(e.reason)  # header-level rejection in fetch
+            is_dup = False
+            if (rejected_early and e.reason == "duplicate") or (
+                dedup_key and (dedup_key in seen_ids or (prior and prior.seen_message_id(dedup_key)))
+            ):
+                is_dup = True
+            elif not dedup_key:
+                if digest in seen_hashes or (prior and prior.seen_digest(digest)):
+                    is_dup = True
+                else:
+                    seen_hashes.add(digest)
+            if dedup_key and not is_dup:
+                seen_ids.add(dedup_key)
+            check = not (is_dup or rejected_early)
+            if analysis_workers <= 1:
+                # in-process: analyze the record itself, nothing to pickle
+                yield (e, dedup_key, digest, is_dup, rejected_early), (e, False, check, not rejected_early)
+                continue
+            # only unparsed bodies need the raw bytes on the worker side
+            parse_body = defer_body and not rejected_early
+            payload = replace(e, raw_bytes=e.raw_bytes if parse_body else b"", features=None)
+            yield (e, dedup_key, digest, is_dup, rejected_early), (payload, parse_body, check, not rejected_early)
+
+    if analysis_workers <= 1 and lang_cache:
+        # same process as the writer: read its cache directly instead of a read-only copy
+        language_identifier(cfg).cache = lang_cache
+
+    analyzed = ordered_map(
+        _analyze_record,
+        dispatch(),
+        workers=analysis_workers,
+        window=in_flight,
+        batch_size=batch_size,
+        initializer=_init_analysis_worker,
+        initargs=(cfg, near_dups.hasher.num_perm, str(lang_cache.path) if lang_cache and analysis_workers > 1 else None),
+    )
+    try:
+        for (e, dedup_key, digest, is_dup, rejected_early), (category, score, valid, reason, canon_hashes, canon_mh, lang_results) in analyzed:
+            if lang_cache and lang_results:
+                lang_cache.put_many(lang_results)
+            acc_name = e.account_name or "unknown"
+            acc_provider = e.provider or ""
+            e.category = category
+            e.score = score
+            if is_dup:
                 e.category = e.category or "Unknown"
                 e.valid = False
                 e.reason = "duplicate"
@@ -996,12 +1068,9 @@ def main(argv: Optional[List[str]] = None):
                     "reason": e.reason,
                 })
                 continue
-            seen_hashes.add(rb_hash)
 
-            if dedup_key:
-                seen_ids.add(dedup_key)
-            e.category = classify_email(cfg, e)
-            valid, reason = validate_email(cfg, e)
+            if rejected_early:
+                valid, reason = False, e.reason
             e.valid = valid
             e.reason = reason
             summary_counts["total"] += 1
@@ -1018,22 +1087,35 @@ def main(argv: Optional[List[str]] = None):
                     "valid": e.valid,
                     "reason": e.reason,
                 })
+                if sync_store:
+                    sync_store.record(account=acc_name, folder=e.folder or "", uid=e.uid, message_id=dedup_key, digest=digest, status=reason or "invalid")
                 continue
-            canon_sig = _text_signature(_canonical_text(e.subject, e.body))
-            is_dup = False
-            sim_ratio_cfg = float(cfg.get("deduplication", {}).get("subject_fuzzy_ratio", 0.85) or 0.85)
-            for sig in saved_signatures:
-                if sig and canon_sig and (len(canon_sig) > 1) and (len(sig) > 1):
-                    inter = len(canon_sig & sig)
-                    union = len(canon_sig | sig)
-                    if union and (inter / union) >= sim_ratio_cfg:
-                        is_dup = True
-                        break
-        if is_dup:
-            e.valid = False
-            e.reason = "similar"
-            summary_counts["similar_skipped"] += 1
-            per_reason[e.reason] = per_reason.get(e.reason, 0) + 1
+            is_similar_dup = near_dups.find(sig=canon_mh, hashes=canon_hashes) is not None
+            if is_similar_dup:
+                e.valid = False
+                e.reason = "similar"
+                summary_counts["similar_skipped"] += 1
+                per_reason[e.reason] = per_reason.get(e.reason, 0) + 1
+                report.append({
+                    "account": acc_name,
+                    "provider": acc_provider,
+                    "subject": e.subject,
+                    "from": e.from_addr,
+                    "folder": e.folder,
+                    "category": e.category,
+                    "valid": e.valid,
+                    "reason": e.reason,
+                })
+                if sync_store:
+                    sync_store.record(account=acc_name, folder=e.folder or "", uid=e.uid, message_id=dedup_key, digest=digest, status="similar")
+                continue
+            account_folder = re.sub(r"[^A-Za-z0-9_-]+", "_", acc_name) or "account"
+            target_folder = out_root / account_folder / (e.category or "Unknown")
+            fn = save_eml(e, target_folder, idx, name_pattern, zero_pad, region, cfg, archive, packs)
+            idx += 1
+            saved.append(str(fn))
+            summary_counts["saved"] += 1
+            per_category[e.category or "Unknown"] = per_category.get(e.category or "Unknown", 0) + 1
             report.append({
                 "account": acc_name,
                 "provider": acc_provider,
@@ -1044,25 +1126,27 @@ def main(argv: Optional[List[str]] = None):
                 "valid": e.valid,
                 "reason": e.reason,
             })
-            continue
-        account_folder = re.sub(r"[^A-Za-z0-9_-]+", "_", acc_name) or "account"
-        target_folder = out_root / account_folder / (e.category or "Unknown")
-        fn = save_eml(e, target_folder, idx, name_pattern, zero_pad, region, cfg)
-        idx += 1
-        saved.append(str(fn))
-        summary_counts["saved"] += 1
-        per_category[e.category or "Unknown"] = per_category.get(e.category or "Unknown", 0) + 1
-        report.append({
-            "account": acc_name,
-            "provider": acc_provider,
-            "subject": e.subject,
-            "from": e.from_addr,
-            "folder": e.folder,
-            "category": e.category,
-            "valid": e.valid,
-            "reason": e.reason,
-        })
-        saved_signatures.append(canon_sig)
+            near_dups.add(str(fn), sig=canon_mh, hashes=canon_hashes)
+            if sync_store:
+                sync_store.record(
+                    account=acc_name, folder=e.folder or "", uid=e.uid, message_id=dedup_key, digest=digest,
+                    status="saved", minhash=canon_mh, saved_path=str(fn),
+                )
+    finally:
+        # let blocked fetchers return if the writer stopped early
+        records.close()
+        if fetch_pool is not None:
+            fetch_pool.shutdown(wait=True)
+
+    archive.commit()
+    if packs is not None:
+        packs.commit()
+    if lang_cache:
+        lang_cache.close()
+    if sync_store:
+        # message rows and folder checkpoints land in one transaction
+        sync_store.commit()
+        sync_store.close()
 
     out_root.mkdir(parents=True, exist_ok=True)
     rpt_cfg = cfg.get("report", {})
@@ -1103,6 +1187,7 @@ def main(argv: Optional[List[str]] = None):
                         dest = new_dir / f.name.replace('Suspicious', 'Sus')
                         try:
                             shutil.move(str(f), dest)
+                            archive.move(f, dest)
                         except Exception:
                             pass
                     try:
@@ -1129,6 +1214,7 @@ def main(argv: Optional[List[str]] = None):
                             target_dir.mkdir(parents=True, exist_ok=True)
                             new_path = target_dir / eml.name
                             shutil.move(str(eml), new_path)
+                            archive.move(eml, new_path)
                             moved_domain += 1
                         except Exception:
                             pass
@@ -1137,7 +1223,13 @@ def main(argv: Optional[List[str]] = None):
 
         def parse_eml(path: Path) -> Optional[EmailRecord]:
             try:
-                raw = path.read_bytes()
+                return parse_raw(path.read_bytes())
+            except Exception as e:
+                log.debug("Error parse %s: %s", path, e)
+                return None
+
+        def parse_raw(raw: bytes) -> Optional[EmailRecord]:
+            try:
                 msg = message_from_bytes(raw, policy=policy.default)
                 subject = msg.get('subject', '') or ''
                 from_addr = msg.get('from', '') or ''
@@ -1172,7 +1264,7 @@ def main(argv: Optional[List[str]] = None):
                 )
                 return rec
             except Exception as e:
-                log.debug("Error parse %s: %s", path, e)
+                log.debug("Error parse: %s", e)
                 return None
 
         changed = 0
@@ -1183,7 +1275,14 @@ def main(argv: Optional[List[str]] = None):
             if not blacklist_rules:
                 return False
             try:
-                raw = path.read_bytes()
+                return is_blacklisted_raw(path.read_bytes())
+            except Exception:
+                return False
+
+        def is_blacklisted_raw(raw: bytes) -> bool:
+            if not blacklist_rules:
+                return False
+            try:
                 msg = message_from_bytes(raw, policy=policy.default)
                 from_addr = (msg.get('from') or '').lower()
                 subject = (msg.get('subject') or '').lower()
@@ -1218,6 +1317,7 @@ def main(argv: Optional[List[str]] = None):
                         if is_blacklisted_from_file(eml):
                             try:
                                 eml.unlink()
+                                archive.forget([eml])
                             except Exception:
                                 pass
                             continue
@@ -1234,9 +1334,36 @@ def main(argv: Optional[List[str]] = None):
                             new_name = eml.name.replace(cat_dir.name, new_cat)
                             try:
                                 shutil.move(str(eml), str(target_dir / new_name))
+                                archive.move(eml, target_dir / new_name, category=new_cat)
                                 changed += 1
                             except Exception as e:
                                 log.debug("No se pudo mover %s: %s", eml, e)
+        if packs is not None:
+            # same reclassification over the packed messages; only ids change
+            domain_mode = cfg.get('output_structure', {}).get('domain_subfolders')
+            blacklisted: List[str] = []
+            for mid, raw in packs.items():
+                parts = mid.split('/')
+                if len(parts) < 3:
+                    continue
+                total_files += 1
+                if is_blacklisted_raw(raw):
+                    blacklisted.append(mid)
+                    continue
+                rec = parse_raw(raw)
+                if not rec:
+                    continue
+                cur_cat = parts[1]
+                new_cat = classify_email(cfg, rec)
+                if new_cat != cur_cat:
+                    new_parts = [parts[0], new_cat]
+                    if domain_mode:
+                        new_parts.append(_base_domain(rec.from_addr or ''))
+                    new_parts.append(parts[-1].replace(cur_cat, new_cat))
+                    packs.move(mid, '/'.join(new_parts), category=new_cat)
+                    changed += 1
+            packs.delete(blacklisted)
+            packs.commit()
         log.info("Reproceso finalizado: %d archivos revisados, %d movidos", total_files, changed)
 
         def build_post_reprocess_snapshot(root: Path):
@@ -1271,7 +1398,23 @@ def main(argv: Optional[List[str]] = None):
             top_scam = sorted(scam_domain_counter.items(), key=lambda x: x[1], reverse=True)[:20]
             return {"per_account": per_account, "global_per_category": global_per_category, "total_files": total, "top_scam_domains": top_scam}
 
-        snapshot = build_post_reprocess_snapshot(out_root)
+        def build_pack_snapshot():
+            per_account: Dict[str, Dict[str, int]] = {}
+            global_per_category: Dict[str, int] = {}
+            for (acc_name, cat), count in packs.counts().items():
+                per_account.setdefault(acc_name, {})[cat] = count
+                global_per_category[cat] = global_per_category.get(cat, 0) + count
+            scam_domain_counter: Dict[str, int] = {}
+            for acc_name in per_account:
+                for mid in packs.ids(f"{acc_name}/Scam/")[:500]:
+                    em = mid.rsplit('/', 1)[-1].split('_')[0]
+                    if '@' in em:
+                        dom = em.split('@')[-1].lower()
+                        scam_domain_counter[dom] = scam_domain_counter.get(dom, 0) + 1
+            top_scam = sorted(scam_domain_counter.items(), key=lambda x: x[1], reverse=True)[:20]
+            return {"per_account": per_account, "global_per_category": global_per_category, "total_files": sum(global_per_category.values()), "top_scam_domains": top_scam}
+
+        snapshot = build_post_reprocess_snapshot(out_root) if packs is None else build_pack_snapshot()
         try:
             import json
             rpt_cfg = cfg.get("report", {})
@@ -1301,3 +1444,7 @@ def main(argv: Optional[List[str]] = None):
         except Exception as e:
             log.warning("No se pudo escribir reporte post-reproceso: %s", e)
 
+    if packs is not None:
+        packs.close()
+    archive.close()
+
@@ -0,0 +1,320 @@
+"""Near-duplicate detection for saved emails (MinHash + LSH banding).
+
+The dedup stage used to compare each new email's shingle set against every
+previously saved one (exact Jaccard), which is quadratic in mailbox size.
+``NearDuplicateIndex`` keeps a MinHash signature per saved email and buckets it
+by LSH bands, so a lookup only touches the few emails that share a band with the
+query. Candidates are then confirmed with the exact Jaccard ratio, computed on
+the stored 64-bit shingle hashes (or the signature estimate when those are not
+available, e.g. signatures loaded from a previous run), so accept/reject matches
+the old scan except for the rare pair LSH misses right at the threshold.
+
+Signatures use one-permutation hashing with rotation densification: every
+shingle is hashed once (blake2b, stable across processes) into one of
+``num_perm`` bins and each bin keeps its minimum. That keeps the cost linear in
+the number of shingles without pulling numpy into this project.
+
+Benchmark (synthetic mailbox, brute force vs index)::
+
+    python -m email_collector.near_dup --emails 50000
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import random
+import re
+import time
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+_VALUE_BITS = 32
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_MASK64 = (1 << 64) - 1
+_EMPTY = _MASK64
+
+
+def _mix64(x: int) -> int:
+    """splitmix64 finalizer: a 64-bit bijection, so distinct inputs stay distinct."""
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def canonical_text(subject: str, body: str) -> str:
+    txt = f"{subject or ''}\n{body or ''}".lower()
+    txt = re.sub(r"https?://\S+", " ", txt)
+    txt = re.sub(r"\s+", " ", txt).strip()
+    txt = re.sub(r"\d{3,}", " ", txt)
+    return txt
+
+
+def text_shingles(text: str, shingle_size: int = 4) -> set:
+    tokens = [t for t in re.split(r"[^a-z0-9]+", text) if t]
+    if len(tokens) < shingle_size:
+        return set(tokens)
+    return {" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    union = len(a) + len(b) - inter
+    return inter / union if union else 0.0
+
+
+def shingle_hashes(shingles: Iterable[str]) -> array:
+    """Sorted, distinct 64-bit hashes of ``shingles`` (the form the index keeps).
+
+    Eight bytes per shingle instead of a Python string; exact Jaccard on the
+    hashes only differs from the string sets on a 64-bit collision.
+    """
+    return array("Q", sorted({
+        int.from_bytes(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest(), "little") for sh in shingles
+    }))
+
+
+def jaccard_hashes(a: set, b: Sequence[int]) -> float:
+    """Jaccard ratio between a set of shingle hashes and a stored hash array."""
+    if not a or not b:
+        return 0.0
+    inter = len(a.intersection(b))
+    union = len(a) + len(b) - inter
+    return inter / union if union else 0.0
+
+
+def lsh_params(threshold: float, num_perm: int, fp_weight: float = 0.03, fn_weight: float = 0.97) -> Tuple[int, int]:
+    """Pick ``(bands, rows)`` minimizing the weighted false-positive/negative area.
+
+    False negatives are weighted up: a false positive only costs an extra exact
+    comparison, a false negative changes the dedup decision.
+    """
+    def area(fn, lo: float, hi: float, steps: int = 200) -> float:
+        step = (hi - lo) / steps
+        return sum(fn(lo + (i + 0.5) * step) for i in range(steps)) * step
+
+    best = (1, num_perm)
+    best_err = float("inf")
+    for b in range(1, num_perm + 1):
+        for r in range(1, num_perm // b + 1):
+            fp = area(lambda s: 1 - (1 - s ** r) ** b, 0.0, threshold)
+            fn = area(lambda s: (1 - s ** r) ** b, threshold, 1.0)
+            err = fp_weight * fp + fn_weight * fn
+            if err < best_err:
+                best, best_err = (b, r), err
+    return best
+
+
+class MinHasher:
+    """One-permutation MinHash over string shingles."""
+
+    def __init__(self, num_perm: int = 128) -> None:
+        num_perm = int(num_perm)
+        if not 1 <= num_perm <= _VALUE_MASK:
+            raise ValueError(f"num_perm must be between 1 and {_VALUE_MASK}, got {num_perm}")
+        self.num_perm = num_perm
+
+    def signature(self, shingles: Iterable[str]) -> array:
+        return self.signature_from_hashes(shingle_hashes(shingles))
+
+    def signature_from_hashes(self, hashes: Iterable[int]) -> array:
+        k = self.num_perm
+        sig = array("Q", [_EMPTY]) * k
+        for h in hashes:
+            # bin from the high 32 bits (multiply-shift), value from the low 32:
+            # disjoint bits, so the bin says nothing about the value for any k
+            b = ((h >> _VALUE_BITS) * k) >> _VALUE_BITS
+            v = h & _VALUE_MASK
+            if v < sig[b]:
+                sig[b] = v
+        # rotation densification: an empty bin borrows the next filled bin to its
+        # right, mixed with the distance so borrowed values stay distinguishable
+        # (the mix is a 64-bit bijection, so it never overflows whatever d is)
+        if _EMPTY in sig:
+            filled = [i for i in range(k) if sig[i] != _EMPTY]
+            if not filled:
+                return sig
+            out = array("Q", sig)
+            for i in range(k):
+                if sig[i] != _EMPTY:
+                    continue
+                d = 1
+                while sig[(i + d) % k] == _EMPTY:
+                    d += 1
+                borrowed = _mix64(sig[(i + d) % k] | (d << _VALUE_BITS))
+                out[i] = borrowed if borrowed != _EMPTY else _EMPTY - 1
+            return out
+        return sig
+
+    @staticmethod
+    def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+        if not a or len(a) != len(b):
+            return 0.0
+        return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class NearDuplicateIndex:
+    """LSH index answering "is there a saved email with Jaccard >= threshold?"."""
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128) -> None:
+        self.threshold = float(threshold)
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = lsh_params(self.threshold, self.hasher.num_perm)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._keys: List[Hashable] = []
+        self._hashes: List[Optional[array]] = []
+        self._sigs: List[array] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def signature(self, shingles: Iterable[str]) -> array:
+        return self.hasher.signature(shingles)
+
+    def _band_keys(self, sig: Sequence[int]) -> List[int]:
+        r = self.rows
+        return [hash(tuple(sig[i * r:(i + 1) * r])) for i in range(self.bands)]
+
+    def find(
+        self, shingles: Optional[set] = None, sig: Optional[Sequence[int]] = None, hashes: Optional[Sequence[int]] = None
+    ) -> Optional[Hashable]:
+        """Key of a saved near-duplicate, or None.
+
+        Pass either the shingle set or its ``shingle_hashes``. Sets with a single
+        shingle never match (same rule as the old scan).
+        """
+        if hashes is None and shingles is not None:
+            hashes = shingle_hashes(shingles)
+        if hashes is not None and len(hashes) <= 1:
+            return None
+        if sig is None:
+            if not hashes:
+                return None
+            sig = self.hasher.signature_from_hashes(hashes)
+        query = set(hashes) if hashes is not None else None
+        seen: set = set()
+        for band, bkey in zip(self._buckets, self._band_keys(sig)):
+            for idx in band.get(bkey, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                other = self._hashes[idx]
+                if query is not None and other is not None:
+                    sim = jaccard_hashes(query, other)
+                else:
+                    sim = MinHasher.similarity(sig, self._sigs[idx])
+                if sim >= self.threshold:
+                    return self._keys[idx]
+        return None
+
+    def add(
+        self,
+        key: Hashable,
+        shingles: Optional[set] = None,
+        sig: Optional[Sequence[int]] = None,
+        hashes: Optional[Sequence[int]] = None,
+    ) -> Optional[array]:
+        """Index an email; returns its signature (None when it cannot match anything)."""
+        if hashes is None and shingles is not None:
+            hashes = shingle_hashes(shingles)
+        if hashes is not None and len(hashes) <= 1:
+            return None
+        if sig is None:
+            if not hashes:
+                return None
+            sig = self.hasher.signature_from_hashes(hashes)
+        sig = sig if isinstance(sig, array) else array("Q", sig)
+        idx = len(self._keys)
+        self._keys.append(key)
+        self._hashes.append((hashes if isinstance(hashes, array) else array("Q", hashes)) if hashes is not None else None)
+        self._sigs.append(sig)
+        for band, bkey in zip(self._buckets, self._band_keys(sig)):
+            band.setdefault(bkey, []).append(idx)
+        return sig
+
+
+# ---------------------------------------------------------------- benchmark
+def _synthetic_mailbox(n: int, seed: int = 7) -> List[set]:
+    """Shingle sets for ``n`` emails; ~30% are edited copies of an earlier one."""
+    rnd = random.Random(seed)
+    vocab = [f"w{i}" for i in range(20000)]
+    texts: List[List[str]] = []
+    out: List[set] = []
+    for _ in range(n):
+        if texts and rnd.random() < 0.3:
+            tokens = list(rnd.choice(texts))
+            for _ in range(rnd.choice((0, 1, 1, 2, 3, 6))):
+                tokens[rnd.randrange(len(tokens))] = rnd.choice(vocab)
+        else:
+            tokens = [rnd.choice(vocab) for _ in range(rnd.randint(30, 200))]
+        texts.append(tokens)
+        out.append(text_shingles(" ".join(tokens)))
+    return out
+
+
+def _run_brute(sets: List[set], threshold: float) -> Tuple[List[bool], float]:
+    t0 = time.perf_counter()
+    saved: List[set] = []
+    decisions: List[bool] = []
+    for s in sets:
+        dup = len(s) > 1 and any(len(o) > 1 and jaccard(s, o) >= threshold for o in saved)
+        decisions.append(dup)
+        if not dup:
+            saved.append(s)
+    return decisions, time.perf_counter() - t0
+
+
+def _run_index(sets: List[set], threshold: float, num_perm: int) -> Tuple[List[bool], float]:
+    t0 = time.perf_counter()
+    index = NearDuplicateIndex(threshold, num_perm)
+    decisions: List[bool] = []
+    for i, s in enumerate(sets):
+        hashes = shingle_hashes(s)
+        sig = index.hasher.signature_from_hashes(hashes) if len(hashes) > 1 else None
+        dup = index.find(sig=sig, hashes=hashes) is not None
+        decisions.append(dup)
+        if not dup:
+            index.add(i, sig=sig, hashes=hashes)
+    return decisions, time.perf_counter() - t0
+
+
+def _bench(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Benchmark MinHash/LSH vs exact Jaccard dedup")
+    ap.add_argument("--emails", type=int, default=50000)
+    ap.add_argument("--threshold", type=float, default=0.90)
+    ap.add_argument("--num-perm", type=int, default=128)
+    ap.add_argument("--brute-max", type=int, default=8000, help="Mayor tamaño medido con el escaneo exacto")
+    args = ap.parse_args(argv)
+
+    sets = _synthetic_mailbox(args.emails)
+    bands, rows = lsh_params(args.threshold, args.num_perm)
+    print(f"threshold={args.threshold} num_perm={args.num_perm} bands={bands} rows={rows}")
+    print(f"{'emails':>8} {'index_s':>9} {'us/email':>9} {'brute_s':>9} {'agree':>8}")
+    sizes = sorted({max(1, args.emails // d) for d in (32, 16, 8, 4, 2, 1)})
+    for n in sizes:
+        idx_dec, t_idx = _run_index(sets[:n], args.threshold, args.num_perm)
+        brute = "-"
+        agree = "-"
+        if n <= args.brute_max:
+            bf_dec, t_bf = _run_brute(sets[:n], args.threshold)
+            brute = f"{t_bf:.2f}"
+            agree = f"{sum(a == b for a, b in zip(idx_dec, bf_dec)) / n:.4%}"
+        print(f"{n:>8} {t_idx:>9.2f} {t_idx / n * 1e6:>9.1f} {brute:>9} {agree:>8}")
+
+
+__all__ = [
+    "MinHasher",
+    "NearDuplicateIndex",
+    "canonical_text",
+    "jaccard",
+    "jaccard_hashes",
+    "lsh_params",
+    "shingle_hashes",
+    "text_shingles",
+]
+
+
+if __name__ == "__main__":
+    _bench()
+
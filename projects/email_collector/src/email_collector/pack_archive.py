@@ -0,0 +1,430 @@
+"""Packed message archive: rolling zstd pack files plus an SQLite offset index.
+
+With ``archive.backend: pack`` accepted messages are not written as one .eml
+each. ``save_eml`` appends them to ``pack-NNNNNN.zst`` files under the pack
+directory instead. Messages are grouped into blocks of ``block_kb``, and each
+block is compressed as an independent zstd frame. A pack is sealed once it
+reaches ``pack_max_mb`` and the next one is started.
+
+Every message keeps the id it would have had as a file: its path relative to
+the output folder (``<account>/<category>/<file>.eml``). The index maps that id
+to ``(pack, block offset, block length, offset, length)``, so ``get`` reads and
+decompresses a single block, and ``export`` writes plain .eml files back under
+the same layout. The index also holds the date/subject/account/category columns
+of ``ArchiveIndex``, so the retention purge is the same range query.
+
+Deleting only marks rows. ``compact`` rewrites sealed packs whose deleted share
+is above a threshold. Inside a block each message is stored as
+``>HI`` (id length, raw length) + id + raw bytes, so ``rebuild`` can recover
+the index from the packs alone.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional: only the pack backend needs it
+    zstandard = None
+
+from .archive_index import header_fields, subject_prefix, thread_prefix_keys
+
+_RECORD = struct.Struct(">HI")
+_PACK_GLOB = "pack-*.zst"
+_HEADER_PEEK = 16 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    pack INTEGER NOT NULL,
+    block_offset INTEGER NOT NULL,
+    block_length INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    date_utc TEXT NOT NULL,
+    subject_prefix TEXT NOT NULL DEFAULT '',
+    account TEXT,
+    category TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_messages_pack ON messages(pack);
+CREATE INDEX IF NOT EXISTS ix_messages_date ON messages(date_utc);
+CREATE INDEX IF NOT EXISTS ix_messages_subject ON messages(subject_prefix);
+"""
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def _pack_name(num: int) -> str:
+    return f"pack-{num:06d}.zst"
+
+
+class PackArchive:
+    """Append-only message store keyed by the message's would-be relative path."""
+
+    def __init__(
+        self,
+        root: Path | str,
+        *,
+        base: Path | str | None = None,
+        index_path: Path | str | None = None,
+        pack_max_mb: int = 256,
+        block_kb: int = 512,
+        level: int = 6,
+    ) -> None:
+        if zstandard is None:
+            raise RuntimeError("archive.backend 'pack' requiere el paquete zstandard (pip install zstandard)")
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.base = Path(base) if base else self.root.parent
+        self.index_path = Path(index_path) if index_path else self.root / "index.sqlite3"
+        self.pack_max_bytes = max(1, int(pack_max_mb)) * 1024 * 1024
+        self.block_bytes = max(1, int(block_kb)) * 1024
+        self._cctx = zstandard.ZstdCompressor(level=int(level))
+        self._dctx = zstandard.ZstdDecompressor()
+        self._db = sqlite3.connect(str(self.index_path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        # open block: id -> (offset in block, raw length, metadata row tail)
+        self._block = bytearray()
+        self._block_rows: Dict[str, Tuple[int, int, tuple]] = {}
+        self._fh = None
+        self._pack_num = 0
+        self._last_block: Tuple[Optional[Tuple[int, int]], bytes] = (None, b"")
+        self._open_pack()
+
+    # ---- pack files ------------------------------------------------------
+    def _pack_path(self, num: int) -> Path:
+        return self.root / _pack_name(num)
+
+    def _pack_numbers(self) -> List[int]:
+        nums = []
+        for p in self.root.glob(_PACK_GLOB):
+            try:
+                nums.append(int(p.stem.split("-", 1)[1].split(".")[0]))
+            except (IndexError, ValueError):
+                continue
+        return sorted(nums)
+
+    def _open_pack(self) -> None:
+        nums = self._pack_numbers()
+        num = nums[-1] if nums else 1
+        if self._pack_path(num).exists() and self._pack_path(num).stat().st_size >= self.pack_max_bytes:
+            num += 1
+        self._pack_num = num
+        self._fh = open(self._pack_path(num), "ab")
+
+    def _roll(self) -> None:
+        self._fh.close()
+        self._pack_num += 1
+        self._fh = open(self._pack_path(self._pack_num), "ab")
+
+    def _flush_block(self) -> None:
+        if not self._block_rows:
+            return
+        frame = self._cctx.compress(bytes(self._block))
+        if self._fh.tell() and self._fh.tell() + len(frame) > self.pack_max_bytes:
+            self._roll()
+        block_offset = self._fh.tell()
+        self._fh.write(frame)
+        self._fh.flush()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO messages (id, pack, block_offset, block_length, offset, length,"
+            " date_utc, subject_prefix, account, category, deleted) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            [
+                (mid, self._pack_num, block_offset, len(frame), off, length, *meta)
+                for mid, (off, length, meta) in self._block_rows.items()
+            ],
+        )
+        self._block = bytearray()
+        self._block_rows = {}
+
+    def key(self, path: Path | str) -> str:
+        """Message id for a would-be .eml path under ``base``."""
+        p = Path(path)
+        try:
+            return p.relative_to(self.base).as_posix()
+        except ValueError:
+            return p.as_posix()
+
+    # ---- writes ----------------------------------------------------------
+    def put(
+        self,
+        mid: str,
+        raw: bytes,
+        *,
+        date: Optional[datetime] = None,
+        subject: Optional[str] = None,
+        account: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> None:
+        """Append ``raw`` under ``mid``; an existing id is replaced."""
+        key = mid.encode("utf-8")
+        if date is None or subject is None:
+            hdr_date, hdr_subject = header_fields(raw[:_HEADER_PEEK])
+            date = date or hdr_date
+            subject = hdr_subject if subject is None else subject
+        if account is None or category is None:
+            parts = mid.split("/")
+            if len(parts) >= 3:
+                account = account or parts[0]
+                category = category or parts[1]
+        date_utc = _as_utc(date) if date else datetime.now(timezone.utc)
+        self._block_rows.pop(mid, None)
+        self._block += _RECORD.pack(len(key), len(raw))
+        self._block += key
+        offset = len(self._block)
+        self._block += raw
+        self._block_rows[mid] = (offset, len(raw), (date_utc.isoformat(), subject_prefix(subject), account, category))
+        if len(self._block) >= self.block_bytes:
+            self._flush_block()
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Mark ``ids`` deleted; space comes back on ``compact``."""
+        n = 0
+        for mid in ids:
+            if self._block_rows.pop(mid, None) is not None:
+                n += 1  # still in the open block: it never reaches a pack
+            n += self._db.execute("UPDATE messages SET deleted=1 WHERE id=? AND deleted=0", (mid,)).rowcount
+        return n
+
+    def move(self, old: str, new: str, category: Optional[str] = None) -> None:
+        """Re-key a message (e.g. reclassified into another category folder)."""
+        self._flush_block()
+        parts = new.split("/")
+        category = category or (parts[1] if len(parts) >= 3 else None)
+        self._db.execute("DELETE FROM messages WHERE id=?", (new,))
+        self._db.execute("UPDATE messages SET id=?, category=? WHERE id=?", (new, category, old))
+
+    def commit(self) -> None:
+        """Write the open block and make everything added so far durable."""
+        self._flush_block()
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._db.commit()
+
+    # ---- reads -----------------------------------------------------------
+    def _read_block(self, pack: int, block_offset: int, block_length: int) -> bytes:
+        key = (pack, block_offset)
+        if self._last_block[0] == key:
+            return self._last_block[1]
+        if pack == self._pack_num:
+            self._fh.flush()
+        with open(self._pack_path(pack), "rb") as fh:
+            fh.seek(block_offset)
+            frame = fh.read(block_length)
+        data = self._dctx.decompress(frame)
+        self._last_block = (key, data)
+        return data
+
+    def get(self, mid: str) -> Optional[bytes]:
+        """Raw bytes of message ``mid`` or None."""
+        pending = self._block_rows.get(mid)
+        if pending is not None:
+            off, length, _meta = pending
+            return bytes(self._block[off:off + length])
+        row = self._db.execute(
+            "SELECT pack, block_offset, block_length, offset, length FROM messages WHERE id=? AND deleted=0", (mid,)
+        ).fetchone()
+        if not row:
+            return None
+        pack, block_offset, block_length, off, length = row
+        return self._read_block(pack, block_offset, block_length)[off:off + length]
+
+    def __contains__(self, mid: str) -> bool:
+        if mid in self._block_rows:
+            return True
+        return self._db.execute("SELECT 1 FROM messages WHERE id=? AND deleted=0", (mid,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        n = int(self._db.execute("SELECT COUNT(*) FROM messages WHERE deleted=0").fetchone()[0])
+        return n + len(self._block_rows)
+
+    def ids(self, prefix: str = "") -> List[str]:
+        self._flush_block()
+        if prefix:
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            rows = self._db.execute(
+                "SELECT id FROM messages WHERE deleted=0 AND id >= ? AND id < ? ORDER BY id", (prefix, upper)
+            )
+        else:
+            rows = self._db.execute("SELECT id FROM messages WHERE deleted=0 ORDER BY id")
+        return [r[0] for r in rows.fetchall()]
+
+    def items(self, prefix: str = "") -> Iterator[Tuple[str, bytes]]:
+        """``(id, raw)`` for live messages, in pack order (each block decompressed once)."""
+        self._flush_block()
+        sql = "SELECT id, pack, block_offset, block_length, offset, length FROM messages WHERE deleted=0"
+        args: tuple = ()
+        if prefix:
+            sql += " AND id >= ? AND id < ?"
+            args = (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        rows = self._db.execute(sql + " ORDER BY pack, block_offset, offset", args).fetchall()
+        for mid, pack, block_offset, block_length, off, length in rows:
+            yield mid, self._read_block(pack, block_offset, block_length)[off:off + length]
+
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """Live messages per ``(account, category)``."""
+        self._flush_block()
+        rows = self._db.execute(
+            "SELECT account, category, COUNT(*) FROM messages WHERE deleted=0 GROUP BY account, category"
+        ).fetchall()
+        return {(a or "", c or ""): int(n) for a, c, n in rows}
+
+    def expired(self, cutoff: datetime, thread_prefixes: Sequence[str] = ()) -> Iterator[Tuple[str, str]]:
+        """``(id, "age" | "thread")`` of messages due for the purge (see ``ArchiveIndex.expired``)."""
+        self._flush_block()
+        cutoff_iso = _as_utc(cutoff).isoformat()
+        for (mid,) in self._db.execute(
+            "SELECT id FROM messages WHERE deleted=0 AND date_utc < ?", (cutoff_iso,)
+        ).fetchall():
+            yield mid, "age"
+        seen: set = set()
+        for pref in thread_prefix_keys(thread_prefixes):
+            upper = pref[:-1] + chr(ord(pref[-1]) + 1)
+            for (mid,) in self._db.execute(
+                "SELECT id FROM messages WHERE deleted=0 AND subject_prefix >= ? AND subject_prefix < ? AND date_utc >= ?",
+                (pref, upper, cutoff_iso),
+            ).fetchall():
+                if mid not in seen:
+                    seen.add(mid)
+                    yield mid, "thread"
+
+    def export(self, dest: Path | str, prefix: str = "") -> int:
+        """Write live messages as plain .eml files under ``dest/<id>``; returns the count."""
+        dest = Path(dest)
+        n = 0
+        for mid, raw in self.items(prefix):
+            target = dest / mid
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "wb") as fh:
+                fh.write(raw)
+            n += 1
+        return n
+
+    # ---- maintenance -----------------------------------------------------
+    def import_tree(self, remove: bool = False) -> List[Path]:
+        """Pack every .eml under ``base`` (e.g. an archive saved as files); returns the files packed."""
+        done: List[Path] = []
+        for eml in sorted(self.base.rglob("*.eml")):
+            try:
+                eml.relative_to(self.root)
+                continue  # never re-import an export written inside the pack folder
+            except ValueError:
+                pass
+            try:
+                raw = eml.read_bytes()
+            except OSError:
+                continue
+            self.put(self.key(eml), raw)
+            done.append(eml)
+        self.commit()
+        if remove:
+            for eml in done:
+                try:
+                    eml.unlink()
+                except OSError:
+                    pass
+        return done
+
+    def compact(self, min_dead_ratio: float = 0.5) -> int:
+        """Rewrite sealed packs whose deleted bytes exceed ``min_dead_ratio``; returns packs removed."""
+        self.commit()
+        rows = self._db.execute(
+            "SELECT pack, SUM(length), SUM(CASE WHEN deleted=1 THEN length ELSE 0 END) FROM messages GROUP BY pack"
+        ).fetchall()
+        removed = 0
+        referenced = {pack for pack, _total, _dead in rows}
+        for num in self._pack_numbers():
+            # every message in it was replaced or moved out by an earlier compaction
+            if num != self._pack_num and num not in referenced:
+                self._pack_path(num).unlink()
+                removed += 1
+        for pack, total, dead in rows:
+            if pack == self._pack_num or not total or dead / total < min_dead_ratio:
+                continue
+            live = self._db.execute(
+                "SELECT id, block_offset, block_length, offset, length, date_utc, subject_prefix, account, category"
+                " FROM messages WHERE pack=? AND deleted=0 ORDER BY block_offset, offset",
+                (pack,),
+            ).fetchall()
+            for mid, block_offset, block_length, off, length, date_utc, subj, account, category in live:
+                raw = self._read_block(pack, block_offset, block_length)[off:off + length]
+                # keep the stored metadata rather than re-reading headers
+                self.put(mid, raw, date=datetime.fromisoformat(date_utc), subject=subj, account=account, category=category)
+            self.commit()
+            self._db.execute("DELETE FROM messages WHERE pack=?", (pack,))
+            self._db.commit()
+            self._last_block = (None, b"")
+            try:
+                self._pack_path(pack).unlink()
+            except FileNotFoundError:
+                pass
+            removed += 1
+        return removed
+
+    def rebuild(self) -> int:
+        """Recreate the index by scanning every pack; returns the message count.
+
+        Deletions and moves not yet compacted are not recorded in the packs and
+        are undone.
+        """
+        self._flush_block()
+        self._db.execute("DELETE FROM messages")
+        for num in self._pack_numbers():
+            with open(self._pack_path(num), "rb") as fh:
+                data = fh.read()
+            pos = 0
+            while pos < len(data):
+                dobj = self._dctx.decompressobj()
+                try:
+                    block = dobj.decompress(data[pos:])
+                except zstandard.ZstdError:
+                    break  # torn tail after a crash: everything before it is intact
+                if not dobj.eof:
+                    break
+                block_length = len(data) - pos - len(dobj.unused_data)
+                rows = []
+                i = 0
+                while i + _RECORD.size <= len(block):
+                    key_len, raw_len = _RECORD.unpack_from(block, i)
+                    i += _RECORD.size
+                    mid = block[i:i + key_len].decode("utf-8")
+                    i += key_len
+                    date, subject = header_fields(block[i:i + min(raw_len, _HEADER_PEEK)])
+                    parts = mid.split("/")
+                    account, category = (parts[0], parts[1]) if len(parts) >= 3 else (None, None)
+                    date_utc = date or datetime.now(timezone.utc)
+                    rows.append((mid, num, pos, block_length, i, raw_len, date_utc.isoformat(), subject_prefix(subject), account, category))
+                    i += raw_len
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO messages (id, pack, block_offset, block_length, offset, length,"
+                    " date_utc, subject_prefix, account, category, deleted) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    rows,
+                )
+                pos += block_length
+        self._db.commit()
+        return len(self)
+
+    def close(self) -> None:
+        self.commit()
+        self._fh.close()
+        self._db.close()
+
+    def __enter__(self) -> "PackArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+__all__ = ["PackArchive"]
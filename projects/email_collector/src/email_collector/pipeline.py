@@ -0,0 +1,123 @@
+"""Streaming plumbing between the IMAP fetchers and the single writer.
+
+``RecordQueue`` is the bounded hand-off from the fetch threads: ``put`` blocks
+while the queue is full, so a fast account cannot pull a whole mailbox into
+memory ahead of the writer. ``ordered_map`` runs the CPU-bound per-message work
+(MIME parsing, classification, language detection, shingles) on a process pool
+with a bounded number of messages in flight and yields results in submission
+order, so the dedup/save loop stays single-threaded and deterministic.
+
+Peak memory is therefore bounded by ``queue_size + window`` messages plus one
+IMAP chunk per fetch thread, independent of mailbox size.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+_DONE = object()
+
+
+class RecordQueue:
+    """Bounded multi-producer queue drained by one consumer."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self._q: queue.Queue = queue.Queue(maxsize=max(1, int(maxsize)))
+        self._closed = threading.Event()
+
+    def put(self, item: Any) -> None:
+        # poll so producers do not hang forever if the consumer gave up
+        while not self._closed.is_set():
+            try:
+                self._q.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def producer_done(self, *_args: Any) -> None:
+        """Mark one producer finished (usable as a ``Future`` done-callback)."""
+        self.put(_DONE)
+
+    def drain(self, producers: int) -> Iterator[Any]:
+        """Yield items until ``producers`` producers have called ``producer_done``."""
+        remaining = int(producers)
+        while remaining > 0:
+            item = self._q.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            yield item
+
+    def close(self) -> None:
+        self._closed.set()
+
+
+def _run_batch(fn: Callable[..., Any], batch: List[Sequence[Any]]) -> List[Any]:
+    return [fn(*args) for args in batch]
+
+
+def ordered_map(
+    fn: Callable[..., Any],
+    items: Iterable[Tuple[Any, Sequence[Any]]],
+    *,
+    workers: int,
+    window: int = 0,
+    batch_size: int = 1,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Sequence[Any] = (),
+) -> Iterator[Tuple[Any, Any]]:
+    """Yield ``(key, fn(*args))`` for each ``(key, args)`` in ``items``, in order.
+
+    At most ``window`` calls (default ``4 * workers``) are pending at once;
+    ``items`` is only advanced when there is room, which is what propagates
+    backpressure to the producers. Calls travel to the pool in groups of
+    ``batch_size`` to amortize the pickling round-trip. ``workers <= 1`` runs
+    ``fn`` in-process.
+
+    Workers are spawned rather than forked: the pool starts while the fetch
+    threads are running and a forked child could inherit a held lock.
+    """
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for key, args in items:
+            yield key, fn(*args)
+        return
+
+    batch_size = max(1, int(batch_size or 1))
+    window = max(batch_size, int(window or 4 * workers * batch_size))
+    pending: Deque[Tuple[List[Any], Future]] = deque()
+    in_flight = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initializer,
+        initargs=tuple(initargs),
+    ) as pool:
+        keys: List[Any] = []
+        batch: List[Sequence[Any]] = []
+        for key, args in items:
+            keys.append(key)
+            batch.append(args)
+            if len(batch) < batch_size:
+                continue
+            pending.append((keys, pool.submit(_run_batch, fn, batch)))
+            in_flight += len(keys)
+            keys, batch = [], []
+            # hand over whatever is already finished at the head, block only when full
+            while pending and (in_flight >= window or pending[0][1].done()):
+                head_keys, fut = pending.popleft()
+                in_flight -= len(head_keys)
+                yield from zip(head_keys, fut.result())
+        if batch:
+            pending.append((keys, pool.submit(_run_batch, fn, batch)))
+        while pending:
+            head_keys, fut = pending.popleft()
+            yield from zip(head_keys, fut.result())
+
+
+__all__ = ["RecordQueue", "ordered_map"]
@@ -0,0 +1,172 @@
+"""Persistent dedup and IMAP sync state (SQLite).
+
+Every processed message is recorded per account/folder with its Message-ID, a
+SHA-256 digest of the raw bytes, its MinHash signature (when it was saved) and
+the saved path, so a later run can reject it without comparing anything. Each
+folder also keeps its UIDVALIDITY and the last UID fully processed; the fetch
+stage only asks the server for UIDs above that checkpoint.
+
+Checkpoints reported by the fetch threads are staged in memory and written in
+the same transaction as the message rows (``commit``), so a crash mid-run never
+advances a folder past mail that was not recorded.
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    uid INTEGER,
+    message_id TEXT,
+    digest TEXT NOT NULL,
+    minhash BLOB,
+    saved_path TEXT,
+    status TEXT,
+    processed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_messages_message_id ON messages(message_id);
+CREATE INDEX IF NOT EXISTS ix_messages_digest ON messages(digest);
+CREATE INDEX IF NOT EXISTS ix_messages_folder_uid ON messages(account, folder, uid);
+CREATE TABLE IF NOT EXISTS folders (
+    account TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    uidvalidity INTEGER,
+    last_uid INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    PRIMARY KEY (account, folder)
+);
+"""
+
+
+def content_digest(raw: bytes) -> str:
+    return hashlib.sha256(raw or b"").hexdigest()
+
+
+class SyncStore:
+    """SQLite-backed store shared by the fetch threads and the dedup loop."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._staged: Dict[Tuple[str, str], Tuple[Optional[int], int]] = {}
+
+    # ---- sync state ------------------------------------------------------
+    def checkpoint(self, account: str, folder: str, uidvalidity: Optional[int]) -> int:
+        """Last processed UID for the folder, or 0 when unknown / UIDVALIDITY changed."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT uidvalidity, last_uid FROM folders WHERE account=? AND folder=?",
+                (account, folder),
+            ).fetchone()
+        if not row:
+            return 0
+        stored_validity, last_uid = row
+        if uidvalidity is None or stored_validity != uidvalidity:
+            return 0
+        return int(last_uid or 0)
+
+    def stage_checkpoint(self, account: str, folder: str, uidvalidity: Optional[int], last_uid: int) -> None:
+        """Remember where a folder's fetch ended; persisted by the next ``commit``."""
+        if uidvalidity is None or not last_uid:
+            return
+        with self._lock:
+            self._staged[(account, folder)] = (uidvalidity, int(last_uid))
+
+    # ---- messages --------------------------------------------------------
+    def seen_message_id(self, message_id: Optional[str]) -> bool:
+        if not message_id:
+            return False
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM messages WHERE message_id=? LIMIT 1", (message_id,)
+            ).fetchone() is not None
+
+    def seen_digest(self, digest: str) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM messages WHERE digest=? LIMIT 1", (digest,)
+            ).fetchone() is not None
+
+    def record(
+        self,
+        *,
+        account: str,
+        folder: str,
+        uid: Optional[int],
+        message_id: Optional[str],
+        digest: str,
+        status: str,
+        minhash: Optional[Sequence[int]] = None,
+        saved_path: Optional[str] = None,
+    ) -> None:
+        blob = array("Q", minhash).tobytes() if minhash is not None else None
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO messages (account, folder, uid, message_id, digest, minhash, saved_path, status, processed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (account, folder, uid, message_id, digest, blob, saved_path, status, now),
+            )
+
+    def saved_count(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM messages WHERE saved_path IS NOT NULL").fetchone()[0])
+
+    def signatures(self, window_days: int = 0) -> Iterator[Tuple[str, array]]:
+        """``(saved_path, minhash)`` of saved messages, optionally only the last ``window_days``."""
+        sql = "SELECT saved_path, minhash FROM messages WHERE minhash IS NOT NULL"
+        params: List[str] = []
+        if window_days and window_days > 0:
+            sql += " AND processed_at >= ?"
+            params.append((datetime.now(timezone.utc) - timedelta(days=window_days)).isoformat())
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        for path, blob in rows:
+            sig = array("Q")
+            sig.frombytes(blob)
+            yield path, sig
+
+    # ---- transactions ----------------------------------------------------
+    def commit(self) -> None:
+        """Persist recorded messages together with the staged folder checkpoints."""
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            for (account, folder), (validity, last_uid) in self._staged.items():
+                self._db.execute(
+                    "INSERT INTO folders (account, folder, uidvalidity, last_uid, updated_at) VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT(account, folder) DO UPDATE SET"
+                    " last_uid = CASE WHEN folders.uidvalidity = excluded.uidvalidity"
+                    "   THEN MAX(folders.last_uid, excluded.last_uid) ELSE excluded.last_uid END,"
+                    " uidvalidity = excluded.uidvalidity, updated_at = excluded.updated_at",
+                    (account, folder, validity, last_uid, now),
+                )
+            self._staged.clear()
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "SyncStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+__all__ = ["SyncStore", "content_digest"]
@@ -0,0 +1,245 @@
+"""Resized WebP/AVIF variants of the downloaded listing photos.
+
+For every photo under ``<images>/<listing>/`` the builder writes one file per
+``DerivativeSpec`` (thumbnail, medium and large by default) to
+``<images>/_derived/ab/<source sha256>_<spec key>.<format>``. Because the name
+holds both the source hash and the full spec, reruns only decode photos that
+are new or changed. Changing a spec produces new files instead of silently
+reusing old ones. Identical photos shared by several listings are rendered
+once.
+
+Source hashes are not recomputed each run. A slot hard-linked into the image
+store takes its hash from the ``_objects/ab/<sha256><ext>`` file it points at.
+Other files are hashed once and remembered in ``_derived/source_hashes.json``
+by device, inode, size and mtime.
+
+Decoding and encoding run in a process pool. JPEG sources are decoded with
+``draft`` at the smallest scale that still covers the largest variant needed.
+Width, height and bytes of each variant are recorded in the listing manifest
+when one is given. Only variants missing from it are written.
+
+Needs Pillow (``pip install pillow``); AVIF also needs a Pillow build with
+AVIF support.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional: only this stage needs it
+    Image = ImageOps = None
+
+from .manifest import ListingManifest
+
+logger = logging.getLogger("easybroker")
+
+SOURCE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff"}
+_CHUNK = 64 * 1024
+
+
+@dataclass(frozen=True)
+class DerivativeSpec:
+    name: str
+    max_edge: int
+    fmt: str = "webp"
+    quality: int = 80
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}-{self.max_edge}-q{self.quality}"
+
+    @property
+    def ext(self) -> str:
+        return f".{self.fmt}"
+
+
+DEFAULT_SPECS: Tuple[DerivativeSpec, ...] = (
+    DerivativeSpec("thumb", 320, quality=75),
+    DerivativeSpec("medium", 960),
+    DerivativeSpec("large", 1920, quality=82),
+)
+
+
+def file_sha256(path: Path | str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _render(src: str, jobs: List[Tuple[DerivativeSpec, str]]) -> List[Tuple[str, int, int, int]]:
+    """Write each ``(spec, target)`` variant of ``src``; returns ``(spec name, width, height, bytes)``."""
+    out = []
+    with Image.open(src) as img:
+        largest = max(spec.max_edge for spec, _ in jobs)
+        if img.format == "JPEG":
+            # decode at 1/2, 1/4 or 1/8 scale when that still covers the largest variant
+            img.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+        for spec, target in sorted(jobs, key=lambda j: -j[0].max_edge):
+            variant = img.copy()
+            variant.thumbnail((spec.max_edge, spec.max_edge), Image.LANCZOS)
+            tmp = f"{target}.tmp"
+            variant.save(tmp, format=spec.fmt.upper(), quality=spec.quality, method=4)
+            os.replace(tmp, target)
+            out.append((spec.name, variant.width, variant.height, os.path.getsize(target)))
+            # keep reducing from the previous size instead of the full image
+            img = variant
+    return out
+
+
+class DerivativeBuilder:
+    def __init__(
+        self,
+        images_folder: Path | str,
+        specs: Sequence[DerivativeSpec] = DEFAULT_SPECS,
+        max_workers: Optional[int] = None,
+        manifest: Optional[ListingManifest] = None,
+    ):
+        if Image is None:
+            raise RuntimeError("Image derivatives need Pillow (pip install pillow)")
+        self.images_folder = Path(images_folder)
+        self.out_root = self.images_folder / "_derived"
+        self.specs = tuple(specs)
+        self.max_workers = max_workers
+        self.manifest = manifest
+        self.stats = {"rendered": 0, "reused": 0, "errors": 0}
+
+    def target(self, sha: str, spec: DerivativeSpec) -> Path:
+        return self.out_root / sha[:2] / f"{sha}_{spec.key}{spec.ext}"
+
+    def _object_shas(self) -> Dict[Tuple[int, int], str]:
+        """``(dev, inode) -> sha256`` of the image store's objects, read from their names."""
+        out: Dict[Tuple[int, int], str] = {}
+        objects = self.images_folder / "_objects"
+        if not objects.is_dir():
+            return out
+        for bucket in os.scandir(objects):
+            if not bucket.is_dir() or len(bucket.name) != 2:
+                continue
+            for entry in os.scandir(bucket.path):
+                sha = entry.name.split(".", 1)[0]
+                if len(sha) == 64 and entry.is_file():
+                    st = entry.stat()
+                    out[(st.st_dev, st.st_ino)] = sha
+        return out
+
+    def _load_sha_cache(self) -> Dict[str, str]:
+        try:
+            with open(self.out_root / "source_hashes.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_sha_cache(self, cache: Dict[str, str]) -> None:
+        self.out_root.mkdir(parents=True, exist_ok=True)
+        path = self.out_root / "source_hashes.json"
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, path)
+
+    def _sources(self) -> Iterator[Tuple[str, str, Path]]:
+        """``(listing id, slot, path)`` for every photo under the images folder."""
+        for listing in sorted(os.listdir(self.images_folder)):
+            folder = self.images_folder / listing
+            if listing.startswith("_") or not folder.is_dir():
+                continue
+            for name in sorted(os.listdir(folder)):
+                path = folder / name
+                if path.suffix.lower() in SOURCE_EXTS:
+                    yield listing, path.stem, path
+
+    def build_all(self) -> None:
+        logger.info('Starting image derivatives')
+        # hard-linked copies of one photo are hashed and rendered once
+        sha_by_inode = self._object_shas()
+        cache = self._load_sha_cache()
+        seen: Dict[str, str] = {}
+        slots: Dict[str, List[Tuple[str, str]]] = {}
+        first_path: Dict[str, Path] = {}
+        for listing, slot, path in self._sources():
+            try:
+                st = path.stat()
+                inode = (st.st_dev, st.st_ino)
+                sha = sha_by_inode.get(inode)
+                if sha is None:
+                    # not a store object (a copy, or placed by hand)
+                    stamp = f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+                    sha = cache.get(stamp) or file_sha256(path)
+                    seen[stamp] = sha
+            except OSError as e:
+                logger.error(f"Cannot read {path}: {e}")
+                self.stats["errors"] += 1
+                continue
+            sha_by_inode[inode] = sha
+            slots.setdefault(sha, []).append((listing, slot))
+            first_path.setdefault(sha, path)
+        if seen != cache:
+            self._save_sha_cache(seen)
+
+        jobs: Dict[str, List[Tuple[DerivativeSpec, str]]] = {}
+        for sha in slots:
+            missing = [(spec, str(self.target(sha, spec))) for spec in self.specs if not self.target(sha, spec).exists()]
+            if missing:
+                jobs[sha] = missing
+            self.stats["reused"] += len(self.specs) - len(missing)
+
+        results: Dict[str, Dict[str, Tuple[int, int, int]]] = {}
+        if jobs:
+            for sha in jobs:
+                (self.out_root / sha[:2]).mkdir(parents=True, exist_ok=True)
+            with ProcessPoolExecutor(max_workers=self.max_workers) as ex:
+                futures = {ex.submit(_render, str(first_path[sha]), spec_jobs): sha for sha, spec_jobs in jobs.items()}
+                for fut in as_completed(futures):
+                    sha = futures[fut]
+                    try:
+                        rendered = fut.result()
+                    except Exception as e:  # pragma: no cover
+                        logger.error(f"Failed rendering {first_path[sha]}: {e}")
+                        self.stats["errors"] += 1
+                        continue
+                    self.stats["rendered"] += len(rendered)
+                    results[sha] = {name: (w, h, size) for name, w, h, size in rendered}
+
+        if self.manifest is not None:
+            recorded = self.manifest.recorded_derivatives()
+            rows = []
+            for sha, owners in slots.items():
+                fresh = results.get(sha, {})
+                for spec in self.specs:
+                    target = self.target(sha, spec)
+                    if spec.name in fresh:
+                        w, h, size = fresh[spec.name]
+                        pending = owners
+                    else:
+                        pending = [(pid, sl) for pid, sl in owners if (pid, sl, spec.name, sha) not in recorded]
+                        if not pending or not target.exists():
+                            continue
+                        try:
+                            with Image.open(target) as im:  # header only
+                                w, h = im.size
+                            size = target.stat().st_size
+                        except OSError:
+                            continue
+                    rel = target.relative_to(self.images_folder).as_posix()
+                    rows.extend((listing, slot, spec.name, sha, rel, w, h, size) for listing, slot in pending)
+            if rows:
+                self.manifest.record_derivatives(rows)
+                self.manifest.commit()
+        s = self.stats
+        logger.info(f"Derivatives summary -> rendered: {s['rendered']}, reused: {s['reused']}, errors: {s['errors']}")
+
+
+__all__ = ["DEFAULT_SPECS", "DerivativeBuilder", "DerivativeSpec", "file_sha256"]
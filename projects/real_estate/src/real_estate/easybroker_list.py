@@ -1,16 +1,22 @@
 import os
 import json
+import math
+import re
 import logging
-import argparse
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Iterable, List, Optional
-from threading import Lock
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from threading import Condition, Lock
 from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 import shutil
 
-import requests
 
 from . import paths
+from .http_client import HttpClient
+from .image_store import ImageStore, url_ext
+from .manifest import ListingManifest, content_hash
 
 # ---------------- Logging ----------------
 logger = logging.getLogger("easybroker")
@@ -28,16 +34,78 @@ if not logger.handlers:
         pass
 
 
+_SLOT_RE = re.compile(r"img_\d+\.[^.]+$")
+
+
+def _with_query(url: str, **params) -> str:
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({k: str(v) for k, v in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def extract_image_urls(data: dict) -> List[str]:
+    urls: List[str] = []
+    imgs = data.get('images')
+    if isinstance(imgs, list):
+        for img in imgs:
+            if isinstance(img, dict) and img.get('url'):
+                urls.append(img['url'])
+            elif isinstance(img, str):
+                urls.append(img)
+    pimgs = data.get('property_images')
+    if isinstance(pimgs, list):
+        for img in pimgs:
+            if isinstance(img, dict) and img.get('url'):
+                urls.append(img['url'])
+            elif isinstance(img, str):
+                urls.append(img)
+    photos = data.get('photos')
+    if isinstance(photos, list):
+        for img in photos:
+            if isinstance(img, dict) and img.get('url'):
+                urls.append(img['url'])
+            elif isinstance(img, str):
+                urls.append(img)
+    if isinstance(data.get('title_image_full'), str):
+        urls.append(data['title_image_full'])
+    seen = set()
+    dedup = []
+    for u in urls:
+        if u not in seen:
+            seen.add(u)
+            dedup.append(u)
+    return dedup
+
+
 class PropertyJsonDownloader:
-    def __init__(self, api_key: str, properties_url: str, base_json_folder: str, max_workers: int = 10, only_if_stale: bool = False):
+    def __init__(
+        self,
+        api_key: str,
+        properties_url: str,
+        base_json_folder: str,
+        max_workers: int = 10,
+        only_if_stale: bool = False,
+        client: Optional[HttpClient] = None,
+        page_size: int = 50,
+        prefetch_pages: int = 3,
+        manifest: Optional[ListingManifest] = None,
+        only_ids: Optional[Iterable[str]] = None,
+    ):
         self.api_key = api_key
         self.properties_url = properties_url
         self.base_json_folder = base_json_folder
         self.max_workers = max_workers
         self.only_if_stale = only_if_stale
+        self.client = client or HttpClient({"accept": "application/json", "X-Authorization": api_key}, pool_size=max_workers + prefetch_pages)
+        self.page_size = page_size
+        self.prefetch_pages = max(1, prefetch_pages)
         self._lock = Lock()
         self.stats = {"saved": 0, "updated": 0, "skipped": 0, "errors": 0}
         os.makedirs(self.base_json_folder, exist_ok=True)
+        self.manifest = manifest or ListingManifest(os.path.join(self.base_json_folder, 'manifest.sqlite3'))
+        # when set, existing listings outside this set are left alone (see ListingChanges.changed_ids)
+        self.only_ids = set(only_ids) if only_ids is not None else None
 
     @staticmethod
     def _parse_dt(val: Optional[str]) -> Optional[datetime]:
@@ -58,9 +126,8 @@ class PropertyJsonDownloader:
 
     def _fetch_details(self, public_id: str) -> dict | None:
         url = self._detail_url_for(public_id)
-        headers = {"accept": "application/json", "X-Authorization": self.api_key}
         try:
-            resp = requests.get(url, headers=headers, timeout=20)
+            resp = self.client.get(url)
             if resp.status_code == 200 and resp.content:
                 return resp.json()
             logger.warning(f"Detail request for {public_id} returned {resp.status_code}")
@@ -68,25 +135,52 @@ class PropertyJsonDownloader:
             logger.error(f"Error fetching details for {public_id}: {e}")
         return None
 
+    def _record(self, public_id: str, data: dict, digest: Optional[str]) -> None:
+        self.manifest.record(
+            public_id,
+            updated_at=data.get('updated_at'),
+            digest=digest,
+            public_url=data.get('public_url'),
+            image_urls=extract_image_urls(data),
+        )
+
+    def _local_updated_at(self, public_id: str, path: str) -> Optional[str]:
+        known = self.manifest.get(public_id)
+        if known and known[0]:
+            return known[0]
+        # saved before the manifest existed: read it once and index it
+        try:
+            with open(path, 'rb') as rf:
+                raw = rf.read()
+            local_data = json.loads(raw)
+        except Exception:
+            return None
+        if not isinstance(local_data, dict):
+            return None
+        self._record(public_id, local_data, content_hash(raw))
+        return local_data.get('updated_at')
+
     def _save_one(self, rec: dict) -> None:
         public_id = rec.get('public_id') or rec.get('id')
         if not public_id:
             return
         path = os.path.join(self.base_json_folder, f"{public_id}.json")
         was_update = False
-        if os.path.exists(path):
+        if os.path.exists(path) and self.only_ids is not None:
+            if public_id not in self.only_ids:
+                logger.debug(f"Skipping JSON (not in change feed) for {public_id}")
+                with self._lock:
+                    self.stats["skipped"] += 1
+                return
+            # listed as changed: refetch even when the timestamp did not move
+            was_update = True
+        elif os.path.exists(path):
             if not self.only_if_stale:
                 logger.info(f"Skipping existing JSON for {public_id}")
                 with self._lock:
                     self.stats["skipped"] += 1
                 return
-            local_updated: Optional[datetime] = None
-            try:
-                with open(path, 'r', encoding='utf-8') as rf:
-                    local_data = json.load(rf)
-                    local_updated = self._parse_dt(local_data.get('updated_at'))
-            except Exception:
-                local_updated = None
+            local_updated = self._parse_dt(self._local_updated_at(public_id, path))
             remote_updated = self._parse_dt(rec.get('updated_at'))
             if local_updated and remote_updated and local_updated >= remote_updated:
                 logger.info(f"Skipping JSON (up-to-date) for {public_id}")
@@ -100,8 +194,19 @@ class PropertyJsonDownloader:
             if isinstance(details, dict) and details:
                 rec = details
         try:
+            payload = json.dumps(rec, ensure_ascii=False, indent=2)
+            digest = content_hash(payload.encode('utf-8'))
+            known = self.manifest.get(public_id)
+            if was_update and known and known[1] == digest:
+                # the timestamp moved but the listing did not change
+                self._record(public_id, rec, digest)
+                logger.info(f"Skipping JSON (unchanged) for {public_id}")
+                with self._lock:
+                    self.stats["skipped"] += 1
+                return
             with open(path, 'w', encoding='utf-8') as f:
-                json.dump(rec, f, ensure_ascii=False, indent=2)
+                f.write(payload)
+            self._record(public_id, rec, digest)
             key = "updated" if was_update else "saved"
             logger.info(f"Saved JSON for {public_id}")
             with self._lock:
@@ -111,171 +216,401 @@ class PropertyJsonDownloader:
             with self._lock:
                 self.stats["errors"] += 1
 
+    def _get_page(self, url: str) -> Optional[dict | list]:
+        try:
+            resp = self.client.get(url, timeout=15)
+        except Exception as e:  # pragma: no cover
+            logger.error(f"Request error for url {url}: {e}")
+            return None
+        if resp.status_code != 200:
+            logger.warning(f"Non-200 response fetching properties: {resp.status_code}")
+            return None
+        return resp.json() if resp.content else {}
+
+    @staticmethod
+    def _remaining_pages(data: dict) -> Optional[List[str]]:
+        """URLs of every page after ``data`` when its pagination reports a total, else None."""
+        pagination = data.get('pagination') or {}
+        next_page = pagination.get('next_page')
+        total, limit, page = pagination.get('total'), pagination.get('limit'), pagination.get('page')
+        if not next_page:
+            return []
+        if not all(isinstance(v, int) for v in (total, limit, page)) or limit <= 0:
+            return None
+        return [_with_query(next_page, page=n) for n in range(page + 1, math.ceil(total / limit) + 1)]
+
     def download_all(self) -> None:
         logger.info(f"Fetching properties from {self.properties_url}")
         url = self.properties_url
+        if self.page_size and 'limit=' not in (urlsplit(url).query or ''):
+            url = _with_query(url, limit=self.page_size)
         futures = []
-        headers = {"accept": "application/json", "X-Authorization": self.api_key}
-        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
-            while url:
-                try:
-                    resp = requests.get(url, headers=headers, timeout=15)
-                except Exception as e:  # pragma: no cover
-                    logger.error(f"Request error for url {url}: {e}")
-                    break
-                if resp.status_code != 200:
-                    logger.warning(f"Non-200 response fetching properties: {resp.status_code}")
-                    break
-                data = resp.json() if resp.content else {}
-                records: Iterable = []
-                if isinstance(data, dict):
-                    records = data.get('content') or []
-                elif isinstance(data, list):
-                    records = data
-                for rec in records:
-                    futures.append(ex.submit(self._save_one, rec))
-                url = data.get('pagination', {}).get('next_page') if isinstance(data, dict) else None
+
+        def submit(data) -> None:
+            records: Iterable = []
+            if isinstance(data, dict):
+                records = data.get('content') or []
+            elif isinstance(data, list):
+                records = data
+            for rec in records:
+                futures.append(ex.submit(self._save_one, rec))
+
+        # details are fetched by the worker pool while later pages are still loading
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex, \
+                ThreadPoolExecutor(max_workers=self.prefetch_pages) as page_pool:
+            data = self._get_page(url)
+            submit(data)
+            pages = self._remaining_pages(data) if isinstance(data, dict) else []
+            if pages is None:
+                # no total to plan with: follow next_page one page at a time
+                url = data.get('pagination', {}).get('next_page')
+                while url:
+                    data = self._get_page(url)
+                    submit(data)
+                    url = data.get('pagination', {}).get('next_page') if isinstance(data, dict) else None
+            else:
+                pending = deque()
+                queued = iter(pages)
+                for page_url in queued:
+                    pending.append(page_pool.submit(self._get_page, page_url))
+                    if len(pending) >= self.prefetch_pages:
+                        break
+                while pending:
+                    submit(pending.popleft().result())
+                    page_url = next(queued, None)
+                    if page_url:
+                        pending.append(page_pool.submit(self._get_page, page_url))
             for _ in as_completed(futures):
                 pass
+        self.manifest.commit()
         logger.info('Finished downloading JSONs')
         s = self.stats
+        c = self.client.stats
         logger.info(f"JSON summary -> saved: {s['saved']}, updated: {s['updated']}, skipped: {s['skipped']}, errors: {s['errors']}")
+        logger.info(f"HTTP -> requests: {c['requests']}, retries: {c['retries']}, failures: {c['failures']}")
+
+
+class _HostScheduler:
+    """Hands out image tasks round-robin across hosts, at most ``per_host`` at a time per host."""
+
+    def __init__(self, tasks: Iterable[tuple], per_host: int):
+        self.per_host = max(1, per_host)
+        self._queues: Dict[str, deque] = {}
+        for task in tasks:
+            self._queues.setdefault(urlsplit(task[2]).netloc, deque()).append(task)
+        self._hosts = deque(self._queues)
+        self._active: Dict[str, int] = {host: 0 for host in self._queues}
+        self._cond = Condition()
+
+    def get(self) -> Optional[Tuple[str, tuple]]:
+        with self._cond:
+            while True:
+                if not any(self._queues.values()):
+                    return None
+                for _ in range(len(self._hosts)):
+                    host = self._hosts[0]
+                    self._hosts.rotate(-1)
+                    if self._queues[host] and self._active[host] < self.per_host:
+                        self._active[host] += 1
+                        return host, self._queues[host].popleft()
+                self._cond.wait()
+
+    def done(self, host: str) -> None:
+        with self._cond:
+            self._active[host] -= 1
+            self._cond.notify_all()
 
 
 class PropertyImageDownloader:
-    def __init__(self, base_json_folder: str, images_folder: str, max_workers: int = 10):
+    def __init__(
+        self,
+        base_json_folder: str,
+        images_folder: str,
+        max_workers: int = 10,
+        per_host: Optional[int] = None,
+        refresh: bool = False,
+        manifest: Optional[ListingManifest] = None,
+        client: Optional[HttpClient] = None,
+        only_ids: Optional[Iterable[str]] = None,
+    ):
         self.base_json_folder = base_json_folder
         self.images_folder = images_folder
         self.max_workers = max_workers
+        self.per_host = per_host or max_workers
+        self.refresh = refresh
+        self.manifest = manifest
+        self.only_ids = set(only_ids) if only_ids is not None else None
         self._lock = Lock()
-        self.stats = {"downloaded": 0, "skipped": 0, "errors": 0}
+        self.stats = {"downloaded": 0, "skipped": 0, "errors": 0, "deduped": 0, "not_modified": 0}
         os.makedirs(self.images_folder, exist_ok=True)
+        # image CDNs are not bound by the API quota
+        self.client = client or HttpClient(rate_limit=0, pool_size=max(self.per_host, 1), timeout=15)
+        self.store = ImageStore(self.images_folder)
 
     @staticmethod
     def _extract_urls(data: dict) -> List[str]:
-        urls: List[str] = []
-        imgs = data.get('images')
-        if isinstance(imgs, list):
-            for img in imgs:
-                if isinstance(img, dict) and img.get('url'):
-                    urls.append(img['url'])
-                elif isinstance(img, str):
-                    urls.append(img)
-        pimgs = data.get('property_images')
-        if isinstance(pimgs, list):
-            for img in pimgs:
-                if isinstance(img, dict) and img.get('url'):
-                    urls.append(img['url'])
-                elif isinstance(img, str):
-                    urls.append(img)
-        photos = data.get('photos')
-        if isinstance(photos, list):
-            for img in photos:
-                if isinstance(img, dict) and img.get('url'):
-                    urls.append(img['url'])
-                elif isinstance(img, str):
-                    urls.append(img)
-        if isinstance(data.get('title_image_full'), str):
-            urls.append(data['title_image_full'])
-        seen = set()
-        dedup = []
-        for u in urls:
-            if u not in seen:
-                seen.add(u)
-                dedup.append(u)
-        return dedup
-
-    def _download_for_file(self, filename: str) -> None:
-        if not filename.endswith('.json'):
-            return
-        src = os.path.join(self.base_json_folder, filename)
-        try:
-            with open(src, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except Exception as e:  # pragma: no cover
-            logger.error(f"Failed to load {filename}: {e}")
-            return
-        prop_id = data.get('public_id') or data.get('id') or os.path.splitext(filename)[0]
-        urls = self._extract_urls(data)
-        if not urls:
-            return
-        dest_folder = os.path.join(self.images_folder, prop_id)
-        os.makedirs(dest_folder, exist_ok=True)
-        for idx, url in enumerate(urls, start=1):
+        return extract_image_urls(data)
+
+    def _listing_urls(self) -> Iterator[Tuple[str, List[str]]]:
+        known = dict(self.manifest.image_urls()) if self.manifest is not None else {}
+        for filename in sorted(os.listdir(self.base_json_folder)):
+            if not filename.endswith('.json'):
+                continue
+            stem = os.path.splitext(filename)[0]
+            if self.only_ids is not None and stem not in self.only_ids:
+                continue
+            if stem in known:
+                yield stem, known[stem]
+                continue
             try:
-                base = url.split('?')[0]
-                ext = os.path.splitext(base)[1] or '.jpg'
-                fname = f"img_{idx}{ext}"
-                out_path = os.path.join(dest_folder, fname)
-                if os.path.exists(out_path):
-                    logger.info(f"Skipping existing image {out_path}")
+                with open(os.path.join(self.base_json_folder, filename), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:  # pragma: no cover
+                logger.error(f"Failed to load {filename}: {e}")
+                continue
+            yield data.get('public_id') or data.get('id') or stem, self._extract_urls(data)
+
+    def _tasks(self) -> List[Tuple[str, str, str, bool]]:
+        # listings picked by --changed-only may have new photos behind existing slots
+        revalidate = self.refresh or self.only_ids is not None
+        tasks = []
+        for prop_id, urls in self._listing_urls():
+            dest_folder = os.path.join(self.images_folder, prop_id)
+            slots = set()
+            for idx, url in enumerate(urls, start=1):
+                slot = f"img_{idx}{url_ext(url)}"
+                slots.add(slot)
+                out_path = os.path.join(dest_folder, slot)
+                if os.path.exists(out_path) and not revalidate:
+                    logger.debug(f"Skipping existing image {out_path}")
                     with self._lock:
                         self.stats["skipped"] += 1
                     continue
-                r = requests.get(url, stream=True, timeout=15)
-                if r.status_code == 200:
-                    with open(out_path, 'wb') as wf:
-                        for chunk in r.iter_content(8192):
-                            if chunk:
-                                wf.write(chunk)
-                    logger.info(f"Downloaded {fname} for {prop_id}")
-                    with self._lock:
-                        self.stats["downloaded"] += 1
-                else:
-                    logger.warning(f"Image request for {url} returned {r.status_code}")
-            except Exception as e:  # pragma: no cover
-                logger.error(f"Error downloading image {url} for {prop_id}: {e}")
-                with self._lock:
-                    self.stats["errors"] += 1
+                tasks.append((prop_id, out_path, url, revalidate))
+            if self.only_ids is not None:
+                self._drop_stale_slots(dest_folder, slots)
+        return tasks
+
+    @staticmethod
+    def _drop_stale_slots(dest_folder: str, slots: Set[str]) -> None:
+        """Remove ``img_N`` files the listing's current URL list no longer has."""
+        if not os.path.isdir(dest_folder):
+            return
+        for name in os.listdir(dest_folder):
+            if _SLOT_RE.match(name) and name not in slots:
+                os.remove(os.path.join(dest_folder, name))
+                logger.debug(f"Removed stale image {name} from {dest_folder}")
+
+    def _download_one(self, prop_id: str, out_path: str, url: str, revalidate: bool = False) -> None:
+        try:
+            outcome, obj = self.store.fetch(self.client, url, revalidate=revalidate)
+            self.store.link(obj, out_path)
+            key = outcome if outcome in ("downloaded", "not_modified") else "deduped"
+            if outcome == "downloaded":
+                logger.info(f"Downloaded {os.path.basename(out_path)} for {prop_id}")
+            with self._lock:
+                self.stats[key] += 1
+        except Exception as e:  # pragma: no cover
+            logger.error(f"Error downloading image {url} for {prop_id}: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+
+    def _worker(self, scheduler: _HostScheduler) -> None:
+        while True:
+            item = scheduler.get()
+            if item is None:
+                return
+            host, task = item
+            try:
+                self._download_one(*task)
+            finally:
+                scheduler.done(host)
 
     def download_all(self) -> None:
         logger.info('Starting image downloads')
-        files = [f for f in os.listdir(self.base_json_folder) if f.endswith('.json')]
+        # one flat queue of images, so a listing with many photos does not hold a worker
+        scheduler = _HostScheduler(self._tasks(), self.per_host)
         with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
-            futures = [ex.submit(self._download_for_file, fn) for fn in files]
-            for _ in as_completed(futures):
-                pass
+            for f in [ex.submit(self._worker, scheduler) for _ in range(self.max_workers)]:
+                f.result()
+        self.store.commit()
         logger.info('Finished image downloads')
         s = self.stats
-        logger.info(f"Images summary -> downloaded: {s['downloaded']}, skipped: {s['skipped']}, errors: {s['errors']}")
+        logger.info(
+            f"Images summary -> downloaded: {s['downloaded']}, deduped: {s['deduped']}, "
+            f"not modified: {s['not_modified']}, skipped: {s['skipped']}, errors: {s['errors']}"
+        )
+
+
+@dataclass
+class ListingChanges:
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # public_id -> (previous status, current status)
+    status_changed: Dict[str, Tuple[Optional[str], Optional[str]]] = field(default_factory=dict)
+    # same status, newer updated_at
+    updated: List[str] = field(default_factory=list)
+    first_sync: bool = False
+
+    @property
+    def changed_ids(self) -> Set[str]:
+        """Listings whose JSON and images may need a refresh (removed ones excluded)."""
+        return set(self.added) | set(self.status_changed) | set(self.updated)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.status_changed or self.updated)
+
+    def feed_entry(self) -> dict:
+        return {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "added": self.added,
+            "removed": self.removed,
+            "status_changed": {pid: list(change) for pid, change in self.status_changed.items()},
+            "updated": self.updated,
+        }
 
 
 class ListingStatusDownloader:
-    def __init__(self, api_key: str, listing_statuses_url: str, output_folder: str):
+    """Syncs ``listing_statuses.json`` and appends what changed to ``listing_changes.jsonl``.
+
+    Pages are fetched concurrently once the first page reports the total. The
+    snapshot is only rewritten when something changed, and a failed page
+    leaves the previous snapshot in place, so a partial fetch never shows up as
+    removed listings.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        listing_statuses_url: str,
+        output_folder: str,
+        client: Optional[HttpClient] = None,
+        page_size: int = 50,
+        max_workers: int = 4,
+    ):
         self.api_key = api_key
         self.url = listing_statuses_url
         self.output_folder = output_folder
+        self.page_size = page_size
+        self.max_workers = max(1, max_workers)
+        self.client = client or HttpClient({"accept": "application/json", "X-Authorization": api_key}, pool_size=self.max_workers)
+        self.snapshot_path = os.path.join(self.output_folder, 'listing_statuses.json')
+        self.feed_path = os.path.join(self.output_folder, 'listing_changes.jsonl')
+        self.changes: Optional[ListingChanges] = None
+        self._items_fetched: Optional[List[dict]] = None
         os.makedirs(self.output_folder, exist_ok=True)
 
-    def download(self) -> None:
-        logger.info(f"Fetching listing statuses from {self.url}")
-        all_items = []
+    def _get_page(self, url: str) -> Optional[dict | list]:
+        try:
+            resp = self.client.get(url, timeout=15)
+        except Exception as e:  # pragma: no cover
+            logger.error(f"Request error fetching listing statuses: {e}")
+            return None
+        if resp.status_code != 200:
+            logger.warning(f"Non-200 from listing statuses endpoint: {resp.status_code}")
+            return None
+        return resp.json() if resp.content else {}
+
+    @staticmethod
+    def _items(data) -> list:
+        if isinstance(data, dict):
+            return data.get('content') or []
+        return data if isinstance(data, list) else []
+
+    def fetch_all(self) -> Optional[List[dict]]:
+        """Every listing status, or None when any page failed."""
         url = self.url
-        headers = {"accept": "application/json", "X-Authorization": self.api_key}
-        while url:
-            try:
-                r = requests.get(url, headers=headers, timeout=15)
-            except Exception as e:  # pragma: no cover
-                logger.error(f"Request error fetching listing statuses: {e}")
-                break
-            if r.status_code != 200:
-                logger.warning(f"Non-200 from listing statuses endpoint: {r.status_code}")
-                break
-            data = r.json() if r.content else {}
-            items = data.get('content', []) if isinstance(data, dict) else (data if isinstance(data, list) else [])
-            all_items.extend(items)
-            url = data.get('pagination', {}).get('next_page') if isinstance(data, dict) else None
-        out = os.path.join(self.output_folder, 'listing_statuses.json')
+        if self.page_size and 'limit=' not in (urlsplit(url).query or ''):
+            url = _with_query(url, limit=self.page_size)
+        data = self._get_page(url)
+        if data is None:
+            return None
+        items = list(self._items(data))
+        pages = PropertyJsonDownloader._remaining_pages(data) if isinstance(data, dict) else []
+        if pages is None:
+            # no total to plan with: follow next_page one page at a time
+            url = data.get('pagination', {}).get('next_page')
+            while url:
+                data = self._get_page(url)
+                if data is None:
+                    return None
+                items.extend(self._items(data))
+                url = data.get('pagination', {}).get('next_page') if isinstance(data, dict) else None
+        elif pages:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+                # map keeps page order
+                for data in ex.map(self._get_page, pages):
+                    if data is None:
+                        return None
+                    items.extend(self._items(data))
+        return items
+
+    def _load_snapshot(self) -> Optional[Dict[str, dict]]:
         try:
-            with open(out, 'w', encoding='utf-8') as f:
-                json.dump(all_items, f, ensure_ascii=False, indent=2)
-            logger.info(f"Saved listing statuses to {out}")
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # pragma: no cover
+            logger.warning(f"Ignoring unreadable {self.snapshot_path}: {e}")
+            return None
+        return {it['public_id']: it for it in items if isinstance(it, dict) and it.get('public_id')}
+
+    @staticmethod
+    def diff(previous: Optional[Dict[str, dict]], current: Dict[str, dict]) -> ListingChanges:
+        if previous is None:
+            return ListingChanges(added=sorted(current), first_sync=True)
+        changes = ListingChanges(
+            added=sorted(current.keys() - previous.keys()),
+            removed=sorted(previous.keys() - current.keys()),
+        )
+        for pid in sorted(current.keys() & previous.keys()):
+            old, new = previous[pid], current[pid]
+            if old.get('status') != new.get('status'):
+                changes.status_changed[pid] = (old.get('status'), new.get('status'))
+            elif old.get('updated_at') != new.get('updated_at'):
+                changes.updated.append(pid)
+        return changes
+
+    def download(self, save: bool = True) -> Optional[ListingChanges]:
+        """Fetch and diff against the snapshot; ``save=False`` leaves promoting it to ``save()``."""
+        logger.info(f"Fetching listing statuses from {self.url}")
+        items = self.fetch_all()
+        if items is None:
+            logger.error("Listing status sync incomplete; keeping the previous snapshot")
+            return None
+        current = {it['public_id']: it for it in items if isinstance(it, dict) and it.get('public_id')}
+        changes = self.diff(self._load_snapshot(), current)
+        self.changes = changes
+        self._items_fetched = items
+        logger.info(
+            f"Listing statuses -> total: {len(current)}, added: {len(changes.added)}, removed: {len(changes.removed)}, "
+            f"status changed: {len(changes.status_changed)}, updated: {len(changes.updated)}"
+        )
+        if save:
+            self.save()
+        return changes
+
+    def save(self) -> None:
+        """Write the snapshot fetched by ``download()`` and append its changes to the feed."""
+        changes, items = self.changes, self._items_fetched
+        if not changes or items is None:
+            return
+        try:
+            tmp = f"{self.snapshot_path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(items, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.snapshot_path)
+            with open(self.feed_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(changes.feed_entry(), ensure_ascii=False) + '\n')
+            logger.info(f"Saved listing statuses to {self.snapshot_path}")
         except Exception as e:  # pragma: no cover
             logger.error(f"Failed saving listing statuses: {e}")
+        self._items_fetched = None
 
 
 def _normalize_easybrokers_excel(root_dir: str) -> None:
-    excel_dirs = [paths.DATA_DIR]  # keeping normalization simple; artifacts location
+    excel_dirs = [root_dir]
     for d in excel_dirs:
         if not os.path.isdir(d):
             continue
@@ -305,38 +640,7 @@ def _normalize_easybrokers_excel(root_dir: str) -> None:
 
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description='EasyBroker export pipeline')
-    parser.add_argument('--only-if-stale', action='store_true', help='Update JSON only if the remote record is newer than local JSON')
-    parser.add_argument('--max-workers', type=int, default=10, help='Max worker threads for downloads')
-    args = parser.parse_args()
-
-    cfg_path = paths.PROJECT_ROOT / 'config.json'
-    if not cfg_path.exists():
-        logger.error('config.json not found (expected at project root)')
-        raise SystemExit(1)
-    with open(cfg_path, 'r', encoding='utf-8') as cf:
-        cfg = json.load(cf)
-
-    api_key = cfg.get('EASYBROKER_API_KEY')
-    endpoints = cfg.get('ENDPOINTS', {})
-    base_json_folder = str(paths.DATA_DIR)
-    images_folder = str(paths.IMAGES_DIR)
-
-    if not api_key or not isinstance(endpoints, dict) or not endpoints.get('properties') or not endpoints.get('listing_statuses'):
-        logger.error('Required config keys missing: EASYBROKER_API_KEY, ENDPOINTS.properties, ENDPOINTS.listing_statuses')
-        raise SystemExit(1)
-
-    pj = PropertyJsonDownloader(api_key, endpoints['properties'], base_json_folder, max_workers=args.max_workers, only_if_stale=args.only_if_stale)
-    pj.download_all()
-
-    pi = PropertyImageDownloader(base_json_folder, images_folder, max_workers=args.max_workers)
-    pi.download_all()
-
-    ls = ListingStatusDownloader(api_key, endpoints['listing_statuses'], os.path.join(base_json_folder, 'listing'))
-    ls.download()
-
-    _normalize_easybrokers_excel(str(paths.DATA_DIR))
-    js = pj.stats
-    is_ = pi.stats
-    logger.info(f"JSON -> saved: {js['saved']}, updated: {js['updated']}, skipped: {js['skipped']}, errors: {js['errors']}")
-    logger.info(f"Images -> downloaded: {is_['downloaded']}, skipped: {is_['skipped']}, errors: {is_['errors']}")
+    # the CLI lives in pipeline.py; kept so `python -m real_estate.easybroker_list` still works
+    from .pipeline import main
+
+    raise SystemExit(main())
@@ -0,0 +1,383 @@
+"""Columnar merge and streaming writer for the EasyBroker / Wiggot workbooks.
+
+The EasyBroker export is read with openpyxl's read-only mode into ``Frame``
+objects (one list per column, rows indexed by a key column) and the styled
+result is written in one pass with a write-only workbook, so formatting it
+never keeps a full openpyxl cell tree in memory.
+
+The Wiggot workbook is maintained by hand (formulas, formatting, extra tabs),
+so ``upsert_into_wiggot`` edits it in place with a regular ``load_workbook``
+instead of rewriting it from values.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter, quote_sheetname
+from openpyxl.worksheet.hyperlink import Hyperlink
+
+logger = logging.getLogger("easybroker")
+
+HEADER_FILL = "003366"
+BAND_FILL = "F2F2F2"
+MAX_COL_WIDTH = 150
+
+
+class Frame:
+    """Column-oriented table: ``headers`` plus one list per column, indexed by a key column."""
+
+    def __init__(self, headers: Sequence, columns: Optional[List[list]] = None, key: Optional[str] = None):
+        self.headers = list(headers)
+        self.columns = columns if columns is not None else [[] for _ in self.headers]
+        # None means "first column", which is what the old positional upsert keyed on
+        self.key = key if key is not None else (self.headers[0] if self.headers else None)
+        self._index: Optional[Dict[object, int]] = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence], key: Optional[str] = None) -> "Frame":
+        """Build from an iterable whose first row holds the headers."""
+        it = iter(rows)
+        headers = list(next(it, ()))
+        while headers and headers[-1] is None:
+            headers.pop()
+        width = len(headers)
+        columns: List[list] = [[] for _ in range(width)]
+        for row in it:
+            if not any(v is not None for v in row):
+                continue
+            if len(row) > width and any(v is not None for v in row[width:]):
+                # data beyond the last header gets unnamed columns
+                filled = len(columns[0]) if columns else 0
+                for _ in range(width, len(row)):
+                    headers.append(None)
+                    columns.append([None] * filled)
+                width = len(row)
+            for i in range(width):
+                columns[i].append(row[i] if i < len(row) else None)
+        return cls(headers, columns, key)
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def position(self, name: str) -> int:
+        """Index of the first column called ``name`` (ValueError when missing)."""
+        return self.headers.index(name)
+
+    def column(self, name: str) -> list:
+        return self.columns[self.position(name)]
+
+    def add_column(self, name: str) -> list:
+        col = [None] * len(self)
+        self.headers.append(name)
+        self.columns.append(col)
+        return col
+
+    def drop(self, name: str) -> bool:
+        if name not in self.headers:
+            return False
+        pos = self.position(name)
+        del self.headers[pos]
+        del self.columns[pos]
+        self._index = None
+        return True
+
+    def rows(self) -> Iterator[tuple]:
+        return zip(*self.columns)
+
+    def index(self) -> Dict[object, int]:
+        if self._index is None:
+            keys = self.column(self.key)
+            self._index = {k: i for i, k in enumerate(keys) if k is not None}
+        return self._index
+
+    def upsert(self, other: "Frame") -> Dict[str, int]:
+        """Merge ``other`` into this frame by key, matching columns by header.
+
+        Rows whose key is new are appended; existing rows take every non-empty
+        value from ``other``. Columns only ``other`` has are added. ``other``'s
+        key column is matched to this frame's key column even when the headers
+        differ.
+        """
+        stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+        index = self.index()
+        other_key = other.position(other.key)
+        targets = []
+        for pos, name in enumerate(other.headers):
+            if pos == other_key:
+                targets.append(self.columns[self.position(self.key)])
+            elif name is None:
+                targets.append(None)  # unnamed columns cannot be aligned
+            elif name in self.headers:
+                targets.append(self.columns[self.position(name)])
+            else:
+                targets.append(self.add_column(name))
+        for row in other.rows():
+            key = row[other_key]
+            if key is None:
+                continue
+            at = index.get(key)
+            inserted = at is None
+            if inserted:
+                at = index[key] = len(self)
+                for col in self.columns:
+                    col.append(None)
+            changed = False
+            for col, value in zip(targets, row):
+                if col is not None and value is not None and col[at] != value:
+                    col[at] = value
+                    changed = True
+            if inserted:
+                stats["inserted"] += 1
+            elif changed:
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+        return stats
+
+
+def read_workbook(path: str, keys: Optional[Mapping[str, str]] = None) -> Dict[str, Frame]:
+    """Every sheet of ``path`` as a Frame, in workbook order (read-only, values only)."""
+    keys = keys or {}
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return {ws.title: Frame.from_rows(ws.iter_rows(values_only=True), keys.get(ws.title)) for ws in wb.worksheets}
+    finally:
+        wb.close()
+
+
+@dataclass
+class SheetLayout:
+    frame: Frame
+    # values of this column are external URLs
+    url_column: Optional[str] = None
+    # values of this column that name another sheet link to it
+    sheet_link_column: Optional[str] = None
+    # a header cell reading "Back to <sheet>" links to that sheet
+    back_to: Optional[str] = None
+    autofilter: bool = True
+
+
+def _styles() -> List[NamedStyle]:
+    thin = Side(style="thin", color="BFBFBF")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    header = NamedStyle(
+        name="eb_header",
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill("solid", fgColor=HEADER_FILL),
+        alignment=Alignment(horizontal="center", vertical="center"),
+        border=border,
+    )
+    body = NamedStyle(name="eb_body", alignment=Alignment(vertical="center"), border=border)
+    band = NamedStyle(
+        name="eb_band", fill=PatternFill("solid", fgColor=BAND_FILL), alignment=Alignment(vertical="center"), border=border
+    )
+    link = NamedStyle(
+        name="eb_link", font=Font(color="0000FF", underline="single"), alignment=Alignment(vertical="center"), border=border
+    )
+    link_band = NamedStyle(
+        name="eb_link_band",
+        font=Font(color="0000FF", underline="single"),
+        fill=PatternFill("solid", fgColor=BAND_FILL),
+        alignment=Alignment(vertical="center"),
+        border=border,
+    )
+    return [header, body, band, link, link_band]
+
+
+def _widths(frame: Frame) -> Iterator[Tuple[int, float]]:
+    for pos, (name, col) in enumerate(zip(frame.headers, frame.columns), start=1):
+        longest = max((len(str(v)) for v in col if v is not None), default=0)
+        longest = max(longest, len(str(name)) if name is not None else 0)
+        if longest:
+            yield pos, min(MAX_COL_WIDTH, longest + 2)
+
+
+def write_workbook(path: str, sheets: Mapping[str, SheetLayout]) -> None:
+    """Write ``sheets`` (title -> layout) in one streaming pass with the house style."""
+    wb = Workbook(write_only=True)
+    for style in _styles():
+        wb.add_named_style(style)
+    titles = set(sheets)
+    for title, layout in sheets.items():
+        frame = layout.frame
+        ws = wb.create_sheet(title)
+        # sheet properties must be set before the first row is streamed
+        for pos, width in _widths(frame):
+            ws.column_dimensions[get_column_letter(pos)].width = width
+        if frame.headers:
+            ws.freeze_panes = "A2"
+            if layout.autofilter:
+                ws.auto_filter.ref = f"A1:{get_column_letter(len(frame.headers))}{len(frame) + 1}"
+        url_pos = frame.position(layout.url_column) if layout.url_column in frame.headers else None
+        link_pos = frame.position(layout.sheet_link_column) if layout.sheet_link_column in frame.headers else None
+
+        header = []
+        for name in frame.headers:
+            cell = WriteOnlyCell(ws, value=name)
+            cell.style = "eb_header"
+            if layout.back_to and name == f"Back to {layout.back_to}":
+                cell.hyperlink = Hyperlink(ref="", location=f"{quote_sheetname(layout.back_to)}!A1", display=name)
+            header.append(cell)
+        ws.append(header)
+
+        for n, row in enumerate(frame.rows()):
+            banded = n % 2 == 0
+            plain = "eb_band" if banded else "eb_body"
+            linked = "eb_link_band" if banded else "eb_link"
+            cells = []
+            for pos, value in enumerate(row):
+                cell = WriteOnlyCell(ws, value=value)
+                if pos == url_pos and isinstance(value, str) and value:
+                    cell.hyperlink = value
+                    cell.style = linked
+                elif pos == link_pos and value in titles:
+                    cell.hyperlink = Hyperlink(ref="", location=f"{quote_sheetname(str(value))}!A1", display=str(value))
+                    cell.style = linked
+                else:
+                    date_format = cell.number_format
+                    cell.style = plain
+                    if cell.is_date:
+                        # the named style resets number_format to General (dates would read back as serials)
+                        cell.number_format = date_format
+                cells.append(cell)
+            ws.append(cells)
+    tmp = f"{path}.tmp"
+    wb.save(tmp)
+    os.replace(tmp, path)
+
+
+def format_easybrokers_workbook(
+    src: str,
+    dst: Optional[str] = None,
+    *,
+    public_urls: Mapping[str, str],
+    properties_tab: str = "Properties",
+    key: str = "public_id",
+    url_column: str = "title_image_full",
+    drop_columns: Sequence[str] = ("title_image_thumb",),
+    drop_tabs: Sequence[str] = ("Property Types",),
+) -> None:
+    """Restyle an EasyBroker export, replacing ``url_column`` with each listing's public URL.
+
+    ``public_urls`` maps public_id -> public_url (``ListingManifest.public_urls()``).
+    Per-listing tabs keep their "Back to Properties" link and the Properties
+    tab links every public_id to its tab.
+    """
+    frames = read_workbook(src, {properties_tab: key})
+    for tab in drop_tabs:
+        if tab in frames and len(frames) > 1:
+            del frames[tab]
+    sheets: Dict[str, SheetLayout] = {}
+    for title, frame in frames.items():
+        if title == properties_tab:
+            for name in drop_columns:
+                frame.drop(name)
+            if url_column in frame.headers and key in frame.headers:
+                ids = frame.column(key)
+                frame.columns[frame.position(url_column)] = [public_urls.get(pid) or '' for pid in ids]
+            sheets[title] = SheetLayout(frame, url_column=url_column, sheet_link_column=key)
+        else:
+            sheets[title] = SheetLayout(frame, back_to=properties_tab if f"Back to {properties_tab}" in frame.headers else None)
+    write_workbook(dst or src, sheets)
+
+
+def upsert_into_wiggot(
+    wiggot_path: str,
+    easybrokers_path: str,
+    *,
+    source_tab: Optional[str] = None,
+    target_tab: Optional[str] = None,
+    source_key: Optional[str] = None,
+    target_key: Optional[str] = None,
+) -> Dict[str, int]:
+    """Upsert the EasyBroker listings into the Wiggot workbook, keyed by property id.
+
+    Tabs default to the first sheet of each workbook and keys to their first
+    column, like the old positional version; columns are matched by header.
+    The Wiggot workbook is edited in place: new listings are appended, existing
+    rows take every non-empty source value except over formula cells, and
+    columns only the source has are added. Formulas, formatting and the other
+    tabs are kept as they are.
+    """
+    source = read_workbook(easybrokers_path)
+    source_frame = source[source_tab or next(iter(source))]
+    if source_key:
+        source_frame.key = source_key
+    wb = load_workbook(wiggot_path)
+    ws = wb[target_tab] if target_tab else wb.worksheets[0]
+    headers = [c.value for c in next(ws.iter_rows(min_row=1, max_row=1), ())]
+    while headers and headers[-1] is None:
+        headers.pop()
+    if not headers:
+        headers = list(source_frame.headers)
+        for col, name in enumerate(headers, start=1):
+            ws.cell(row=1, column=col, value=name)
+    key_col = headers.index(target_key) + 1 if target_key else 1
+    index: Dict[object, int] = {}
+    for row_no, (key,) in enumerate(ws.iter_rows(min_row=2, min_col=key_col, max_col=key_col, values_only=True), start=2):
+        if key is not None:
+            index.setdefault(key, row_no)
+
+    other_key = source_frame.position(source_frame.key)
+    targets: List[Optional[int]] = []
+    for pos, name in enumerate(source_frame.headers):
+        if pos == other_key:
+            targets.append(key_col)
+        elif name is None:
+            targets.append(None)  # unnamed columns cannot be aligned
+        elif name in headers:
+            targets.append(headers.index(name) + 1)
+        else:
+            headers.append(name)
+            ws.cell(row=1, column=len(headers), value=name)
+            targets.append(len(headers))
+
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    next_row = ws.max_row + 1
+    for row in source_frame.rows():
+        key = row[other_key]
+        if key is None:
+            continue
+        at = index.get(key)
+        inserted = at is None
+        if inserted:
+            at = index[key] = next_row
+            next_row += 1
+        changed = False
+        for col, value in zip(targets, row):
+            if col is None or value is None:
+                continue
+            cell = ws.cell(row=at, column=col)
+            if cell.data_type == "f" or cell.value == value:
+                continue
+            cell.value = value
+            changed = True
+        if inserted:
+            stats["inserted"] += 1
+        elif changed:
+            stats["updated"] += 1
+        else:
+            stats["unchanged"] += 1
+    tmp = f"{wiggot_path}.tmp"
+    wb.save(tmp)
+    os.replace(tmp, wiggot_path)
+    logger.info(
+        f"Wiggot upsert -> inserted: {stats['inserted']}, updated: {stats['updated']}, unchanged: {stats['unchanged']}"
+    )
+    return stats
+
+
+__all__ = [
+    "Frame",
+    "SheetLayout",
+    "format_easybrokers_workbook",
+    "read_workbook",
+    "upsert_into_wiggot",
+    "write_workbook",
+]
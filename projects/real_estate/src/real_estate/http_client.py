@@ -0,0 +1,138 @@
+"""Shared HTTP client for the EasyBroker API.
+
+One ``requests.Session`` with a sized connection pool is reused by every worker
+thread, so a catalogue refresh keeps a handful of keep-alive connections open
+instead of doing a TLS handshake per request. ``HttpClient.get`` retries
+connection errors, 429 and 5xx responses with jittered exponential backoff
+(honouring ``Retry-After``), and every attempt first takes a token from a
+``RateLimiter`` shared by all threads, so the run stays inside the API quota.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("easybroker")
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """Token bucket shared across threads (``rate`` tokens per second)."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+                    self._stamp = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    wait = self._paused_until - now
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for ``seconds`` (the server said we are over quota)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._stamp = self._paused_until
+
+
+class HttpClient:
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        *,
+        rate_limit: float = 20.0,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        pool_size: int = 20,
+        timeout: float = 20,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate_limit)
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    def _delay(self, attempt: int, resp: Optional[requests.Response]) -> float:
+        if resp is not None:
+            retry_after = resp.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(self.max_backoff, float(retry_after))
+                except ValueError:
+                    pass
+        # full jitter: spreads the retries of many threads over the window
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET with rate limiting and retries; raises the last error when every attempt failed."""
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            resp: Optional[requests.Response] = None
+            error: Optional[Exception] = None
+            try:
+                resp = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            with self._lock:
+                self.stats["requests"] += 1
+            if error is None and resp.status_code not in RETRY_STATUSES:
+                return resp
+            if attempt >= self.max_retries:
+                with self._lock:
+                    self.stats["failures"] += 1
+                if error is not None:
+                    raise error
+                return resp
+            delay = self._delay(attempt, resp)
+            if resp is not None and resp.status_code == 429:
+                self.limiter.pause(delay)
+            logger.warning(
+                f"Retrying {url} in {delay:.1f}s ({resp.status_code if resp is not None else error})"
+            )
+            if resp is not None:
+                resp.close()
+            with self._lock:
+                self.stats["retries"] += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self.session.close()
+
+
+__all__ = ["HttpClient", "RateLimiter", "RETRY_STATUSES"]
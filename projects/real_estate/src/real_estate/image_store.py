@@ -0,0 +1,233 @@
+"""Content-addressed storage for listing photos.
+
+Every downloaded image is stored once under ``<images>/_objects/ab/<sha256><ext>``
+and each listing folder gets a hard link to it (a copy where links are not
+supported). So the same photo used by several listings, or served under
+several URLs, takes disk space and bandwidth once.
+
+``_objects/index.sqlite3`` maps each URL to its object together with the
+``ETag``/``Last-Modified`` the server sent, so a refresh can revalidate with a
+conditional GET and skip unchanged photos on a 304. Interrupted transfers stay
+in ``_objects/tmp/*.part`` next to a ``*.meta`` holding the validators of the
+response that started them; they resume with a ``Range`` + ``If-Range``
+request, and the part is thrown away whenever the server cannot prove it is
+still the same body.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from .http_client import HttpClient
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    size INTEGER
+);
+"""
+_CHUNK = 64 * 1024
+_NET_CHUNK = 8192
+
+
+def _content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """``(first byte, total length)`` of a ``Content-Range`` header; None where unknown."""
+    if not value or not value.startswith("bytes "):
+        return None, None
+    span, _, total = value[6:].partition("/")
+    first = span.split("-", 1)[0]
+    return (int(first) if first.isdigit() else None), (int(total) if total.isdigit() else None)
+
+
+def url_ext(url: str) -> str:
+    base = url.split('?')[0]
+    return os.path.splitext(base)[1] or '.jpg'
+
+
+class ImageStore:
+    def __init__(self, images_folder: Path | str, resume_attempts: int = 3):
+        self.root = Path(images_folder) / "_objects"
+        self.tmp = self.root / "tmp"
+        self.tmp.mkdir(parents=True, exist_ok=True)
+        self.resume_attempts = resume_attempts
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self._checked: set = set()
+        self._db = sqlite3.connect(str(self.root / "index.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def object_path(self, sha: str, ext: str) -> Path:
+        return self.root / sha[:2] / f"{sha}{ext}"
+
+    def lookup(self, url: str) -> Optional[Tuple[str, str, Optional[str], Optional[str]]]:
+        """``(sha256, ext, etag, last_modified)`` of a URL fetched before."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT sha256, ext, etag, last_modified FROM urls WHERE url=?", (url,)
+            ).fetchone()
+        if row and self.object_path(row[0], row[1]).exists():
+            return row
+        return None
+
+    def _url_lock(self, url: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def fetch(self, client: HttpClient, url: str, revalidate: bool = False) -> Tuple[str, Path]:
+        """Make sure ``url`` is in the store; returns ``(outcome, object path)``.
+
+        ``outcome`` is ``cached`` (known, not revalidated), ``not_modified``
+        (304), ``deduped`` (downloaded, same bytes already stored) or
+        ``downloaded``. Raises on HTTP or network errors.
+        """
+        # one transfer per URL even when several listings share it
+        with self._url_lock(url):
+            known = self.lookup(url)
+            if known and (not revalidate or url in self._checked):
+                return "cached", self.object_path(known[0], known[1])
+            headers = {}
+            if known:
+                if known[2]:
+                    headers["If-None-Match"] = known[2]
+                if known[3]:
+                    headers["If-Modified-Since"] = known[3]
+            part = self.tmp / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".part")
+            for attempt in range(self.resume_attempts + 1):
+                try:
+                    resp, etag, last_modified = self._download(client, url, headers, part)
+                    break
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                    if attempt >= self.resume_attempts:
+                        raise
+            with self._lock:
+                self._checked.add(url)
+            if resp.status_code == 304 and known:
+                self._discard(part)
+                return "not_modified", self.object_path(known[0], known[1])
+            sha = hashlib.sha256()
+            with open(part, "rb") as fh:
+                for chunk in iter(lambda: fh.read(_CHUNK), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            ext = url_ext(url)
+            obj = self.object_path(digest, ext)
+            outcome = "deduped" if obj.exists() else "downloaded"
+            size = part.stat().st_size
+            if outcome == "downloaded":
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(part, obj)
+            else:
+                part.unlink()
+            self._discard(part)
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO urls (url, sha256, ext, etag, last_modified, size) VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, digest, ext, etag, last_modified, size),
+                )
+            return outcome, obj
+
+    @staticmethod
+    def _meta_path(part: Path) -> Path:
+        return part.with_suffix(".meta")
+
+    def _read_meta(self, part: Path) -> Dict[str, Optional[str]]:
+        try:
+            return json.loads(self._meta_path(part).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _discard(self, part: Path) -> None:
+        for path in (part, self._meta_path(part)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _download(
+        self, client: HttpClient, url: str, headers: Dict[str, str], part: Path
+    ) -> Tuple[requests.Response, Optional[str], Optional[str]]:
+        """Fetch ``url`` into ``part``; returns the response and the body's ``(ETag, Last-Modified)``."""
+        have = part.stat().st_size if part.exists() else 0
+        meta = self._read_meta(part) if have else {}
+        etag, last_modified = meta.get("etag"), meta.get("last_modified")
+        # If-Range needs a strong validator; without one the part cannot be trusted
+        validator = etag if etag and not etag.startswith("W/") else last_modified
+        if have and not validator:
+            self._discard(part)
+            have = 0
+        req_headers = dict(headers)
+        if have:
+            req_headers["Range"] = f"bytes={have}-"
+            req_headers["If-Range"] = validator
+        resp = client.get(url, headers=req_headers, stream=True)
+        with resp:
+            if resp.status_code == 304:
+                return resp, etag, last_modified
+            first, total = _content_range(resp.headers.get("Content-Range"))
+            if have and (
+                (resp.status_code == 206 and first != have)
+                or (resp.status_code == 416 and total != have)
+            ):
+                # the range does not continue the bytes we hold: start over
+                self._discard(part)
+                return self._download(client, url, headers, part)
+            if resp.status_code == 416 and have:
+                return resp, etag, last_modified  # the part file already holds the whole body
+            if resp.status_code == 206 and have:
+                mode = "ab"
+            elif resp.status_code == 200:
+                mode = "wb"  # new body (or the validator no longer matches): start over
+                etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+                self._meta_path(part).write_text(
+                    json.dumps({"etag": etag, "last_modified": last_modified}), encoding="utf-8"
+                )
+            else:
+                resp.raise_for_status()
+                raise requests.HTTPError(f"unexpected status {resp.status_code}", response=resp)
+            with open(part, mode) as fh:
+                for chunk in resp.iter_content(_NET_CHUNK):
+                    if chunk:
+                        fh.write(chunk)
+        return resp, etag, last_modified
+
+    @staticmethod
+    def link(obj: Path, dest: Path | str) -> None:
+        """Point ``dest`` at ``obj`` (hard link, copy as fallback)."""
+        dest = Path(dest)
+        if dest.exists():
+            try:
+                if dest.samefile(obj):
+                    return
+            except OSError:
+                pass
+            dest.unlink()
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(obj, dest)
+        except OSError:
+            shutil.copy2(obj, dest)
+
+    def commit(self) -> None:
+        with self._lock:
+            self._db.commit()
+
+    def close(self) -> None:
+        self.commit()
+        self._db.close()
+
+
+__all__ = ["ImageStore", "url_ext"]
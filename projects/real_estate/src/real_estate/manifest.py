@@ -0,0 +1,126 @@
+"""Listing manifest: one SQLite row per saved property JSON.
+
+``PropertyJsonDownloader`` records ``public_id -> updated_at, content hash,
+public_url, image URLs`` as it saves each file, so ``--only-if-stale`` compares
+timestamps without opening the JSON, and later steps (images, Excel) read URLs
+from here instead of re-parsing every file. A listing missing from the
+manifest (files saved before it existed) falls back to reading its JSON once.
+The ``derivatives`` table holds the size of each resized photo variant.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    public_id TEXT PRIMARY KEY,
+    updated_at TEXT,
+    content_hash TEXT,
+    public_url TEXT,
+    image_urls TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS derivatives (
+    public_id TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    path TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    bytes INTEGER,
+    PRIMARY KEY (public_id, slot, spec)
+);
+"""
+
+
+def content_hash(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ListingManifest:
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def get(self, public_id: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """``(updated_at, content_hash)`` or None when the listing is unknown."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT updated_at, content_hash FROM listings WHERE public_id=?", (public_id,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def record(
+        self,
+        public_id: str,
+        *,
+        updated_at: Optional[str],
+        digest: Optional[str],
+        public_url: Optional[str],
+        image_urls: List[str],
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO listings (public_id, updated_at, content_hash, public_url, image_urls)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (public_id, updated_at, digest, public_url, json.dumps(image_urls, ensure_ascii=False)),
+            )
+
+    def record_derivatives(self, rows: List[tuple]) -> None:
+        """Store ``(public_id, slot, spec, source_hash, path, width, height, bytes)`` rows."""
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO derivatives (public_id, slot, spec, source_hash, path, width, height, bytes)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def recorded_derivatives(self) -> Set[Tuple[str, str, str, str]]:
+        """``(public_id, slot, spec, source_hash)`` of every variant already recorded."""
+        with self._lock:
+            return set(self._db.execute("SELECT public_id, slot, spec, source_hash FROM derivatives"))
+
+    def derivatives(self, public_id: str) -> List[Tuple[str, str, str, Optional[int], Optional[int], Optional[int]]]:
+        """``(slot, spec, path, width, height, bytes)`` of a listing's photo variants."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT slot, spec, path, width, height, bytes FROM derivatives WHERE public_id=? ORDER BY slot, spec",
+                (public_id,),
+            ).fetchall()
+
+    def public_urls(self) -> Dict[str, str]:
+        with self._lock:
+            rows = self._db.execute("SELECT public_id, public_url FROM listings WHERE public_url IS NOT NULL").fetchall()
+        return {pid: url for pid, url in rows}
+
+    def image_urls(self) -> Iterator[Tuple[str, List[str]]]:
+        with self._lock:
+            rows = self._db.execute("SELECT public_id, image_urls FROM listings ORDER BY public_id").fetchall()
+        for pid, urls in rows:
+            yield pid, json.loads(urls or "[]")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM listings").fetchone()[0])
+
+    def commit(self) -> None:
+        with self._lock:
+            self._db.commit()
+
+    def close(self) -> None:
+        self.commit()
+        self._db.close()
+
+
+__all__ = ["ListingManifest", "content_hash"]
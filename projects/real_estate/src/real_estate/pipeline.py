@@ -0,0 +1,403 @@
+"""Staged EasyBroker export pipeline.
+
+``Pipeline`` runs ``statuses -> json -> images -> derivatives -> excel ->
+upsert`` (derivatives only when asked for) on top of the downloader classes in
+``easybroker_list``. Statuses go first: with ``changed_only`` their change feed
+limits the JSON and image stages to listings that were added or changed.
+Changed ids stay pending per stage in the state file until that stage finishes
+without errors, so a failed or interrupted run refetches them next time even
+though the status snapshot already moved on.
+
+After a stage finishes without errors, the fingerprint of its inputs
+(manifest contents, workbook size and mtime) is stored in
+``<data>/pipeline_state.json``. A later run skips the stage while the
+fingerprint is unchanged. Stages that read the remote API have no fingerprint
+and always run; their downloaders are incremental themselves.
+
+Every stage is timed. The timings are logged at the end of the run and kept in
+the state file. Heavy modules (openpyxl, Pillow) are imported only by the
+stages that need them.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from . import paths
+from .easybroker_list import (
+    ListingChanges,
+    ListingStatusDownloader,
+    PropertyImageDownloader,
+    PropertyJsonDownloader,
+    _normalize_easybrokers_excel,
+)
+from .http_client import HttpClient
+from .manifest import ListingManifest
+
+logger = logging.getLogger("easybroker")
+
+STAGES = ("statuses", "json", "images", "derivatives", "excel", "upsert")
+DEFAULT_STAGES = ("statuses", "json", "images", "excel", "upsert")
+# stages that consume the statuses change feed
+CHANGE_CONSUMERS = ("json", "images")
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # ran | skipped | failed
+    seconds: float = 0.0
+    detail: str = ""
+
+
+def parse_stages(value: str) -> List[str]:
+    """``"json,images"`` -> ordered stage list; ``all`` selects every stage."""
+    names = [v.strip() for v in value.split(",") if v.strip()]
+    if names == ["all"]:
+        return list(STAGES)
+    unknown = [n for n in names if n not in STAGES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+    return [s for s in STAGES if s in names]
+
+
+def _file_signature(path: Path) -> Optional[List]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [path.name, st.st_size, st.st_mtime_ns]
+
+
+def _digest(obj) -> str:
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class Pipeline:
+    def __init__(
+        self,
+        api_key: str,
+        endpoints: Dict[str, str],
+        *,
+        data_dir: Path | str = paths.DATA_DIR,
+        images_dir: Path | str = paths.IMAGES_DIR,
+        max_workers: int = 10,
+        rate_limit: float = 20.0,
+        only_if_stale: bool = False,
+        per_host: Optional[int] = None,
+        refresh_images: bool = False,
+        derivative_workers: Optional[int] = None,
+        wiggot_path: Optional[str] = None,
+        force: bool = False,
+        changed_only: bool = False,
+        excel_dirs: Optional[Sequence[Path | str]] = None,
+    ):
+        self.api_key = api_key
+        self.endpoints = endpoints
+        self.data_dir = Path(data_dir)
+        self.images_dir = Path(images_dir)
+        # folders holding the easybrokers_*.xlsx exports (first existing workbook is the upsert source)
+        self.excel_dirs = [Path(d) for d in excel_dirs] if excel_dirs else [self.data_dir]
+        self.max_workers = max_workers
+        self.rate_limit = rate_limit
+        self.only_if_stale = only_if_stale
+        self.per_host = per_host
+        self.refresh_images = refresh_images
+        self.derivative_workers = derivative_workers
+        self.wiggot_path = Path(wiggot_path) if wiggot_path else None
+        self.force = force
+        self.changed_only = changed_only
+        self.changes: Optional[ListingChanges] = None
+        self.state_path = self.data_dir / "pipeline_state.json"
+        self.state: Dict[str, dict] = self._load_state()
+        self._client: Optional[HttpClient] = None
+        self._manifest: Optional[ListingManifest] = None
+        self._runners: Dict[str, Callable[[], Optional[dict]]] = {
+            "statuses": self._run_statuses,
+            "json": self._run_json,
+            "images": self._run_images,
+            "derivatives": self._run_derivatives,
+            "excel": self._run_excel,
+            "upsert": self._run_upsert,
+        }
+        self._fingerprints: Dict[str, Callable[[], Optional[str]]] = {
+            "images": self._fp_images,
+            "derivatives": self._fp_derivatives,
+            "excel": self._fp_excel,
+            "upsert": self._fp_upsert,
+        }
+
+    @classmethod
+    def from_config(cls, cfg_path: Path | str = paths.PROJECT_ROOT / "config.json", **kwargs) -> "Pipeline":
+        """Build from ``config.json``.
+
+        When ``BASE_JSON_FOLDER`` is set, the layout of the old project script
+        is kept: JSON under ``<project>/<BASE_JSON_FOLDER>``, images in its
+        ``images`` folder and the Excel exports in ``<project>/properties`` and
+        ``<project>/easybrokers/properties``. Otherwise everything lives under
+        ``artifacts/real_estate``. Explicit keyword arguments win.
+        """
+        with open(cfg_path, "r", encoding="utf-8") as cf:
+            cfg = json.load(cf)
+        api_key = cfg.get("EASYBROKER_API_KEY")
+        endpoints = cfg.get("ENDPOINTS", {})
+        if not api_key or not isinstance(endpoints, dict) or not endpoints.get("properties") or not endpoints.get("listing_statuses"):
+            raise ValueError("Required config keys missing: EASYBROKER_API_KEY, ENDPOINTS.properties, ENDPOINTS.listing_statuses")
+        base_json = cfg.get("BASE_JSON_FOLDER")
+        if base_json:
+            data_dir = paths.PROJECT_ROOT / base_json
+            kwargs.setdefault("data_dir", data_dir)
+            kwargs.setdefault("images_dir", data_dir / "images")
+            kwargs.setdefault("excel_dirs", [paths.PROJECT_ROOT / "properties", paths.PROJECT_ROOT / "easybrokers" / "properties"])
+        return cls(api_key, endpoints, **kwargs)
+
+    # ---------------- shared resources ----------------
+    @property
+    def client(self) -> HttpClient:
+        if self._client is None:
+            self._client = HttpClient(
+                {"accept": "application/json", "X-Authorization": self.api_key},
+                rate_limit=self.rate_limit,
+                pool_size=self.max_workers + 3,
+            )
+        return self._client
+
+    @property
+    def manifest(self) -> ListingManifest:
+        if self._manifest is None:
+            self._manifest = ListingManifest(self.data_dir / "manifest.sqlite3")
+        return self._manifest
+
+    def only_ids(self, stage: str) -> Optional[Set[str]]:
+        """Listings ``stage`` should touch; None means all of them."""
+        if not self.changed_only:
+            return None
+        pending = self.state.get("pending_changes", {}).get(stage)
+        if pending is None or pending == "all":
+            return None
+        return set(pending)
+
+    def _record_changes(self, changes: ListingChanges) -> None:
+        """Add ``changes`` to what every consumer stage still has to fetch."""
+        pending = self.state.setdefault("pending_changes", {})
+        for stage in CHANGE_CONSUMERS:
+            previous = pending.get(stage, [])
+            if changes.first_sync or previous == "all":
+                pending[stage] = "all"
+            else:
+                pending[stage] = sorted(set(previous) | changes.changed_ids)
+
+    @property
+    def workbooks(self) -> List[Path]:
+        """Existing ``easybrokers.xlsx`` files, one per Excel folder at most."""
+        return [d / "easybrokers.xlsx" for d in self.excel_dirs if (d / "easybrokers.xlsx").exists()]
+
+    @property
+    def workbook(self) -> Path:
+        found = self.workbooks
+        return found[0] if found else self.excel_dirs[0] / "easybrokers.xlsx"
+
+    # ---------------- state ----------------
+    def _load_state(self) -> Dict[str, dict]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self) -> None:
+        tmp = self.state_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    # ---------------- fingerprints (None = always run) ----------------
+    def _fp_images(self) -> Optional[str]:
+        if self.refresh_images:
+            return None
+        return _digest([str(self.images_dir), list(self.manifest.image_urls())])
+
+    def _fp_derivatives(self) -> Optional[str]:
+        from .derivatives import DEFAULT_SPECS
+
+        return _digest([str(self.images_dir), list(self.manifest.image_urls()), [s.key + s.ext for s in DEFAULT_SPECS]])
+
+    def _fp_excel(self) -> Optional[str]:
+        books = sorted(p for d in self.excel_dirs for p in d.glob("easybrokers*.xlsx"))
+        return _digest([[_file_signature(p) for p in books], self.manifest.public_urls()])
+
+    def _fp_upsert(self) -> Optional[str]:
+        if self.wiggot_path is None:
+            return None
+        return _digest([_file_signature(self.workbook), str(self.wiggot_path), _file_signature(self.wiggot_path)])
+
+    # ---------------- stages ----------------
+    def _run_json(self) -> dict:
+        pj = PropertyJsonDownloader(
+            self.api_key, self.endpoints["properties"], str(self.data_dir), max_workers=self.max_workers,
+            only_if_stale=self.only_if_stale, client=self.client, manifest=self.manifest, only_ids=self.only_ids("json"),
+        )
+        pj.download_all()
+        return pj.stats
+
+    def _run_images(self) -> dict:
+        pi = PropertyImageDownloader(
+            str(self.data_dir), str(self.images_dir), max_workers=self.max_workers, per_host=self.per_host,
+            refresh=self.refresh_images, manifest=self.manifest, only_ids=self.only_ids("images"),
+        )
+        pi.download_all()
+        return pi.stats
+
+    def _run_derivatives(self) -> dict:
+        from .derivatives import DerivativeBuilder
+
+        builder = DerivativeBuilder(self.images_dir, max_workers=self.derivative_workers, manifest=self.manifest)
+        builder.build_all()
+        return builder.stats
+
+    def _run_statuses(self) -> dict:
+        ls = ListingStatusDownloader(
+            self.api_key, self.endpoints["listing_statuses"], str(self.data_dir / "listing"), client=self.client,
+        )
+        self.changes = ls.download(save=False)
+        if self.changes is None:
+            return {"errors": 1}
+        # pending ids reach disk before the snapshot advances past them
+        self._record_changes(self.changes)
+        self._save_state()
+        ls.save()
+        c = self.changes
+        return {"added": len(c.added), "removed": len(c.removed), "status_changed": len(c.status_changed), "updated": len(c.updated)}
+
+    def _run_excel(self) -> dict:
+        from .excel_export import format_easybrokers_workbook
+
+        for d in self.excel_dirs:
+            _normalize_easybrokers_excel(str(d))
+        books = self.workbooks
+        if not books:
+            logger.warning(f"No EasyBrokers workbook in {', '.join(map(str, self.excel_dirs))}; nothing to format")
+            return {"errors": 0}
+        public_urls = self.manifest.public_urls()
+        for book in books:
+            format_easybrokers_workbook(str(book), public_urls=public_urls)
+            logger.info(f"Formatted Excel output -> {book}")
+        return {"errors": 0}
+
+    def _run_upsert(self) -> dict:
+        if self.wiggot_path is None:
+            logger.info("No --wiggot workbook given; skipping upsert")
+            return {"errors": 0}
+        if not self.workbook.exists() or not self.wiggot_path.exists():
+            logger.error(f"Upsert needs both {self.workbook} and {self.wiggot_path}")
+            return {"errors": 1}
+        from .excel_export import upsert_into_wiggot
+
+        return upsert_into_wiggot(str(self.wiggot_path), str(self.workbook))
+
+    # ---------------- driver ----------------
+    def run_stage(self, name: str) -> StageResult:
+        fp_fn = self._fingerprints.get(name)
+        previous = self.state.get(name, {})
+        if fp_fn is not None and not self.force:
+            fp = fp_fn()
+            if fp is not None and fp == previous.get("fingerprint"):
+                logger.info(f"Stage {name}: inputs unchanged, skipping")
+                return StageResult(name, "skipped", detail="inputs unchanged")
+        logger.info(f"Stage {name}: starting")
+        t0 = time.perf_counter()
+        try:
+            stats = self._runners[name]()
+        except Exception as e:
+            seconds = time.perf_counter() - t0
+            logger.exception(f"Stage {name} failed after {seconds:.2f}s: {e}")
+            self.state.setdefault(name, {}).pop("fingerprint", None)
+            return StageResult(name, "failed", seconds, str(e))
+        seconds = time.perf_counter() - t0
+        entry = {"seconds": round(seconds, 3), "finished_at": datetime.now().isoformat(timespec="seconds")}
+        errors = int((stats or {}).get("errors", 0))
+        # fingerprint after the run: stages that rewrite their own inputs (excel) must match next time
+        if fp_fn is not None and errors == 0:
+            fp = fp_fn()
+            if fp is not None:
+                entry["fingerprint"] = fp
+        self.state[name] = entry
+        if name in CHANGE_CONSUMERS and errors == 0:
+            self.state.setdefault("pending_changes", {})[name] = []
+        detail = ", ".join(f"{k}: {v}" for k, v in (stats or {}).items())
+        return StageResult(name, "ran", seconds, detail)
+
+    def run(self, stages: Iterable[str] = DEFAULT_STAGES) -> List[StageResult]:
+        results = []
+        try:
+            for name in stages:
+                results.append(self.run_stage(name))
+                self._save_state()
+        finally:
+            if self._manifest is not None:
+                self._manifest.close()
+            if self._client is not None:
+                self._client.close()
+        logger.info("--- Run summary ---")
+        for r in results:
+            logger.info(f"{r.name:<12} {r.status:<8} {r.seconds:8.2f}s  {r.detail}")
+        logger.info(f"Total {sum(r.seconds for r in results):.2f}s")
+        return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='EasyBroker export pipeline')
+    parser.add_argument('--stages', type=parse_stages, default=list(DEFAULT_STAGES),
+                        help=f"Comma-separated stages to run, in pipeline order: {', '.join(STAGES)} or 'all' "
+                             f"(default: {','.join(DEFAULT_STAGES)})")
+    parser.add_argument('--force', action='store_true', help='Run selected stages even when their inputs are unchanged')
+    parser.add_argument('--changed-only', action='store_true',
+                        help='Limit JSON and image stages to listings reported as added or changed and not yet fetched')
+    parser.add_argument('--only-if-stale', action='store_true', help='Update JSON only if the remote record is newer than local JSON')
+    parser.add_argument('--max-workers', type=int, default=10, help='Max worker threads for downloads')
+    parser.add_argument('--rate-limit', type=float, default=20.0, help='Max EasyBroker API requests per second (0 = unlimited)')
+    parser.add_argument('--per-host', type=int, default=None, help='Max concurrent image downloads per host (default: --max-workers)')
+    parser.add_argument('--refresh-images', action='store_true', help='Revalidate existing images with conditional GETs')
+    parser.add_argument('--derivatives', action='store_true', help='Also run the derivatives stage (resized WebP variants, needs Pillow)')
+    parser.add_argument('--derivative-workers', type=int, default=None, help='Processes for the derivatives stage (default: CPU count)')
+    parser.add_argument('--wiggot', default=None, help='Wiggot workbook to upsert the EasyBroker listings into')
+    args = parser.parse_args(argv)
+
+    stages = list(args.stages)
+    if args.derivatives and 'derivatives' not in stages:
+        stages = [s for s in STAGES if s in stages or s == 'derivatives']
+
+    cfg_path = paths.PROJECT_ROOT / 'config.json'
+    if not cfg_path.exists():
+        logger.error('config.json not found (expected at project root)')
+        return 1
+    try:
+        pipeline = Pipeline.from_config(
+            cfg_path,
+            max_workers=args.max_workers,
+            rate_limit=args.rate_limit,
+            only_if_stale=args.only_if_stale,
+            per_host=args.per_host,
+            refresh_images=args.refresh_images,
+            derivative_workers=args.derivative_workers,
+            wiggot_path=args.wiggot,
+            force=args.force,
+            changed_only=args.changed_only,
+        )
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    results = pipeline.run(stages)
+    return 1 if any(r.status == "failed" for r in results) else 0
+
+
+__all__ = ["DEFAULT_STAGES", "Pipeline", "STAGES", "StageResult", "main", "parse_stages"]
@@ -0,0 +1,61 @@
+import os
+import shutil
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from real_estate import derivatives
+from real_estate.derivatives import DerivativeBuilder, DerivativeSpec, file_sha256
+from real_estate.manifest import ListingManifest
+
+SPECS = (DerivativeSpec("thumb", 16), DerivativeSpec("medium", 32))
+
+
+def _photo(path, color):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", (64, 48), color).save(path, format="JPEG")
+    return path
+
+
+def _store_object(images, src):
+    sha = file_sha256(src)
+    obj = images / "_objects" / sha[:2] / f"{sha}.jpg"
+    obj.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(src), obj)
+    os.link(obj, src)
+    return sha
+
+
+def test_rerun_skips_hashing_and_recorded_variants(tmp_path, monkeypatch):
+    images = tmp_path / "images"
+    linked = _photo(images / "EB-1" / "img_1.jpg", "red")
+    sha = _store_object(images, linked)
+    _photo(images / "EB-2" / "img_1.jpg", "blue")  # a plain copy, not in the store
+    manifest = ListingManifest(tmp_path / "manifest.sqlite3")
+
+    DerivativeBuilder(images, SPECS, max_workers=1, manifest=manifest).build_all()
+    rows = manifest.derivatives("EB-1")
+    assert [(slot, spec) for slot, spec, *_ in rows] == [("img_1", "medium"), ("img_1", "thumb")]
+    assert rows[0][2] == f"_derived/{sha[:2]}/{sha}_medium-32-q80.webp"
+    assert len(manifest.derivatives("EB-2")) == 2
+
+    def no_hashing(path):
+        raise AssertionError(f"rehashed {path}")
+
+    recorded = []
+    monkeypatch.setattr(derivatives, "file_sha256", no_hashing)
+    monkeypatch.setattr(manifest, "record_derivatives", recorded.extend)
+    builder = DerivativeBuilder(images, SPECS, max_workers=1, manifest=manifest)
+    builder.build_all()
+
+    assert builder.stats == {"rendered": 0, "reused": 4, "errors": 0}
+    assert recorded == []
+
+    # a new slot sharing the photo gets its rows, nothing else is rewritten
+    (images / "EB-3").mkdir()
+    os.link(linked, images / "EB-3" / "img_1.jpg")
+    builder = DerivativeBuilder(images, SPECS, max_workers=1, manifest=manifest)
+    builder.build_all()
+    assert sorted((pid, spec) for pid, _, spec, *_ in recorded) == [("EB-3", "medium"), ("EB-3", "thumb")]
+    manifest.close()
@@ -0,0 +1,93 @@
+import json
+
+from real_estate.easybroker_list import PropertyImageDownloader
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_content(self, size):
+        yield self._body
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeCdn:
+    """One body per URL, ETag = body; answers 304 to a matching If-None-Match."""
+
+    def __init__(self, bodies):
+        self.bodies = dict(bodies)
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False):
+        headers = dict(headers or {})
+        self.requests.append((url, headers))
+        etag = '"%s"' % self.bodies[url].decode()
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304, headers={"ETag": etag})
+        return FakeResponse(200, self.bodies[url], {"ETag": etag})
+
+
+def _listing(folder, pid, urls):
+    images = [{"url": u} for u in urls]
+    (folder / f"{pid}.json").write_text(json.dumps({"public_id": pid, "property_images": images}))
+
+
+def _downloader(tmp_path, cdn, only_ids=None):
+    return PropertyImageDownloader(
+        str(tmp_path / "json"), str(tmp_path / "images"), max_workers=2, client=cdn, only_ids=only_ids
+    )
+
+
+def test_changed_only_revalidates_and_relinks_existing_slots(tmp_path):
+    (tmp_path / "json").mkdir()
+    a, b, c = "https://cdn.example.com/a.jpg", "https://cdn.example.com/b.jpg", "https://cdn.example.com/c.png"
+    cdn = FakeCdn({a: b"A1", b: b"B1", c: b"C1"})
+    _listing(tmp_path / "json", "EB-1", [a, b])
+    dl = _downloader(tmp_path, cdn)
+    dl.download_all()
+    dl.store.close()
+    folder = tmp_path / "images" / "EB-1"
+    assert (folder / "img_1.jpg").read_bytes() == b"A1"
+
+    # same URL with a new photo behind it, and the second photo replaced
+    cdn.bodies[a] = b"A2"
+    _listing(tmp_path / "json", "EB-1", [a, c])
+    cdn.requests.clear()
+    dl = _downloader(tmp_path, cdn, only_ids={"EB-1"})
+    dl.download_all()
+    dl.store.close()
+
+    assert [h.get("If-None-Match") for url, h in cdn.requests if url == a] == ['"A1"']
+    assert (folder / "img_1.jpg").read_bytes() == b"A2"
+    assert (folder / "img_2.png").read_bytes() == b"C1"
+    assert not (folder / "img_2.jpg").exists()
+
+
+def test_changed_only_leaves_other_listings_alone(tmp_path):
+    (tmp_path / "json").mkdir()
+    a, b = "https://cdn.example.com/a.jpg", "https://cdn.example.com/b.jpg"
+    cdn = FakeCdn({a: b"A1", b: b"B1"})
+    _listing(tmp_path / "json", "EB-1", [a])
+    _listing(tmp_path / "json", "EB-2", [b])
+    dl = _downloader(tmp_path, cdn)
+    dl.download_all()
+    dl.store.close()
+
+    cdn.requests.clear()
+    dl = _downloader(tmp_path, cdn, only_ids={"EB-1"})
+    dl.download_all()
+    dl.store.close()
+
+    assert [url for url, _ in cdn.requests] == [a]
+    assert dl.stats["not_modified"] == 1
@@ -0,0 +1,58 @@
+from datetime import date, datetime
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+
+from real_estate.excel_export import Frame, SheetLayout, upsert_into_wiggot, write_workbook
+
+
+def _save(path, sheets):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for title, rows in sheets.items():
+        ws = wb.create_sheet(title)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    return path
+
+
+def test_write_workbook_keeps_date_formats(tmp_path):
+    out = tmp_path / "out.xlsx"
+    frame = Frame.from_rows([("public_id", "created", "day"), ("EB-1", datetime(2024, 1, 2, 3, 4, 5), date(2024, 1, 2))])
+    write_workbook(str(out), {"Properties": SheetLayout(frame)})
+
+    ws = load_workbook(out)["Properties"]
+    assert ws["B2"].value == datetime(2024, 1, 2, 3, 4, 5)
+    assert ws["C2"].value == datetime(2024, 1, 2)
+    assert ws["B2"].is_date and ws["C2"].is_date
+    assert ws["B2"].style == "eb_band"
+
+
+def test_upsert_keeps_formulas_styles_and_other_tabs(tmp_path):
+    wiggot = _save(tmp_path / "wiggot.xlsx", {
+        "W": [("id", "price", "double"), ("EB-1", 10, "=B2*2")],
+        "Totals": [("total",), ("=SUM(W!B:B)",)],
+    })
+    wb = load_workbook(wiggot)
+    wb["Totals"]["A1"].font = Font(bold=True)
+    wb.save(wiggot)
+    source = _save(tmp_path / "easybrokers.xlsx", {
+        "Properties": [
+            ("id", "price", "double", "listed"),
+            ("EB-1", 12, 99, datetime(2024, 1, 2)),
+            ("EB-2", 20, None, datetime(2024, 2, 3)),
+        ],
+    })
+
+    stats = upsert_into_wiggot(str(wiggot), str(source))
+
+    assert stats == {"inserted": 1, "updated": 1, "unchanged": 0}
+    wb = load_workbook(wiggot)
+    ws = wb["W"]
+    assert [c.value for c in ws[1]] == ["id", "price", "double", "listed"]
+    assert [c.value for c in ws[2]] == ["EB-1", 12, "=B2*2", datetime(2024, 1, 2)]
+    assert [c.value for c in ws[3]][:2] == ["EB-2", 20]
+    assert ws["D3"].is_date
+    assert wb["Totals"]["A2"].value == "=SUM(W!B:B)"
+    assert wb["Totals"]["A1"].font.b
@@ -0,0 +1,133 @@
+import hashlib
+
+import pytest
+import requests
+
+from real_estate.image_store import ImageStore
+
+URL = "https://img.example.com/p/1.jpg"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None, cut_after=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+        self._cut_after = cut_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_content(self, size):
+        if self._cut_after is not None:
+            yield self._body[: self._cut_after]
+            raise requests.ConnectionError("connection reset")
+        yield self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code), response=self)
+
+
+class FakeServer:
+    """Serves one body with an ETag; honours Range only while If-Range matches."""
+
+    def __init__(self, body, etag='"v1"', cut_after=None):
+        self.body = body
+        self.etag = etag
+        self.cut_after = cut_after
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False):
+        headers = dict(headers or {})
+        self.requests.append(headers)
+        base = {"ETag": self.etag}
+        rng = headers.get("Range")
+        if rng and headers.get("If-Range") == self.etag:
+            start = int(rng[len("bytes="):-1])
+            if start >= len(self.body):
+                return FakeResponse(416, headers={**base, "Content-Range": f"bytes */{len(self.body)}"})
+            rest = self.body[start:]
+            return FakeResponse(206, rest, {**base, "Content-Range": f"bytes {start}-{len(self.body) - 1}/{len(self.body)}"})
+        cut, self.cut_after = self.cut_after, None
+        return FakeResponse(200, self.body, base, cut_after=cut)
+
+
+def _part(store):
+    return store.tmp / (hashlib.sha1(URL.encode("utf-8")).hexdigest() + ".part")
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ImageStore(tmp_path / "images")
+    yield s
+    s.close()
+
+
+def test_interrupted_download_resumes_with_if_range(store):
+    body = bytes(range(256)) * 4
+    server = FakeServer(body, cut_after=100)
+
+    outcome, obj = store.fetch(server, URL)
+
+    assert outcome == "downloaded"
+    assert obj.read_bytes() == body
+    assert server.requests[1] == {"Range": "bytes=100-", "If-Range": '"v1"'}
+    assert store.lookup(URL)[2] == '"v1"'
+    assert not list(store.tmp.iterdir())
+
+
+def test_part_from_a_changed_body_is_discarded(store):
+    part = _part(store)
+    part.write_bytes(b"old bytes")
+    store._meta_path(part).write_text('{"etag": "\\"v0\\"", "last_modified": null}')
+    server = FakeServer(b"new body", etag='"v1"')
+
+    _, obj = store.fetch(server, URL)
+
+    assert server.requests[0]["If-Range"] == '"v0"'
+    assert obj.read_bytes() == b"new body"
+
+
+def test_part_without_validators_is_not_resumed(store):
+    _part(store).write_bytes(b"stale")
+    server = FakeServer(b"fresh body")
+
+    _, obj = store.fetch(server, URL)
+
+    assert "Range" not in server.requests[0]
+    assert obj.read_bytes() == b"fresh body"
+
+
+def test_mismatched_content_range_restarts(store):
+    part = _part(store)
+    part.write_bytes(b"12345")
+    store._meta_path(part).write_text('{"etag": "\\"v1\\"", "last_modified": null}')
+
+    class WrongOffset(FakeServer):
+        def get(self, url, headers=None, stream=False):
+            if headers and "Range" in headers:
+                self.requests.append(dict(headers))
+                return FakeResponse(206, b"XYZ", {"ETag": self.etag, "Content-Range": "bytes 0-2/3"})
+            return super().get(url, headers, stream)
+
+    server = WrongOffset(b"full body")
+    _, obj = store.fetch(server, URL)
+
+    assert obj.read_bytes() == b"full body"
+    assert "Range" not in server.requests[-1]
+
+
+def test_416_with_other_total_restarts(store):
+    part = _part(store)
+    part.write_bytes(b"x" * 20)
+    store._meta_path(part).write_text('{"etag": "\\"v1\\"", "last_modified": null}')
+    server = FakeServer(b"short")
+
+    _, obj = store.fetch(server, URL)
+
+    assert obj.read_bytes() == b"short"
+    assert len(server.requests) == 2
@@ -0,0 +1,60 @@
+import json
+
+from openpyxl import Workbook, load_workbook
+
+from real_estate import paths
+from real_estate.pipeline import Pipeline
+
+
+def _config(root, **extra):
+    cfg = {
+        "EASYBROKER_API_KEY": "k",
+        "ENDPOINTS": {"properties": "http://x/properties", "listing_statuses": "http://x/listing_statuses"},
+        **extra,
+    }
+    path = root / "config.json"
+    path.write_text(json.dumps(cfg), encoding="utf-8")
+    return path
+
+
+def test_from_config_keeps_base_json_folder_layout(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "PROJECT_ROOT", tmp_path)
+    p = Pipeline.from_config(_config(tmp_path, BASE_JSON_FOLDER="properties/data"))
+
+    assert p.data_dir == tmp_path / "properties" / "data"
+    assert p.images_dir == tmp_path / "properties" / "data" / "images"
+    assert p.excel_dirs == [tmp_path / "properties", tmp_path / "easybrokers" / "properties"]
+
+    other = Pipeline.from_config(_config(tmp_path, BASE_JSON_FOLDER="properties/data"), data_dir=tmp_path / "d")
+    assert other.data_dir == tmp_path / "d"
+
+
+def test_from_config_without_base_json_folder_uses_artifacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "PROJECT_ROOT", tmp_path)
+    p = Pipeline.from_config(_config(tmp_path))
+
+    assert p.data_dir == paths.DATA_DIR
+    assert p.excel_dirs == [paths.DATA_DIR]
+
+
+def test_excel_stage_formats_workbooks_in_the_old_folders(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "PROJECT_ROOT", tmp_path)
+    excel_dir = tmp_path / "properties"
+    excel_dir.mkdir()
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Properties"
+    ws.append(["public_id", "title"])
+    ws.append(["EB-1", "Casa"])
+    wb.save(excel_dir / "easybrokers_20250907.xlsx")
+
+    p = Pipeline.from_config(_config(tmp_path, BASE_JSON_FOLDER="properties/data"))
+    try:
+        result = p.run_stage("excel")
+    finally:
+        p.manifest.close()
+
+    assert result.status == "ran"
+    assert p.workbook == excel_dir / "easybrokers.xlsx"
+    assert not (excel_dir / "easybrokers_20250907.xlsx").exists()
+    assert load_workbook(p.workbook)["Properties"]["A1"].style == "eb_header"
@@ -2,21 +2,33 @@ from __future__ import annotations
 
 import os
 import sys
+import gzip
+import json
+import shutil
 import time
+import struct
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 import csv
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import ccxt  # type: ignore
 import yaml
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 try:
     from tabulate import tabulate  # type: ignore
 except Exception:
     tabulate = None  # type: ignore
+try:
+    import websocket  # websocket-client (optional, for balance streams)
+except Exception:
+    websocket = None  # type: ignore
 
 
 # -----------------------------
@@ -71,18 +83,264 @@ def parse_yaml(path: str) -> dict:
         return {}
 
 
+# -----------------------------
+# Balance streams
+# -----------------------------
+class StreamingWallet:
+    """In-memory wallet kept current from account-stream events.
+
+    REST snapshots (``reconcile``) replace the wallet; events received while the
+    REST call was in flight are replayed on top when they are newer than the
+    snapshot (its ``updateTime`` when the exchange reports one, else the request
+    time). ``needs_reconcile`` asks for a REST pass on first use, after a
+    detected gap (disconnect, expired stream) or every ``reconcile_sec``.
+    """
+
+    def __init__(self, reconcile_sec: float = 300.0) -> None:
+        self.reconcile_sec = float(reconcile_sec)
+        self._lock = threading.Lock()
+        self._totals: Dict[str, float] = {}
+        # ms timestamp of the last absolute update per asset (deltas older than it are already included)
+        self._asset_ts: Dict[str, int] = {}
+        self._synced_at: Optional[float] = None
+        self._gap = True
+        self._replay: Optional[List[tuple]] = None
+        self.events = 0
+
+    def mark_gap(self, reason: str = "") -> None:
+        with self._lock:
+            if not self._gap and reason:
+                logger.info("balance stream gap: %s", reason)
+            self._gap = True
+
+    def needs_reconcile(self) -> bool:
+        with self._lock:
+            if self._gap or self._synced_at is None:
+                return True
+            return self.reconcile_sec > 0 and (time.monotonic() - self._synced_at) >= self.reconcile_sec
+
+    def begin_reconcile(self) -> int:
+        """Start buffering events; returns the request time (ms) to pass to ``reconcile``."""
+        with self._lock:
+            self._replay = []
+            self._gap = False
+        return int(time.time() * 1000)
+
+    def reconcile(self, totals: Dict[str, float], requested_ms: int, as_of_ms: Optional[int] = None) -> None:
+        """Replace the wallet with a REST snapshot taken at ``as_of_ms`` (exchange time).
+
+        Buffered events up to ``as_of_ms`` are already in the snapshot; without
+        it, events from ``requested_ms`` on are assumed not to be.
+        """
+        cutoff = int(as_of_ms) if as_of_ms else requested_ms - 1
+        with self._lock:
+            replay = self._replay or []
+            self._replay = None
+            self._totals = {k.upper(): float(v) for k, v in totals.items()}
+            self._asset_ts = {k: cutoff for k in self._totals}
+            for kind, args in replay:
+                if args[-1] > cutoff:
+                    self._apply(kind, *args)
+            self._synced_at = time.monotonic()
+
+    def abort_reconcile(self) -> None:
+        with self._lock:
+            self._replay = None
+            self._gap = True
+
+    def apply_position(self, asset: str, total: float, ts_ms: int) -> None:
+        self._event("position", (asset.upper(), float(total), int(ts_ms)))
+
+    def apply_delta(self, asset: str, delta: float, ts_ms: int) -> None:
+        self._event("delta", (asset.upper(), float(delta), int(ts_ms)))
+
+    def _event(self, kind: str, args: tuple) -> None:
+        with self._lock:
+            self.events += 1
+            if self._replay is not None:
+                self._replay.append((kind, args))
+            self._apply(kind, *args)
+
+    def _apply(self, kind: str, asset: str, value: float, ts_ms: int) -> None:
+        if kind == "position":
+            self._totals[asset] = value
+            self._asset_ts[asset] = max(ts_ms, self._asset_ts.get(asset, 0))
+        elif ts_ms > self._asset_ts.get(asset, 0):
+            self._totals[asset] = self._totals.get(asset, 0.0) + value
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {k: v for k, v in self._totals.items() if v and abs(v) > 0.0}
+
+
+class UserDataStream(ABC):
+    """Account event stream feeding a ``StreamingWallet``.
+
+    Subclasses provide the transport and call ``_on_msg`` with each raw message
+    (Binance user-data JSON); ``FakeUserDataStream`` feeds messages locally.
+    """
+
+    def __init__(self, wallet: StreamingWallet) -> None:
+        self.wallet = wallet
+        self.connected = False
+
+    @abstractmethod
+    def start(self) -> None:
+        """Connect the transport; events then arrive through ``_on_msg``."""
+
+    def stop(self) -> None:
+        self.connected = False
+
+    def _on_msg(self, msg) -> None:
+        try:
+            data = json.loads(msg) if isinstance(msg, (str, bytes)) else dict(msg)
+        except Exception:
+            return
+        # WebSocket-API subscriptions wrap the payload as {"subscriptionId": .., "event": {..}}
+        data = data.get("event", data) if isinstance(data, dict) else {}
+        etype = data.get("e")
+        try:
+            if etype == "outboundAccountPosition":
+                ts = int(data.get("u") or data.get("E") or 0)
+                for b in data.get("B") or []:
+                    self.wallet.apply_position(b["a"], float(b.get("f") or 0) + float(b.get("l") or 0), ts)
+            elif etype == "balanceUpdate":
+                self.wallet.apply_delta(data["a"], float(data.get("d") or 0), int(data.get("T") or data.get("E") or 0))
+            elif etype in ("listenKeyExpired", "eventStreamTerminated"):
+                self.wallet.mark_gap(etype)
+        except Exception as e:
+            logger.debug("user stream message skipped: %s", e)
+
+    def _on_disconnect(self, reason: str) -> None:
+        self.connected = False
+        self.wallet.mark_gap(reason)
+
+
+class BinanceUserDataStream(UserDataStream):
+    """Binance spot user-data stream (listenKey + websocket-client), reconnecting with backoff."""
+
+    url = "wss://stream.binance.com:9443/ws/"
+    keepalive_sec = 30 * 60
+
+    def __init__(self, ex, wallet: StreamingWallet) -> None:
+        super().__init__(wallet)
+        self._ex = ex
+        self._ws = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        if websocket is None:
+            raise RuntimeError("websocket-client no instalado")
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="scalpin-binance-user", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        super().stop()
+        try:
+            if self._ws:
+                self._ws.close()
+        except Exception:
+            pass
+        self._ws = None
+
+    def _listen_key(self) -> str:
+        resp = self._ex.publicPostUserDataStream()
+        return str(resp["listenKey"])
+
+    def _keepalive(self, key: str, ws, done: threading.Event) -> None:
+        # one per connection: ends with it, and only ever closes its own socket
+        while not done.wait(self.keepalive_sec):
+            if self._stop.is_set():
+                return
+            try:
+                self._ex.publicPutUserDataStream({"listenKey": key})
+            except Exception as e:
+                self.wallet.mark_gap(f"keepalive failed: {e}")
+                try:
+                    ws.close()
+                except Exception:
+                    pass
+                return
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                key = self._listen_key()
+                ws = websocket.WebSocketApp(
+                    self.url + key,
+                    on_message=lambda ws, msg: self._on_msg(msg),
+                    on_close=lambda ws, *a: self._on_disconnect("closed"),
+                    on_error=lambda ws, err: self._on_disconnect(f"error: {err}"),
+                )
+                ws.on_open = lambda ws: setattr(self, "connected", True)
+                self._ws = ws
+                done = threading.Event()
+                threading.Thread(target=self._keepalive, args=(key, ws, done), daemon=True).start()
+                try:
+                    ws.run_forever(ping_interval=15, ping_timeout=5)
+                finally:
+                    done.set()
+                backoff = 1.0
+            except Exception as e:
+                self._on_disconnect(f"connect failed: {e}")
+            if self._stop.wait(backoff):
+                break
+            backoff = min(30.0, backoff * 2.0)
+
+
+class FakeUserDataStream(UserDataStream):
+    """Local stand-in: ``push`` feeds Binance-format events, ``drop`` simulates a disconnect."""
+
+    def start(self) -> None:
+        self.connected = True
+
+    def push(self, event: dict) -> None:
+        self._on_msg(json.dumps(event))
+
+    def drop(self) -> None:
+        self._on_disconnect("fake drop")
+        self.connected = True
+
+
+USER_STREAMS = {"binance": BinanceUserDataStream}
+
+
 # -----------------------------
 # ExchangeClient
 # -----------------------------
 class ExchangeClient:
     """Thin wrapper around ccxt to fetch balances and convert to a given anchor."""
 
-    def __init__(self, ex_id: str, anchor: str, timeout_ms: int = 10000) -> None:
+    def __init__(
+        self,
+        ex_id: str,
+        anchor: str,
+        timeout_ms: int = 10000,
+        max_hops: int = 2,
+        balance_stream: bool = False,
+        reconcile_sec: float = 300.0,
+    ) -> None:
         self.ex_id = normalize_ccxt_id(ex_id)
         self.anchor = anchor.upper()
         self.timeout_ms = int(timeout_ms)
+        self.max_hops = max(1, int(max_hops))
         self._ex = self._load_exchange()
+        self._stream: Optional[UserDataStream] = None
+        if balance_stream:
+            self._start_stream(reconcile_sec)
         self._markets_loaded = False
+        self._graph: Optional[PriceGraph] = None
+        # Per-tick cache of resolved anchor rates (see _resolve_rates)
+        self._rates: Dict[str, float] = {}
+        self._rates_tick: Optional[int] = None
+        # assets the cached rates were resolved for; None = every currency (batch tickers)
+        self._rates_assets: Optional[set] = None
 
     def _load_exchange(self):
         cls = getattr(ccxt, self.ex_id)
@@ -147,8 +405,55 @@ class ExchangeClient:
                 logger.warning("%s: load_markets failed: %s", self.ex_id, e)
         return getattr(self._ex, "markets", {}) or {}
 
+    def _start_stream(self, reconcile_sec: float) -> None:
+        cls = USER_STREAMS.get(self.ex_id)
+        if cls is None:
+            logger.warning("%s: balance stream not supported; using REST fetch_balance", self.ex_id)
+            return
+        try:
+            stream = cls(self._ex, StreamingWallet(reconcile_sec))
+            stream.start()
+            self._stream = stream
+        except Exception as e:
+            logger.warning("%s: balance stream unavailable (%s); using REST fetch_balance", self.ex_id, e)
+
+    def use_stream(self, stream: UserDataStream) -> None:
+        """Attach an already-built stream (e.g. ``FakeUserDataStream``)."""
+        self._stream = stream
+        stream.start()
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+
     def fetch_balances(self) -> Dict[str, float]:
-        """Return total balances per asset; exclude zero/None."""
+        """Return total balances per asset; exclude zero/None.
+
+        With a balance stream this is an in-memory read; REST runs only to
+        reconcile (first call, after a gap, or every ``reconcile_sec``).
+        """
+        stream = self._stream
+        if stream is None:
+            return self._fetch_balances_rest()
+        wallet = stream.wallet
+        if wallet.needs_reconcile():
+            if not stream.connected:
+                return self._fetch_balances_rest()
+            requested_ms = wallet.begin_reconcile()
+            snap = self._fetch_balance_snapshot()
+            if snap is None:
+                wallet.abort_reconcile()
+                return {}
+            totals, as_of_ms = snap
+            wallet.reconcile(totals, requested_ms, as_of_ms)
+        return wallet.snapshot()
+
+    def _fetch_balances_rest(self) -> Dict[str, float]:
+        snap = self._fetch_balance_snapshot()
+        return snap[0] if snap is not None else {}
+
+    def _fetch_balance_snapshot(self) -> Optional[Tuple[Dict[str, float], Optional[int]]]:
+        """``(totals, exchange update time in ms or None)``, or None when the call failed."""
         try:
             bal = self._ex.fetch_balance() or {}
             bucket = bal.get("total") or bal.get("free") or {}
@@ -161,137 +466,670 @@ class ExchangeClient:
                         val = 0.0
                     if val and abs(val) > 0.0:
                         out[str(ccy).upper()] = val
-            return out
+            info = bal.get("info") if isinstance(bal.get("info"), dict) else {}
+            as_of = info.get("updateTime") or bal.get("timestamp")
+            return out, (int(as_of) if as_of else None)
         except Exception as e:
             logger.warning("%s: fetch_balance failed: %s", self.ex_id, e)
+            return None
+
+    def _price_graph(self) -> Optional["PriceGraph"]:
+        if self._graph is None:
+            markets = self.load_markets()
+            if markets:
+                self._graph = PriceGraph(markets)
+        return self._graph
+
+    def _fetch_all_tickers(self, graph: "PriceGraph") -> Dict[str, dict]:
+        """One batched ``fetch_tickers`` per tick (all symbols, or the graph's symbols)."""
+        try:
+            have_batch = bool(self._ex.has.get("fetchTickers"))
+        except Exception:
+            have_batch = False
+        if not have_batch:
             return {}
+        for args in ((), (graph.symbols,)):
+            try:
+                tick_all = self._ex.fetch_tickers(*args)  # type: ignore[arg-type]
+                if isinstance(tick_all, dict) and tick_all:
+                    return tick_all
+            except Exception as e:
+                logger.debug("%s: fetch_tickers%s failed: %s", self.ex_id, "" if not args else "(symbols)", e)
+        return {}
 
-    def _rate_to_anchor(self, base: str, markets: dict, tickers: dict) -> Optional[float]:
+    def _fetch_tickers_one_by_one(self, symbols: List[str]) -> Dict[str, dict]:
+        """Per-symbol ``fetch_ticker`` for exchanges without a usable batch call."""
+        out: Dict[str, dict] = {}
+        for sym in symbols:
+            try:
+                t = self._ex.fetch_ticker(sym)
+                if isinstance(t, dict):
+                    out[sym] = t
+            except Exception as e:
+                logger.debug("%s: fetch_ticker %s failed: %s", self.ex_id, sym, e)
+        return out
+
+    def _rate_to_anchor(self, base: str, tick: Optional[int] = None) -> Optional[float]:
         base = base.upper()
         if base == self.anchor:
             return 1.0
-        s1 = build_symbol(base, self.anchor)
-        s2 = build_symbol(self.anchor, base)
-        # Prefer bid/ask; fallback to last
-        t1 = tickers.get(s1) if s1 in tickers else None
-        t2 = tickers.get(s2) if s2 in tickers else None
-        if not t1 and not t2:
-            # If we didn't fetch batch, try per-symbol
-            try:
-                if s1 in markets:
-                    t1 = self._ex.fetch_ticker(s1)
-                elif s2 in markets:
-                    t2 = self._ex.fetch_ticker(s2)
-            except Exception:
-                t1 = t1 or None
-                t2 = t2 or None
-        if isinstance(t1, dict):
-            bid = t1.get("bid") or t1.get("last")
-            if bid and float(bid) > 0:
-                return float(bid)
-        if isinstance(t2, dict):
-            ask = t2.get("ask") or t2.get("last")
-            if ask and float(ask) > 0:
-                return 1.0 / float(ask)
-        # Try 1-hop bridge via USDT when direct market to anchor is not present
-        bridge = "USDT"
-        if base != bridge and self.anchor != bridge:
-            # base -> bridge
-            s_bb = build_symbol(base, bridge)
-            s_bb_inv = build_symbol(bridge, base)
-            tb = tickers.get(s_bb) if s_bb in tickers else None
-            if not tb:
-                tb = tickers.get(s_bb_inv) if s_bb_inv in tickers else None
-            if not tb:
-                try:
-                    if s_bb in markets:
-                        tb = self._ex.fetch_ticker(s_bb)
-                    elif s_bb_inv in markets:
-                        tb = self._ex.fetch_ticker(s_bb_inv)
-                except Exception:
-                    tb = None
-            rate_bb: Optional[float] = None
-            if isinstance(tb, dict):
-                if s_bb in markets and tb:
-                    rate_bb = float(tb.get("bid") or tb.get("last") or 0) or None
-                elif s_bb_inv in markets and tb:
-                    val = float(tb.get("ask") or tb.get("last") or 0)
-                    rate_bb = (1.0 / val) if val else None
-            # bridge -> anchor
-            s_ba = build_symbol(bridge, self.anchor)
-            s_ba_inv = build_symbol(self.anchor, bridge)
-            ta = tickers.get(s_ba) if s_ba in tickers else None
-            if not ta:
-                ta = tickers.get(s_ba_inv) if s_ba_inv in tickers else None
-            if not ta:
+        rate = self._resolve_rates(tick, [base]).get(base)
+        return rate if rate and rate > 0 else None
+
+    def _resolve_rates(self, tick: Optional[int] = None, assets: Optional[List[str]] = None) -> Dict[str, float]:
+        """Best bid-based rate to the anchor for every currency on the exchange.
+
+        Cached per ``tick``; a new tick costs one ``fetch_tickers`` call and one
+        vectorized graph solve, independent of how many assets the wallet holds.
+        When the batch call is missing or fails, only the symbols on paths from
+        ``assets`` to the anchor are fetched one by one.
+        """
+        wanted = {a.upper() for a in assets or []}
+        if tick is not None and self._rates_tick == tick:
+            if self._rates_assets is None or all(w in self._rates for w in wanted - self._rates_assets):
+                return self._rates
+            wanted |= self._rates_assets
+        graph = self._price_graph()
+        rates: Dict[str, float] = {self.anchor: 1.0}
+        covered: Optional[set] = None
+        if graph is not None:
+            tickers = self._fetch_all_tickers(graph)
+            if not tickers:
+                covered = wanted
+                symbols = graph.symbols_between(wanted, self.anchor, max_hops=self.max_hops)
+                tickers = self._fetch_tickers_one_by_one(symbols) if symbols else {}
+            if tickers:
+                rates = graph.rates_to(self.anchor, tickers, max_hops=self.max_hops)
+        self._rates = rates
+        self._rates_tick = tick
+        self._rates_assets = covered
+        return rates
+
+    def fetch_prices_in_anchor(self, assets: List[str], tick: Optional[int] = None) -> Dict[str, float]:
+        rates = self._resolve_rates(tick, assets)
+        prices: Dict[str, float] = {}
+        for a in assets:
+            r = 1.0 if a.upper() == self.anchor else rates.get(a.upper())
+            if r is not None and r > 0:
+                prices[a.upper()] = float(r)
+        return prices
+
+
+# -----------------------------
+# PriceGraph
+# -----------------------------
+class PriceGraph:
+    """Conversion graph for one exchange, priced from a single batch of tickers.
+
+    Every spot market BASE/QUOTE gives two edges: BASE->QUOTE at the bid (selling
+    base) and QUOTE->BASE at 1/ask (buying base); ``last`` fills a missing side.
+    Working in log space, a hop-bounded Bellman-Ford from the anchor over the
+    reversed edges yields, for every currency at once, the best product of rates
+    along any path of at most ``max_hops`` conversions into the anchor.
+    The market structure is built once; each tick only refreshes edge rates.
+    """
+
+    def __init__(self, markets: dict) -> None:
+        symbols: List[str] = []
+        base_ids: List[int] = []
+        quote_ids: List[int] = []
+        ids: Dict[str, int] = {}
+        for sym, m in markets.items():
+            if not isinstance(m, dict) or m.get("spot") is False or m.get("active") is False:
+                continue
+            base, quote = m.get("base"), m.get("quote")
+            if not base or not quote:
+                continue
+            symbols.append(sym)
+            base_ids.append(ids.setdefault(str(base).upper(), len(ids)))
+            quote_ids.append(ids.setdefault(str(quote).upper(), len(ids)))
+        self.symbols = symbols
+        self.ids = ids
+        self.currencies = list(ids)
+        b = np.asarray(base_ids, dtype=np.intp)
+        q = np.asarray(quote_ids, dtype=np.intp)
+        # forward edges (sell base) first, then reverse edges (buy base)
+        self.src = np.concatenate([b, q])
+        self.dst = np.concatenate([q, b])
+        self._base_ids = base_ids
+        self._quote_ids = quote_ids
+        self._adj: Optional[List[List[int]]] = None
+
+    def _hops_from(self, starts: List[int], max_hops: int) -> Dict[int, int]:
+        """Undirected BFS distance (<= ``max_hops``) from any of ``starts``."""
+        if self._adj is None:
+            adj: List[List[int]] = [[] for _ in self.currencies]
+            for b, q in zip(self._base_ids, self._quote_ids):
+                adj[b].append(q)
+                adj[q].append(b)
+            self._adj = adj
+        dist = {s: 0 for s in starts}
+        frontier = list(dist)
+        for d in range(1, max_hops + 1):
+            nxt = []
+            for u in frontier:
+                for v in self._adj[u]:
+                    if v not in dist:
+                        dist[v] = d
+                        nxt.append(v)
+            frontier = nxt
+        return dist
+
+    def symbols_between(self, assets, anchor: str, max_hops: int = 2) -> List[str]:
+        """Symbols on some path of at most ``max_hops`` markets from ``assets`` to ``anchor``."""
+        a = self.ids.get(anchor.upper())
+        starts = [self.ids[x] for x in {str(x).upper() for x in assets} if x in self.ids and x != anchor.upper()]
+        if a is None or not starts:
+            return []
+        max_hops = max(1, int(max_hops))
+        from_assets = self._hops_from(starts, max_hops)
+        to_anchor = self._hops_from([a], max_hops)
+        out = []
+        for sym, b, q in zip(self.symbols, self._base_ids, self._quote_ids):
+            for u, v in ((b, q), (q, b)):
+                if u in from_assets and v in to_anchor and from_assets[u] + 1 + to_anchor[v] <= max_hops:
+                    out.append(sym)
+                    break
+        return out
+
+    def _log_rates(self, tickers: Dict[str, dict]) -> np.ndarray:
+        n = len(self.symbols)
+        bid = np.full(n, np.nan)
+        ask = np.full(n, np.nan)
+        for i, sym in enumerate(self.symbols):
+            t = tickers.get(sym)
+            if not isinstance(t, dict):
+                continue
+            last = t.get("last")
+            b = t.get("bid") or last
+            a = t.get("ask") or last
+            if b:
+                bid[i] = float(b)
+            if a:
+                ask[i] = float(a)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fwd = np.where(bid > 0, np.log(bid), -np.inf)
+            rev = np.where(ask > 0, -np.log(ask), -np.inf)
+        return np.concatenate([fwd, rev])
+
+    def rates_to(self, anchor: str, tickers: Dict[str, dict], max_hops: int = 2) -> Dict[str, float]:
+        anchor = anchor.upper()
+        a = self.ids.get(anchor)
+        if a is None or not self.symbols:
+            return {anchor: 1.0}
+        logr = self._log_rates(tickers)
+        usable = np.isfinite(logr)
+        src, dst, logr = self.src[usable], self.dst[usable], logr[usable]
+        # best[u] = max log-rate of converting 1 unit of u into the anchor
+        best = np.full(len(self.currencies), -np.inf)
+        best[a] = 0.0
+        for _ in range(max(1, int(max_hops))):
+            cand = logr + best[dst]
+            nxt = best.copy()
+            np.maximum.at(nxt, src, cand)
+            nxt[a] = 0.0
+            if np.array_equal(nxt, best):
+                break
+            best = nxt
+        reach = np.flatnonzero(np.isfinite(best))
+        values = np.exp(best[reach])
+        return {self.currencies[i]: float(v) for i, v in zip(reach, values)}
+
+
+# -----------------------------
+# Terminal renderer
+# -----------------------------
+VIEW_COLUMNS = ["exchange", "asset", "anchor", "valor_anchor", "profit", "accion"]
+
+
+def _view_cells(r: dict) -> List[str]:
+    return [
+        str(r.get("exchange", "")),
+        str(r.get("asset", "")),
+        str(r.get("anchor", "")),
+        f"{float(r.get('valor_anchor', 0.0)):.6f}",
+        f"{float(r.get('profit_pct', 0.0)):.4f}%",
+        str(r.get("accion", "") or ""),
+    ]
+
+
+class TerminalRenderer:
+    """Repaints only the console lines that changed since the previous frame.
+
+    Keeps the last frame as a list of lines and, per render, moves the cursor
+    (ANSI CUP) to each dirty line and rewrites it, clearing leftovers below when
+    the table shrinks. Column widths are cached and only ever grow, so unchanged
+    rows keep identical text and are skipped. Frames arriving faster than
+    ``max_fps`` are held back; ``flush`` paints the last one.
+    """
+
+    def __init__(self, max_fps: float = 20.0, stream=None) -> None:
+        self.min_interval = 1.0 / float(max_fps) if max_fps and max_fps > 0 else 0.0
+        self.stream = stream or sys.stdout
+        self._prev: List[str] = []
+        self._widths: List[int] = [len(c) for c in VIEW_COLUMNS]
+        self._last_paint = 0.0
+        self._pending: Optional[List[str]] = None
+        if os.name == "nt":
+            # Enables VT escape processing on Windows 10+ consoles
+            os.system("")
+
+    def _grid(self, rows: List[dict]) -> List[str]:
+        cells = [_view_cells(r) for r in rows]
+        widths = self._widths
+        for row in cells:
+            for j, v in enumerate(row):
+                if len(v) > widths[j]:
+                    widths[j] = len(v)
+        border = "".join("+" + "-" * (w + 2) for w in widths) + "+"
+
+        def line(values: List[str]) -> str:
+            return "".join(f"| {v.ljust(w)} " for v, w in zip(values, widths)) + "|"
+
+        out = [border, line(VIEW_COLUMNS), border]
+        out.extend(line(row) for row in cells)
+        out.append(border)
+        return out
+
+    def frame(self, header: str, rows: List[dict]) -> List[str]:
+        lines = [""] + header.split("\n") + [""]
+        if rows:
+            lines.extend(self._grid(rows))
+        else:
+            lines.append("(sin saldos o por debajo de min_value_anchor)")
+        # Cursor addressing past the last terminal row would scroll; cap the frame
+        max_lines = max(5, shutil.get_terminal_size((120, 50)).lines - 1)
+        if len(lines) > max_lines:
+            hidden = len(lines) - max_lines + 1
+            lines = lines[: max_lines - 1] + [f"... (+{hidden} filas)"]
+        return lines
+
+    def render(self, header: str, rows: List[dict]) -> bool:
+        """Queue a frame; returns True when it was painted now."""
+        self._pending = self.frame(header, rows)
+        if time.monotonic() - self._last_paint < self.min_interval:
+            return False
+        self.flush()
+        return True
+
+    def flush(self) -> None:
+        lines = self._pending
+        if lines is None:
+            return
+        self._pending = None
+        prev = self._prev
+        parts: List[str] = []
+        if not prev:
+            parts.append("\x1b[2J")
+        for i, text in enumerate(lines):
+            if i < len(prev) and prev[i] == text:
+                continue
+            parts.append(f"\x1b[{i + 1};1H{text}\x1b[K")
+        if len(lines) < len(prev):
+            parts.append(f"\x1b[{len(lines) + 1};1H\x1b[J")
+        parts.append(f"\x1b[{len(lines) + 1};1H")
+        self.stream.write("".join(parts))
+        self.stream.flush()
+        self._prev = lines
+        self._last_paint = time.monotonic()
+
+
+# -----------------------------
+# History writer
+# -----------------------------
+HISTORY_CSV_COLUMNS = ["exchange", "asset", "anchor", "valor_anchor", "profit_pct", "accion", "ts"]
+
+
+class HistoryWriter:
+    """Group-committed, daily-rotated history (text log + CSV).
+
+    ``add`` only buffers. A commit happens when ``commit_rows`` CSV rows are
+    pending or the oldest pending entry is ``commit_sec`` old, and writes the
+    whole batch with one ``to_csv`` call and (when ``fsync`` is on) one fsync per
+    file. When the UTC day changes, the previous day's files are renamed to
+    ``<name>_<YYYY-MM-DD><ext>`` and, with ``compress``, gzipped in the background.
+    """
+
+    def __init__(
+        self,
+        log_path: str,
+        csv_path: str,
+        commit_rows: int = 500,
+        commit_sec: float = 30.0,
+        fsync: bool = True,
+        rotate_daily: bool = True,
+        compress: bool = True,
+    ) -> None:
+        self.log_path = log_path
+        self.csv_path = csv_path
+        self.commit_rows = max(1, int(commit_rows))
+        self.commit_sec = max(0.0, float(commit_sec))
+        self.fsync = bool(fsync)
+        self.rotate_daily = bool(rotate_daily)
+        self.compress = bool(compress)
+        self._text: List[str] = []
+        self._frames: List[pd.DataFrame] = []
+        self._pending_rows = 0
+        self._oldest: Optional[float] = None
+        self._day: Optional[str] = None
+
+    def add(self, text: str, df: pd.DataFrame, ts: str) -> None:
+        self._text.append(text)
+        if len(df):
+            frame = df.reindex(columns=HISTORY_CSV_COLUMNS)
+            frame["ts"] = ts
+            self._frames.append(frame)
+            self._pending_rows += len(frame)
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        if self._pending_rows >= self.commit_rows or (time.monotonic() - self._oldest) >= self.commit_sec:
+            self.commit()
+
+    def commit(self) -> None:
+        if not self._text and not self._frames:
+            return
+        text = "".join(self._text)
+        frames = self._frames
+        self._text, self._frames, self._pending_rows, self._oldest = [], [], 0, None
+        self._maybe_rotate()
+        if text:
+            self._append(self.log_path, text)
+        if frames:
+            batch = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            header = not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0
+            self._append(self.csv_path, batch.to_csv(index=False, header=header, lineterminator="\n"))
+
+    def close(self) -> None:
+        self.commit()
+
+    def _append(self, path: str, text: str) -> None:
+        out_dir = os.path.dirname(path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        with open(path, "a", encoding="utf-8", newline="") as fh:
+            fh.write(text)
+            if self.fsync:
+                fh.flush()
                 try:
-                    if s_ba in markets:
-                        ta = self._ex.fetch_ticker(s_ba)
-                    elif s_ba_inv in markets:
-                        ta = self._ex.fetch_ticker(s_ba_inv)
+                    os.fsync(fh.fileno())
                 except Exception:
-                    ta = None
-            rate_ba: Optional[float] = None
-            if isinstance(ta, dict):
-                if s_ba in markets and ta:
-                    rate_ba = float(ta.get("bid") or ta.get("last") or 0) or None
-                elif s_ba_inv in markets and ta:
-                    val = float(ta.get("ask") or ta.get("last") or 0)
-                    rate_ba = (1.0 / val) if val else None
-            if rate_bb and rate_ba:
+                    pass
+
+    def _maybe_rotate(self) -> None:
+        if not self.rotate_daily:
+            return
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if self._day is None:
+            # First commit of the run: files left by a previous day still get rotated
+            self._day = today
+            for path in (self.log_path, self.csv_path):
                 try:
-                    return float(rate_bb) * float(rate_ba)
-                except Exception:
-                    return None
-        return None
-
-    def fetch_prices_in_anchor(self, assets: List[str]) -> Dict[str, float]:
-        assets_u = [a.upper() for a in assets]
-        markets = self.load_markets()
-        # Build needed symbols
-        symbols = set()
-        for a in assets_u:
-            if a == self.anchor:
-                continue
-            s1 = build_symbol(a, self.anchor)
-            s2 = build_symbol(self.anchor, a)
-            if s1 in markets:
-                symbols.add(s1)
-            if s2 in markets:
-                symbols.add(s2)
-            # Add bridge pairs via USDT to improve coverage
-            bridge = "USDT"
-            if a != bridge and self.anchor != bridge:
-                s_bb = build_symbol(a, bridge)
-                s_bb_inv = build_symbol(bridge, a)
-                s_ba = build_symbol(bridge, self.anchor)
-                s_ba_inv = build_symbol(self.anchor, bridge)
-                for s in (s_bb, s_bb_inv, s_ba, s_ba_inv):
-                    if s in markets:
-                        symbols.add(s)
-        # Fetch batch when supported
-        tickers: Dict[str, dict] = {}
+                    day = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc).strftime("%Y-%m-%d")
+                except OSError:
+                    continue
+                if day != today:
+                    self._rotate(path, day)
+            return
+        if today != self._day:
+            for path in (self.log_path, self.csv_path):
+                self._rotate(path, self._day)
+            self._day = today
+
+    def _rotate(self, path: str, day: str) -> None:
+        if not os.path.exists(path):
+            return
+        stem, ext = os.path.splitext(path)
+        target = f"{stem}_{day}{ext}"
         try:
-            have_batch = bool(self._ex.has.get("fetchTickers"))
+            os.replace(path, target)
+        except Exception as e:
+            logger.warning("History rotation failed for %s: %s", path, e)
+            return
+        if self.compress:
+            threading.Thread(target=_gzip_file, args=(target,), name="scalpin-gzip", daemon=True).start()
+
+
+def _gzip_file(path: str) -> None:
+    try:
+        with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(path)
+    except Exception as e:
+        logger.warning("History compression failed for %s: %s", path, e)
+
+
+# -----------------------------
+# Perf telemetry
+# -----------------------------
+MS_FIELDS = (
+    "ms_fetch", "ms_valuation", "ms_render", "ms_snapshot", "ms_log", "ms_hist", "ms_sink", "ms_total",
+)
+PERCENTILES = (50.0, 95.0, 99.0)
+
+
+class PerfRing:
+    """Fixed-size NumPy ring of per-tick latencies with percentile queries.
+
+    ``push`` is O(1) (one row write); ``percentiles`` runs ``np.percentile`` over
+    the filled part of the window, so p50/p95/p99 always reflect the last
+    ``capacity`` ticks. Thread-safe: the sink thread pushes while the metrics
+    endpoint reads.
+    """
+
+    def __init__(self, fields: tuple = MS_FIELDS, capacity: int = 1024) -> None:
+        self.fields = tuple(fields)
+        self.capacity = max(1, int(capacity))
+        self._data = np.full((self.capacity, len(self.fields)), np.nan)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, perf: dict) -> None:
+        row = [float(perf.get(f, np.nan) or 0.0) for f in self.fields]
+        with self._lock:
+            self._data[self._next] = row
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def window(self) -> np.ndarray:
+        """Filled rows, oldest first."""
+        with self._lock:
+            if self._count < self.capacity:
+                return self._data[: self._count].copy()
+            return np.roll(self._data, -self._next, axis=0)
+
+    def percentiles(self, qs: tuple = PERCENTILES) -> Dict[str, Dict[str, float]]:
+        data = self.window()
+        if not len(data):
+            return {}
+        with np.errstate(all="ignore"):
+            vals = np.nanpercentile(data, qs, axis=0)
+        return {
+            f: {f"p{int(q)}": float(vals[i, j]) for i, q in enumerate(qs)}
+            for j, f in enumerate(self.fields)
+        }
+
+
+# Binary perf log: MAGIC, uint16 header length, comma-separated field names, then
+# fixed-size little-endian records (ts: float64, iter: uint32, rows: uint32, ms_*: float32)
+PERF_LOG_MAGIC = b"SCPF1"
+
+
+def _perf_log_dtype(fields: tuple) -> np.dtype:
+    return np.dtype([("ts", "<f8"), ("iter", "<u4"), ("row_count", "<u4")] + [(f, "<f4") for f in fields])
+
+
+class PerfLog:
+    """Append-only binary perf log (a few dozen bytes per tick, no per-tick fsync)."""
+
+    def __init__(self, path: str, fields: tuple = MS_FIELDS) -> None:
+        self.path = path
+        self.fields = tuple(fields)
+        self._record = struct.Struct("<dII" + "f" * len(self.fields))
+        header = ",".join(self.fields).encode("ascii")
+        self._header = PERF_LOG_MAGIC + struct.pack("<H", len(header)) + header
+        self._fh = None
+
+    def _open(self):
+        out_dir = os.path.dirname(self.path)
+        if out_dir and not os.path.isdir(out_dir):
+            os.makedirs(out_dir, exist_ok=True)
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, "rb") as fh:
+                same = fh.read(len(self._header)) == self._header
+            if not same:
+                # Different field layout: keep the old log aside instead of mixing records
+                os.replace(self.path, self.path + ".prev")
+        fh = open(self.path, "ab")
+        if fh.tell() == 0:
+            fh.write(self._header)
+        return fh
+
+    def append(self, perf: dict) -> None:
+        if self._fh is None:
+            self._fh = self._open()
+        try:
+            ts = datetime.fromisoformat(str(perf.get("ts"))).timestamp()
         except Exception:
-            have_batch = False
-        if have_batch and symbols:
+            ts = time.time()
+        self._fh.write(
+            self._record.pack(
+                ts,
+                int(perf.get("iter") or 0),
+                int(perf.get("row_count") or 0),
+                *(float(perf.get(f) or 0.0) for f in self.fields),
+            )
+        )
+
+    def flush(self) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def read_perf_log(path: str) -> pd.DataFrame:
+    """Load a binary perf log written by ``PerfLog`` into a DataFrame."""
+    with open(path, "rb") as fh:
+        if fh.read(len(PERF_LOG_MAGIC)) != PERF_LOG_MAGIC:
+            raise ValueError(f"not a scalpin perf log: {path}")
+        (n,) = struct.unpack("<H", fh.read(2))
+        fields = tuple(fh.read(n).decode("ascii").split(","))
+        offset = fh.tell()
+    df = pd.DataFrame(np.fromfile(path, dtype=_perf_log_dtype(fields), offset=offset))
+    if len(df):
+        df["ts"] = pd.to_datetime(df["ts"], unit="s", utc=True)
+    return df
+
+
+class MetricsServer:
+    """Optional local endpoint serving live percentiles as JSON.
+
+    ``address`` is ``host:port`` for HTTP (GET /metrics) or ``unix:/path.sock``
+    for a Unix socket (connect and read one JSON document).
+    """
+
+    def __init__(self, address: str, snapshot_fn) -> None:
+        self.address = address
+        self._snapshot_fn = snapshot_fn
+        self._server = None
+
+    def _payload(self) -> bytes:
+        return json.dumps(self._snapshot_fn(), default=float).encode("utf-8")
+
+    def start(self) -> None:
+        import socketserver
+
+        payload = self._payload
+        if self.address.startswith("unix:"):
+            sock_path = self.address[len("unix:"):]
+
+            class UnixHandler(socketserver.BaseRequestHandler):
+                def handle(self) -> None:
+                    self.request.sendall(payload() + b"\n")
+
             try:
-                tick_all = self._ex.fetch_tickers(list(symbols))  # type: ignore[arg-type]
-                if isinstance(tick_all, dict):
-                    for s in symbols:
-                        t = tick_all.get(s)
-                        if isinstance(t, dict):
-                            tickers[s] = t
+                if os.path.exists(sock_path):
+                    os.unlink(sock_path)
             except Exception:
                 pass
-        # Build prices
-        prices: Dict[str, float] = {}
-        for a in assets_u:
-            r = self._rate_to_anchor(a, markets, tickers) if a != self.anchor else 1.0
-            if r is not None and r > 0:
-                prices[a] = float(r)
-        return prices
+            self._server = socketserver.ThreadingUnixStreamServer(sock_path, UnixHandler)
+        else:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+            host, _, port = self.address.rpartition(":")
+
+            class HttpHandler(BaseHTTPRequestHandler):
+                def do_GET(self) -> None:  # noqa: N802
+                    if self.path.rstrip("/") not in ("", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = payload()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args) -> None:
+                    pass
+
+            self._server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), HttpHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="scalpin-metrics", daemon=True).start()
+        logger.info("Metrics endpoint on %s", self.address)
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            if self.address.startswith("unix:"):
+                try:
+                    os.unlink(self.address[len("unix:"):])
+                except Exception:
+                    pass
+
+
+# -----------------------------
+# Pipeline stages
+# -----------------------------
+@dataclass
+class ExchangeSnapshot:
+    """Latest balances/prices published by one exchange's fetch task."""
+
+    balances: Dict[str, float]
+    prices: Dict[str, float]
+    seq: int
+    ms_fetch: float
+
+
+@dataclass
+class SinkJob:
+    """One valued tick handed to the sink stage (console, CSV, logs, history)."""
+
+    tick: int
+    rows: List[dict]
+    perf: dict
+    do_print: bool = False
+    do_snapshot: bool = False
+    do_log: bool = False
+    do_hist: bool = False
+    t_start: float = field(default_factory=time.perf_counter)
+
+    def absorb(self, older: "SinkJob") -> None:
+        # Keep output cadence when the sink falls behind: a dropped tick's writes
+        # are carried by the newer one
+        self.do_print |= older.do_print
+        self.do_snapshot |= older.do_snapshot
+        self.do_log |= older.do_log
+        self.do_hist |= older.do_hist
 
 
 # -----------------------------
@@ -334,6 +1172,17 @@ class ScalpinMonitor:
         self.history_log_enabled = bool(self.cfg.get("history_log_enabled", True))
         self.history_log_path = str(self.cfg.get("history_log_path") or default_hist_log)
         self.history_csv_path = str(self.cfg.get("history_csv_path") or default_hist_csv)
+        # History durability: rows are group-committed every history_commit_rows rows or
+        # history_commit_sec seconds (one fsync per commit when history_fsync is on)
+        self._history = HistoryWriter(
+            self.history_log_path,
+            self.history_csv_path,
+            commit_rows=int(self.cfg.get("history_commit_rows") or 500),
+            commit_sec=float(self.cfg.get("history_commit_sec", 30.0)),
+            fsync=bool(self.cfg.get("history_fsync", True)),
+            rotate_daily=bool(self.cfg.get("history_rotate_daily", True)),
+            compress=bool(self.cfg.get("history_compress", True)),
+        )
         # Table format for console/log rendering (requires tabulate)
         self.table_format = str(self.cfg.get("table_format") or "grid")
         # Performance controls
@@ -344,19 +1193,57 @@ class ScalpinMonitor:
         self.log_every_n = int(self.cfg.get("log_every_n") or 5)
         self.history_every_n = int(self.cfg.get("history_every_n") or 10)
         self.render_every_n = int(self.cfg.get("render_every_n") or 5)
+        # Fetch cadence per exchange (seconds); defaults to poll_interval_sec
+        self.fetch_interval_sec: float = float(self.cfg.get("fetch_interval_sec") or self.poll_sec)
+        self.fetch_interval_by_exchange: Dict[str, float] = {
+            normalize_ccxt_id(k): float(v) for k, v in (self.cfg.get("fetch_interval_by_exchange") or {}).items()
+        }
+        # Max conversions when pricing an asset into the anchor (1 = direct pair only)
+        self.price_max_hops = int(self.cfg.get("price_max_hops") or 2)
+        # Exchanges whose balances come from the account stream (REST only to reconcile)
+        stream_ex = {normalize_ccxt_id(x) for x in (self.cfg.get("balance_stream_exchanges") or [])}
+        reconcile_sec = float(self.cfg.get("balance_reconcile_sec") or 300)
         # Build clients
-        self.clients = {ex: ExchangeClient(ex, anchor=self.anchor, timeout_ms=timeout_ms) for ex in self.exchanges}
+        self.clients = {
+            ex: ExchangeClient(
+                ex,
+                anchor=self.anchor,
+                timeout_ms=timeout_ms,
+                max_hops=self.price_max_hops,
+                balance_stream=ex in stream_ex,
+                reconcile_sec=reconcile_sec,
+            )
+            for ex in self.exchanges
+        }
         self.iteration = 0
+        # Tick currently being written by the sink stage (used in headers)
+        self._sink_tick = 0
+        # Latest fetch result per exchange, replaced by each fetch task
+        self._snapshots: Dict[str, ExchangeSnapshot] = {}
         # Track last seen price per (exchange, asset) to compute tick-over-tick change
         self._last_price = {}
+        # Snapshot seqs behind the last valued rows; valuation is reused until one changes
+        self._valued_seqs: Optional[Dict[str, int]] = None
+        self._valued_rows: List[dict] = []
         # Console refresh behavior
         self.clear_screen = bool(self.cfg.get("clear_screen", True))
+        # With clear_screen on a TTY, repaint only changed lines (render_mode: diff|full)
+        self.render_mode = str(self.cfg.get("render_mode") or "diff").lower()
+        self._term: Optional[TerminalRenderer] = None
+        if self.clear_screen and self.render_mode == "diff" and sys.stdout.isatty():
+            self._term = TerminalRenderer(max_fps=float(self.cfg.get("render_max_fps") or 20))
         # Performance metrics
-        self._perf_hist = []
-        self.perf_window = int(self.cfg.get("perf_window") or 50)
-        default_perf_csv = os.path.join(os.getcwd(), "artifacts", "scalpin", "scalpin_perf.csv")
-        self.perf_csv_path = str(self.cfg.get("perf_csv_path") or default_perf_csv)
-        self.perf_csv_enabled = bool(self.cfg.get("perf_csv_enabled", True))
+        self.perf_window = int(self.cfg.get("perf_window") or 1024)
+        self._perf_ring = PerfRing(MS_FIELDS, capacity=self.perf_window)
+        self._fetch_rings: Dict[str, PerfRing] = {
+            ex: PerfRing(("ms_fetch",), capacity=self.perf_window) for ex in self.exchanges
+        }
+        default_perf_log = os.path.join(os.getcwd(), "artifacts", "scalpin", "scalpin_perf.bin")
+        self.perf_log_path = str(self.cfg.get("perf_log_path") or default_perf_log)
+        self.perf_log_enabled = bool(self.cfg.get("perf_log_enabled", self.cfg.get("perf_csv_enabled", True)))
+        self._perf_log = PerfLog(self.perf_log_path, MS_FIELDS) if self.perf_log_enabled else None
+        # Optional live metrics endpoint: "127.0.0.1:9109" (HTTP) or "unix:/tmp/scalpin.sock"
+        self.metrics_endpoint = str(self.cfg.get("metrics_endpoint") or "")
 
     def _filter_assets(self, balances: Dict[str, float]) -> Dict[str, float]:
         if not self.assets_validos:
@@ -368,22 +1255,22 @@ class ScalpinMonitor:
                 out[a] = v
         return out
 
-    def _build_table_rows(self) -> List[dict]:
-        rows: List[dict] = []
-        now_utc = datetime.now(timezone.utc)
+    def _fetch_exchange(self, client: ExchangeClient, seq: int) -> ExchangeSnapshot:
+        """Blocking fetch of balances + anchor prices (runs in a worker thread)."""
+        t0 = time.perf_counter()
+        balances = self._filter_assets(client.fetch_balances())
+        prices = client.fetch_prices_in_anchor(list(balances.keys()), tick=seq) if balances else {}
+        return ExchangeSnapshot(balances, prices, seq, (time.perf_counter() - t0) * 1000.0)
 
-        def worker(ex_id: str, client: ExchangeClient) -> List[dict]:
-            local_rows: List[dict] = []
-            balances = client.fetch_balances()
-            if not balances:
-                return local_rows
-            balances = self._filter_assets(balances)
-            assets = list(balances.keys())
-            prices = client.fetch_prices_in_anchor(assets)
-            for asset, bal in balances.items():
+    def _value_rows(self, snapshots: Dict[str, ExchangeSnapshot]) -> tuple:
+        """Turn the latest snapshots into table rows; returns (rows, swap actions)."""
+        rows: List[dict] = []
+        actions: List[tuple] = []
+        for ex_id, snap in snapshots.items():
+            for asset, bal in snap.balances.items():
                 if asset.upper() == self.anchor:
                     continue
-                price = prices.get(asset.upper())
+                price = snap.prices.get(asset.upper())
                 if price is None or price <= 0:
                     continue
                 value_anchor = float(bal) * float(price)
@@ -402,39 +1289,8 @@ class ScalpinMonitor:
                 accion = ""
                 if profit_pct is not None and profit_pct > float(self.profit_action_threshold_pct):
                     accion = f"@{ex_id} swap {asset.upper()}->{self.anchor}->{asset.upper()}"
-                    if accion:
-                        log_path = os.path.join(os.getcwd(), "artifacts", "arbitraje", "logs", "swapper.log")
-                        fh = None
-                        try:
-                            fh = open(log_path, "ab")
-                        except Exception:
-                            fh = None
-                        try:
-                            __import__("subprocess").Popen(
-                                [
-                                    sys.executable,
-                                    "-m",
-                                    "arbitraje.swapper",
-                                    "--config",
-                                    os.path.join(os.getcwd(), "projects", "arbitraje", "swapper.live.yaml"),
-                                    "--exchange",
-                                    ex_id,
-                                    "--path",
-                                    f"{asset.upper()}->{self.anchor}->{asset.upper()}",
-                                ],
-                                env=dict(os.environ, PYTHONPATH=os.path.join(os.getcwd(), "projects", "arbitraje", "src")),
-                                stdout=fh if fh is not None else None,
-                                stderr=__import__("subprocess").STDOUT if fh is not None else None,
-                            )
-                        finally:
-                            try:
-                                if fh is not None:
-                                    fh.flush()
-                                    os.fsync(fh.fileno())
-                                    fh.close()
-                            except Exception:
-                                pass
-                local_rows.append(
+                    actions.append((ex_id, asset.upper()))
+                rows.append(
                     {
                         "exchange": ex_id,
                         "asset": asset.upper(),
@@ -444,30 +1300,46 @@ class ScalpinMonitor:
                         "accion": accion,
                     }
                 )
-            return local_rows
-
-        if self.concurrency > 1 and len(self.clients) > 1:
-            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
-                futures = {pool.submit(worker, ex_id, client): ex_id for ex_id, client in self.clients.items()}
-                for fut in as_completed(futures):
-                    try:
-                        rows.extend(fut.result())
-                    except Exception as e:
-                        logger.warning("worker error: %s", e)
-        else:
-            for ex_id, client in self.clients.items():
-                rows.extend(worker(ex_id, client))
         # Sort by valor_anchor desc
         rows.sort(key=lambda r: r.get("valor_anchor", 0.0), reverse=True)
-        return rows
+        return rows, actions
 
-    def _render(self, rows: List[dict], print_console: bool = True) -> pd.DataFrame:
-        self.iteration += 1
-        if self.clear_screen and print_console:
+    def _spawn_swapper(self, ex_id: str, asset: str) -> None:
+        log_path = os.path.join(os.getcwd(), "artifacts", "arbitraje", "logs", "swapper.log")
+        fh = None
+        try:
+            fh = open(log_path, "ab")
+        except Exception:
+            fh = None
+        try:
+            __import__("subprocess").Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "arbitraje.swapper",
+                    "--config",
+                    os.path.join(os.getcwd(), "projects", "arbitraje", "swapper.live.yaml"),
+                    "--exchange",
+                    ex_id,
+                    "--path",
+                    f"{asset}->{self.anchor}->{asset}",
+                ],
+                env=dict(os.environ, PYTHONPATH=os.path.join(os.getcwd(), "projects", "arbitraje", "src")),
+                stdout=fh if fh is not None else None,
+                stderr=__import__("subprocess").STDOUT if fh is not None else None,
+            )
+        except Exception as e:
+            logger.warning("swapper spawn failed (%s %s): %s", ex_id, asset, e)
+        finally:
             try:
-                os.system("cls" if os.name == "nt" else "clear")
+                if fh is not None:
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                    fh.close()
             except Exception:
                 pass
+
+    def _console_header(self) -> str:
         # Build header with elapsed time and timestamp
         now_utc = datetime.now(timezone.utc)
         if not hasattr(self, "_t0") or self._t0 is None:
@@ -480,21 +1352,39 @@ class ScalpinMonitor:
         perf_str = ""
         if isinstance(perf, dict):
             perf_str = (
-                f" | lat(ms): rows={int(perf.get('ms_rows',0))} r={int(perf.get('row_count',0))}"
+                f" | lat(ms): fetch={int(perf.get('ms_fetch',0))} val={int(perf.get('ms_valuation',0))}"
+                f" r={int(perf.get('row_count',0))}"
                 f" render={int(perf.get('ms_render',0))} snap={int(perf.get('ms_snapshot',0))}"
-                f" log={int(perf.get('ms_log',0))} hist={int(perf.get('ms_hist',0))} tot={int(perf.get('ms_total',0))}"
+                f" log={int(perf.get('ms_log',0))} hist={int(perf.get('ms_hist',0))}"
+                f" sink={int(perf.get('ms_sink',0))} tot={int(perf.get('ms_total',0))}"
             )
-        header = f"{title}\nanchor={self.anchor} | exchanges={','.join(self.exchanges)} | iter {self.iteration}/{iter_total} | elapsed={str(elapsed).split('.')[0]} | ts={now_utc.isoformat()}{perf_str}"
+            p_tot = self._perf_ring.percentiles().get("ms_total")
+            if p_tot:
+                perf_str += f" p95={int(p_tot['p95'])} p99={int(p_tot['p99'])}"
+        return f"{title}\nanchor={self.anchor} | exchanges={','.join(self.exchanges)} | iter {self._sink_tick}/{iter_total} | elapsed={str(elapsed).split('.')[0]} | ts={now_utc.isoformat()}{perf_str}"
+
+    def _rows_frame(self, rows: List[dict]) -> pd.DataFrame:
+        if not rows:
+            return pd.DataFrame(columns=["exchange", "asset", "anchor", "valor_anchor", "profit_pct", "accion", "ts"])
+        try:
+            return pd.DataFrame(rows, columns=["exchange", "asset", "anchor", "valor_anchor", "profit_pct", "accion"])
+        except Exception:
+            return pd.DataFrame(rows)
+
+    def _render(self, rows: List[dict], print_console: bool = True) -> pd.DataFrame:
+        if self.clear_screen and print_console:
+            try:
+                os.system("cls" if os.name == "nt" else "clear")
+            except Exception:
+                pass
+        header = self._console_header()
         if print_console:
             print("\n" + header + "\n")
         if not rows:
             if print_console:
                 print("(sin saldos o por debajo de min_value_anchor)")
-            return pd.DataFrame(columns=["exchange", "asset", "anchor", "valor_anchor", "profit_pct", "accion", "ts"])
-        try:
-            df = pd.DataFrame(rows, columns=["exchange", "asset", "anchor", "valor_anchor", "profit_pct", "accion"])
-        except Exception:
-            df = pd.DataFrame(rows)
+            return self._rows_frame(rows)
+        df = self._rows_frame(rows)
         # Pretty print
         if self.fast_mode:
             # Build rows directly to avoid DataFrame overhead
@@ -561,7 +1451,7 @@ class ScalpinMonitor:
                 self._t0 = now_utc
             elapsed = now_utc - self._t0
             iter_total = self.max_iterations if self.max_iterations else "∞"
-            header = f"{title}\nanchor={self.anchor} | exchanges={','.join(self.exchanges)} | iter {self.iteration}/{iter_total} | elapsed={str(elapsed).split('.')[0]} | ts={now_utc.isoformat()}"
+            header = f"{title}\nanchor={self.anchor} | exchanges={','.join(self.exchanges)} | iter {self._sink_tick}/{iter_total} | elapsed={str(elapsed).split('.')[0]} | ts={now_utc.isoformat()}"
             if self.fast_mode:
                 cols = ["exchange", "asset", "anchor", "valor_anchor", "profit", "accion"]
                 view_rows: List[Dict[str, str]] = []
@@ -600,8 +1490,6 @@ class ScalpinMonitor:
         if not self.history_log_enabled:
             return
         try:
-            os.makedirs(os.path.dirname(self.history_log_path), exist_ok=True)
-            os.makedirs(os.path.dirname(self.history_csv_path), exist_ok=True)
             # Prepare header and table text
             title = "SCALPIN - Saldos por exchange/asset"
             now_utc = datetime.now(timezone.utc)
@@ -609,7 +1497,7 @@ class ScalpinMonitor:
                 self._t0 = now_utc
             elapsed = now_utc - self._t0
             iter_total = self.max_iterations if self.max_iterations else "∞"
-            header = f"{title}\nanchor={self.anchor} | exchanges={','.join(self.exchanges)} | iter {self.iteration}/{iter_total} | elapsed={str(elapsed).split('.')[0]} | ts={now_utc.isoformat()}"
+            header = f"{title}\nanchor={self.anchor} | exchanges={','.join(self.exchanges)} | iter {self._sink_tick}/{iter_total} | elapsed={str(elapsed).split('.')[0]} | ts={now_utc.isoformat()}"
             if self.fast_mode:
                 cols = ["exchange", "asset", "anchor", "valor_anchor", "profit", "accion"]
                 view_rows: List[Dict[str, str]] = []
@@ -632,46 +1520,8 @@ class ScalpinMonitor:
                 cols = ["exchange", "asset", "anchor", "valor_anchor", "profit", "accion"]
                 cols = [c for c in cols if c in df_view.columns]
                 text = header + "\n" + self._format_table(df_view, cols) + "\n\n"
-            # Append to text history log
-            with open(self.history_log_path, "a", encoding="utf-8") as fh:
-                fh.write(text)
-                try:
-                    fh.flush()
-                    os.fsync(fh.fileno())
-                except Exception:
-                    pass
-            # Append to CSV history with timestamp
-            if self.fast_mode:
-                cols_csv = ["exchange", "asset", "anchor", "valor_anchor", "profit_pct", "accion", "ts"]
-                header_needed = not os.path.exists(self.history_csv_path) or os.path.getsize(self.history_csv_path) == 0
-                with open(self.history_csv_path, "a", newline="", encoding="utf-8") as fh:
-                    writer = csv.DictWriter(fh, fieldnames=cols_csv)
-                    if header_needed:
-                        writer.writeheader()
-                    for r in df.to_dict(orient="records"):
-                        row = {k: r.get(k, "") for k in cols_csv}
-                        row["ts"] = now_utc.isoformat()
-                        writer.writerow(row)
-                    try:
-                        fh.flush()
-                        os.fsync(fh.fileno())
-                    except Exception:
-                        pass
-            else:
-                df_csv = df.copy()
-                df_csv["ts"] = now_utc.isoformat()
-                header_needed = not os.path.exists(self.history_csv_path) or os.path.getsize(self.history_csv_path) == 0
-                # Write to temp then append atomically by replacing a concatenated file is heavy; instead ensure flush
-                with open(self.history_csv_path, "a", encoding="utf-8", newline="") as fh:
-                    if header_needed:
-                        fh.write(",".join(df_csv.columns.tolist()) + "\n")
-                    for _, row in df_csv.iterrows():
-                        fh.write(",".join(str(row[c]) for c in df_csv.columns.tolist()) + "\n")
-                    try:
-                        fh.flush()
-                        os.fsync(fh.fileno())
-                    except Exception:
-                        pass
+            # Buffered; HistoryWriter group-commits text log + CSV rows
+            self._history.add(text, df, now_utc.isoformat())
         except Exception as e:
             logger.warning("Failed to append to history logs: %s", e)
 
@@ -722,99 +1572,239 @@ class ScalpinMonitor:
             ",".join(self.exchanges), self.anchor, self.poll_sec, self.min_value_anchor,
         )
         self._t0 = datetime.now(timezone.utc)
-        while True:
+        metrics = None
+        if self.metrics_endpoint:
             try:
-                t0 = time.perf_counter()
-                rows = self._build_table_rows()
-                t1 = time.perf_counter()
-                # Decide actions for next iteration number
-                next_iter = self.iteration + 1
-                do_print = (self.render_every_n <= 1) or (next_iter % self.render_every_n == 0)
-                do_snapshot = (self.snapshot_every_n <= 1) or (next_iter % self.snapshot_every_n == 0)
-                do_log = (self.log_every_n > 0) and (next_iter % self.log_every_n == 0)
-                do_hist = (self.history_every_n > 0) and (next_iter % self.history_every_n == 0)
-                df = None
-                t2 = t1
-                if do_print or do_log or do_hist:
-                    df = self._render(rows, print_console=do_print)
-                    t2 = time.perf_counter()
-                ms_snapshot = 0.0
-                ms_log = 0.0
-                ms_hist = 0.0
-                if do_snapshot:
-                    self._write_snapshot(rows)
-                    t3 = time.perf_counter()
-                    ms_snapshot = (t3 - t2) * 1000.0
-                    t2 = t3
-                if do_log and df is not None:
-                    self._write_log_snapshot(df)
-                    t4 = time.perf_counter()
-                    ms_log = (t4 - t2) * 1000.0
-                    t2 = t4
-                if do_hist and df is not None:
-                    self._append_history(df)
-                    t5 = time.perf_counter()
-                    ms_hist = (t5 - t2) * 1000.0
-                    t2 = t5
-                t_end = time.perf_counter()
-                # Perf metrics for this iteration
-                perf = {
-                    "iter": self.iteration,
-                    "ts": datetime.now(timezone.utc).isoformat(),
-                    "row_count": len(rows),
-                    "ms_rows": (t1 - t0) * 1000.0,
-                    "ms_render": (0.0 if (not do_print and not do_log and not do_hist) else (t2 - t1 - ms_snapshot - ms_log - ms_hist)),
-                    "ms_snapshot": ms_snapshot,
-                    "ms_log": ms_log,
-                    "ms_hist": ms_hist,
-                    "ms_total": (t_end - t0) * 1000.0,
-                }
-                self._last_perf = perf
-                self._perf_hist.append(perf)
-                if len(self._perf_hist) > self.perf_window:
-                    self._perf_hist.pop(0)
-                self._maybe_write_perf_csv(perf)
-            except KeyboardInterrupt:
-                logger.info("Interrupted by user. Bye.")
-                return
+                metrics = MetricsServer(self.metrics_endpoint, self.perf_summary)
+                metrics.start()
+            except Exception as e:
+                logger.warning("Metrics endpoint %s failed: %s", self.metrics_endpoint, e)
+                metrics = None
+        try:
+            asyncio.run(self._run_async())
+        except KeyboardInterrupt:
+            logger.info("Interrupted by user. Bye.")
+        finally:
+            if metrics is not None:
+                metrics.stop()
+            if self._term is not None:
+                self._term.flush()
+            for client in self.clients.values():
+                client.close()
+            try:
+                self._history.close()
             except Exception as e:
-                logger.warning("Loop error: %s", e)
+                logger.warning("Failed to flush history logs: %s", e)
+            if self._perf_log is not None:
+                self._perf_log.close()
+
+    async def _run_async(self) -> None:
+        """Three stages side by side: per-exchange fetchers -> valuation -> sink.
+
+        Fetch tasks refresh ``self._snapshots`` on their own cadence; the valuation
+        stage ticks every ``poll_interval_sec`` over whatever is latest; the sink
+        writes console/CSV/logs/history in a worker thread. The hand-off to the sink
+        holds a single job, so a slow disk only coalesces output, never delays a tick.
+        """
+        stop = asyncio.Event()
+        first_round = {ex_id: asyncio.Event() for ex_id in self.clients}
+        # ccxt clients are synchronous: bound concurrent blocking fetches
+        fetch_slots = asyncio.Semaphore(max(1, self.concurrency))
+        sink_q: "asyncio.Queue[Optional[SinkJob]]" = asyncio.Queue(maxsize=1)
+        fetchers = [
+            asyncio.create_task(self._fetch_stage(ex_id, client, fetch_slots, first_round[ex_id], stop))
+            for ex_id, client in self.clients.items()
+        ]
+        sink = asyncio.create_task(self._sink_stage(sink_q))
+        try:
+            # Let every exchange publish once (bounded by the HTTP timeout) before the first tick
+            if first_round:
+                timeout = float(self.cfg.get("timeout_ms") or 10000) / 1000.0
+                await asyncio.wait([asyncio.create_task(ev.wait()) for ev in first_round.values()], timeout=timeout)
+            await self._valuation_stage(sink_q, stop)
+        finally:
+            stop.set()
+            for t in fetchers:
+                t.cancel()
+            await asyncio.gather(*fetchers, return_exceptions=True)
+            await sink_q.put(None)
+            await sink
+
+    async def _fetch_stage(
+        self,
+        ex_id: str,
+        client: ExchangeClient,
+        slots: asyncio.Semaphore,
+        first_done: asyncio.Event,
+        stop: asyncio.Event,
+    ) -> None:
+        interval = float(self.fetch_interval_by_exchange.get(ex_id, self.fetch_interval_sec))
+        seq = 0
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            seq += 1
+            try:
+                async with slots:
+                    snap = await asyncio.to_thread(self._fetch_exchange, client, seq)
+                self._snapshots[ex_id] = snap
+            except Exception as e:
+                logger.warning("%s: fetch error: %s", ex_id, e)
+            first_done.set()
+            # Fixed cadence: a slow fetch eats into its own interval, not into the other exchanges'
+            await asyncio.sleep(max(0.0, interval - (time.perf_counter() - t0)))
+
+    async def _valuation_stage(self, sink_q: "asyncio.Queue[Optional[SinkJob]]", stop: asyncio.Event) -> None:
+        next_at = time.perf_counter()
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            self.iteration += 1
+            tick = self.iteration
+            snapshots = dict(self._snapshots)
+            seqs = {ex_id: s.seq for ex_id, s in snapshots.items()}
+            if seqs == self._valued_seqs:
+                # no fetch landed since the last valuation: re-pricing against
+                # _last_price would report a 0% change and make the signal flicker
+                rows, actions = self._valued_rows, []
+            else:
+                rows, actions = self._value_rows(snapshots)
+                self._valued_seqs, self._valued_rows = seqs, rows
+            for ex_id, asset in actions:
+                await asyncio.to_thread(self._spawn_swapper, ex_id, asset)
+            t1 = time.perf_counter()
+            perf = {
+                "iter": tick,
+                "ts": datetime.now(timezone.utc).isoformat(),
+                "row_count": len(rows),
+                "ms_fetch": max((s.ms_fetch for s in snapshots.values()), default=0.0),
+                "ms_valuation": (t1 - t0) * 1000.0,
+                "fetch_ms": {ex_id: s.ms_fetch for ex_id, s in snapshots.items()},
+            }
+            job = SinkJob(
+                tick=tick,
+                rows=rows,
+                perf=perf,
+                do_print=(self.render_every_n <= 1) or (tick % self.render_every_n == 0),
+                do_snapshot=(self.snapshot_every_n <= 1) or (tick % self.snapshot_every_n == 0),
+                do_log=(self.log_every_n > 0) and (tick % self.log_every_n == 0),
+                do_hist=(self.history_every_n > 0) and (tick % self.history_every_n == 0),
+                t_start=t0,
+            )
+            if sink_q.full():
+                try:
+                    pending = sink_q.get_nowait()
+                    if pending is not None:
+                        job.absorb(pending)
+                        logger.debug("sink busy: tick %d coalesced into %d", pending.tick, tick)
+                except asyncio.QueueEmpty:
+                    pass
+            sink_q.put_nowait(job)
             # Termination controls
-            if self.max_iterations and self.iteration >= self.max_iterations:
+            if self.max_iterations and tick >= self.max_iterations:
                 logger.info("Reached max_iterations=%d. Stopping.", self.max_iterations)
                 return
             if self.run_duration_sec and (datetime.now(timezone.utc) - self._t0) >= timedelta(seconds=self.run_duration_sec):
                 logger.info("Reached run_duration_sec=%.1f. Stopping.", self.run_duration_sec)
                 return
-            time.sleep(max(0.0, float(self.poll_sec)))
+            next_at += max(0.0, float(self.poll_sec))
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            next_at = max(next_at, time.perf_counter() - float(self.poll_sec))
 
-    def _maybe_write_perf_csv(self, perf: dict) -> None:
-        if not self.perf_csv_enabled:
-            return
-        try:
-            out_dir = os.path.dirname(self.perf_csv_path)
-            if out_dir and not os.path.isdir(out_dir):
-                os.makedirs(out_dir, exist_ok=True)
-            header_needed = not os.path.exists(self.perf_csv_path) or os.path.getsize(self.perf_csv_path) == 0
-            cols = [
-                "iter", "ts", "row_count",
-                "ms_rows", "ms_render", "ms_snapshot", "ms_log", "ms_hist", "ms_total",
-            ]
-            with open(self.perf_csv_path, "a", newline="", encoding="utf-8") as fh:
-                wr = csv.DictWriter(fh, fieldnames=cols)
-                if header_needed:
-                    wr.writeheader()
-                wr.writerow({k: perf.get(k, "") for k in cols})
-                try:
-                    fh.flush()
-                    os.fsync(fh.fileno())
-                except Exception:
-                    pass
-        except Exception as e:
-            logger.debug("perf csv write failed: %s", e)
+    async def _sink_stage(self, sink_q: "asyncio.Queue[Optional[SinkJob]]") -> None:
+        while True:
+            job = await sink_q.get()
+            if job is None:
+                return
+            try:
+                await asyncio.to_thread(self._run_sink, job)
+            except Exception as e:
+                logger.warning("Sink error: %s", e)
+
+    def _run_sink(self, job: SinkJob) -> None:
+        """Console/CSV/log/history writes for one tick (worker thread)."""
+        self._sink_tick = job.tick
+        rows = job.rows
+        t1 = time.perf_counter()
+        df = None
+        t2 = t1
+        if job.do_print and self._term is not None:
+            # Diff renderer works on rows directly; the frame is only built for log/history
+            self._term.render(self._console_header(), rows)
+            if job.do_log or job.do_hist:
+                df = self._rows_frame(rows)
+            t2 = time.perf_counter()
+        elif job.do_print or job.do_log or job.do_hist:
+            df = self._render(rows, print_console=job.do_print)
+            t2 = time.perf_counter()
+        ms_render = (t2 - t1) * 1000.0
+        ms_snapshot = 0.0
+        ms_log = 0.0
+        ms_hist = 0.0
+        if job.do_snapshot:
+            self._write_snapshot(rows)
+            t3 = time.perf_counter()
+            ms_snapshot = (t3 - t2) * 1000.0
+            t2 = t3
+        if job.do_log and df is not None:
+            self._write_log_snapshot(df)
+            t4 = time.perf_counter()
+            ms_log = (t4 - t2) * 1000.0
+            t2 = t4
+        if job.do_hist and df is not None:
+            self._append_history(df)
+            t5 = time.perf_counter()
+            ms_hist = (t5 - t2) * 1000.0
+            t2 = t5
+        t_end = time.perf_counter()
+        # Perf metrics for this tick (valuation fields come from the valuation stage)
+        perf = dict(job.perf)
+        perf.update(
+            {
+                "ms_render": ms_render,
+                "ms_snapshot": ms_snapshot,
+                "ms_log": ms_log,
+                "ms_hist": ms_hist,
+                "ms_sink": (t_end - t1) * 1000.0,
+                "ms_total": (t_end - job.t_start) * 1000.0,
+            }
+        )
+        self._last_perf = perf
+        self._record_perf(perf)
+
+    def _record_perf(self, perf: dict) -> None:
+        self._perf_ring.push(perf)
+        for ex_id, ms in (perf.get("fetch_ms") or {}).items():
+            ring = self._fetch_rings.get(ex_id)
+            if ring is not None:
+                ring.push({"ms_fetch": ms})
+        if self._perf_log is not None:
+            try:
+                self._perf_log.append(perf)
+                # Buffered: hand data to the OS every few ticks, never fsync
+                if perf.get("iter", 0) % 10 == 0:
+                    self._perf_log.flush()
+            except Exception as e:
+                logger.debug("perf log write failed: %s", e)
+
+    def perf_summary(self) -> dict:
+        """Live p50/p95/p99 per ms_* field and per-exchange fetch latency."""
+        return {
+            "iter": self.iteration,
+            "window": len(self._perf_ring),
+            "last": {k: v for k, v in (getattr(self, "_last_perf", None) or {}).items() if k != "fetch_ms"},
+            "percentiles": self._perf_ring.percentiles(),
+            "fetch": {ex: ring.percentiles().get("ms_fetch", {}) for ex, ring in self._fetch_rings.items()},
+        }
 
 
 def main() -> None:
+    # `python scalpin_monitor.py perf <scalpin_perf.bin>` prints percentiles of a recorded run
+    if len(sys.argv) >= 3 and sys.argv[1] == "perf":
+        df = read_perf_log(sys.argv[2])
+        ms_cols = [c for c in df.columns if c.startswith("ms_")]
+        print(f"ticks={len(df)}")
+        if len(df):
+            print(df[ms_cols].quantile([q / 100.0 for q in PERCENTILES]).round(2).to_string())
+        return
     # Resolve config path relative to CWD
     cfg_path = os.environ.get("SCALPIN_CONFIG") or os.path.join(os.getcwd(), "scalpin.yaml")
     mon = ScalpinMonitor(config_path=cfg_path)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+import scalpin_monitor as sm
+
+
+class FakeExchange:
+    """fetch_balance stand-in; ``during`` runs while the REST call is in flight."""
+
+    def __init__(self, totals, update_time=None):
+        self.totals = dict(totals)
+        self.update_time = update_time
+        self.calls = 0
+        self.during = None
+
+    def fetch_balance(self):
+        self.calls += 1
+        if self.during is not None:
+            self.during()
+            self.during = None
+        bal = {"total": dict(self.totals)}
+        if self.update_time is not None:
+            bal["info"] = {"updateTime": self.update_time}
+        return bal
+
+
+def _client(ex, stream):
+    client = object.__new__(sm.ExchangeClient)
+    client.ex_id = "binance"
+    client._ex = ex
+    client._stream = None
+    client.use_stream(stream)
+    return client
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def test_user_data_stream_is_abstract():
+    with pytest.raises(TypeError):
+        sm.UserDataStream(sm.StreamingWallet())
+
+
+def test_events_update_wallet_without_rest():
+    ex = FakeExchange({"BTC": 1.0, "USDT": 100.0})
+    stream = sm.FakeUserDataStream(sm.StreamingWallet(reconcile_sec=0))
+    client = _client(ex, stream)
+
+    assert client.fetch_balances() == {"BTC": 1.0, "USDT": 100.0}
+    assert ex.calls == 1
+
+    ts = _now_ms() + 1000
+    stream.push({"e": "outboundAccountPosition", "E": ts, "u": ts,
+                 "B": [{"a": "BTC", "f": "0.5", "l": "0.25"}, {"a": "ETH", "f": "2", "l": "0"}]})
+    stream.push({"e": "balanceUpdate", "a": "USDT", "d": "-40", "T": ts + 1})
+    # a delta older than the last absolute position is already included in it
+    stream.push({"e": "balanceUpdate", "a": "BTC", "d": "5", "T": ts - 1})
+
+    assert client.fetch_balances() == {"BTC": 0.75, "ETH": 2.0, "USDT": 60.0}
+    assert ex.calls == 1
+
+
+def test_gap_triggers_rest_reconcile_and_replays_in_flight_events():
+    ex = FakeExchange({"BTC": 1.0})
+    stream = sm.FakeUserDataStream(sm.StreamingWallet(reconcile_sec=0))
+    client = _client(ex, stream)
+    client.fetch_balances()
+
+    stream.drop()
+    ex.totals = {"BTC": 2.0, "USDT": 10.0}
+    # arrives while the REST snapshot is being taken, so it must survive the reconcile
+    ex.during = lambda: stream.push({"e": "balanceUpdate", "a": "USDT", "d": "5", "T": _now_ms() + 1000})
+
+    assert client.fetch_balances() == {"BTC": 2.0, "USDT": 15.0}
+    assert ex.calls == 2
+    assert client.fetch_balances() == {"BTC": 2.0, "USDT": 15.0}
+    assert ex.calls == 2
+
+
+def test_expired_stream_marks_gap():
+    ex = FakeExchange({"BTC": 1.0})
+    stream = sm.FakeUserDataStream(sm.StreamingWallet(reconcile_sec=0))
+    client = _client(ex, stream)
+    client.fetch_balances()
+    stream.push({"e": "listenKeyExpired", "E": _now_ms()})
+    assert stream.wallet.needs_reconcile()
+    client.fetch_balances()
+    assert ex.calls == 2
+
+
+def test_reconcile_cuts_off_at_rest_update_time():
+    ex = FakeExchange({"BTC": 1.0})
+    stream = sm.FakeUserDataStream(sm.StreamingWallet(reconcile_sec=0))
+    client = _client(ex, stream)
+    client.fetch_balances()
+
+    stream.drop()
+    snapshot_ms = _now_ms() + 5000
+    ex.totals = {"BTC": 1.0, "USDT": 15.0}
+    ex.update_time = snapshot_ms
+
+    def in_flight():
+        # already in the snapshot (at its updateTime) vs. newer than it
+        stream.push({"e": "balanceUpdate", "a": "USDT", "d": "5", "T": snapshot_ms})
+        stream.push({"e": "balanceUpdate", "a": "BTC", "d": "1", "T": snapshot_ms + 1})
+
+    ex.during = in_flight
+    assert client.fetch_balances() == {"BTC": 2.0, "USDT": 15.0}
+
+
+class _FakeWs:
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+class _FailingKeepaliveEx:
+    def publicPutUserDataStream(self, params):
+        raise RuntimeError("listenKey does not exist")
+
+
+def test_keepalive_closes_only_its_own_connection():
+    stream = sm.BinanceUserDataStream(_FailingKeepaliveEx(), sm.StreamingWallet(reconcile_sec=0))
+    stream.keepalive_sec = 0.01
+    old_ws, new_ws = _FakeWs(), _FakeWs()
+    stream._ws = new_ws
+
+    # the previous connection's keepalive stops once its connection is done
+    finished = threading.Event()
+    finished.set()
+    stream._keepalive("old-key", old_ws, finished)
+    assert not old_ws.closed.is_set()
+
+    stream._keepalive("old-key", old_ws, threading.Event())
+    assert old_ws.closed.is_set()
+    assert not new_ws.closed.is_set()
+    assert stream._ws is new_ws